@@ -6,15 +6,38 @@ Experience the AI like you experience ChatGPT - ask about any stock,
 get intelligent, context-aware analysis powered by your AI engine.
 """
 
+import asyncio
+import httpx
 import requests
 import sys
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # API Configuration
 API_URL = "http://localhost:8000/v1/ai/analyze"
 USER_ID = "client_user"
 TIER = "pro"
 
+# Shared session: keep-alive reuses the TCP (and TLS) connection across analyses
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({
+    "X-User-ID": USER_ID,
+    "X-User-Tier": TIER,
+})
+
 
 def analyze_stock(ticker, mode="comprehensive"):
     """Get real AI analysis for a stock"""
@@ -23,13 +46,8 @@ def analyze_stock(ticker, mode="comprehensive"):
     print("   (Fetching news, analyzing sentiment, generating insights...)\n")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             API_URL,
-            headers={
-                "X-User-ID": USER_ID,
-                "X-User-Tier": TIER,
-                "Content-Type": "application/json"
-            },
             json={
                 "ticker": ticker.upper(),
                 "analysis_type": mode,  # Use comprehensive for REAL AI
@@ -57,6 +75,61 @@ def analyze_stock(ticker, mode="comprehensive"):
         return None
 
 
+async def _analyze_stock_async(client, ticker, mode="comprehensive"):
+    """Async variant of analyze_stock() sharing one httpx client"""
+    
+    try:
+        response = await client.post(
+            API_URL,
+            json={
+                "ticker": ticker.upper(),
+                "analysis_type": mode,
+                "days_before": 7
+            }
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 429:
+            print(f"⚠️  {ticker.upper()}: rate limit reached.")
+        else:
+            print(f"❌ {ticker.upper()}: API Error {response.status_code}")
+        return None
+        
+    except httpx.ConnectError:
+        print("❌ Cannot connect to QuantForge AI Engine")
+        return None
+    except Exception as e:
+        print(f"❌ {ticker.upper()}: {e}")
+        return None
+
+
+async def _analyze_many(tickers, mode):
+    headers = {"X-User-ID": USER_ID, "X-User-Tier": TIER}
+    limits = httpx.Limits(max_connections=len(tickers), max_keepalive_connections=len(tickers))
+    
+    async with httpx.AsyncClient(timeout=60, headers=headers, limits=limits) as client:
+        tasks = [_analyze_stock_async(client, t, mode) for t in tickers]
+        
+        # Print each analysis as soon as it lands rather than in argument order
+        completed = 0
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if result:
+                display_analysis(result)
+                print()
+                completed += 1
+        return completed
+
+
+def multi_analysis_mode(tickers, mode="comprehensive"):
+    """Analyze several stocks concurrently: wall time ~ slowest analysis, not the sum"""
+    
+    print(f"\n🤖 AI is analyzing {', '.join(t.upper() for t in tickers)} concurrently...\n")
+    completed = asyncio.run(_analyze_many(tickers, mode))
+    return completed == len(tickers)
+
+
 def display_analysis(data):
     """Display AI analysis like a conversation"""
     
@@ -169,7 +242,11 @@ def single_analysis_mode(ticker):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 2:
+        # Batch mode: python ai_client.py AAPL MSFT NVDA
+        success = multi_analysis_mode(sys.argv[1:])
+        sys.exit(0 if success else 1)
+    elif len(sys.argv) > 1:
         # Command line mode: python ai_client.py AAPL
         ticker = sys.argv[1]
         success = single_analysis_mode(ticker)
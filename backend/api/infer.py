@@ -5,11 +5,13 @@ Endpoint: POST /v1/infer
 """
 
 from typing import Literal, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
-from backend.core.logging import logger
+from backend.core.logging import get_logger
 from backend.engine.router import route_inference
 
+logger = get_logger(__name__)
+
 router = APIRouter(tags=["inference"])
 
 
@@ -34,14 +36,20 @@ class InferResponse(BaseModel):
 
 
 @router.post("/infer", response_model=InferResponse)
-async def infer(req: InferRequest):
+async def infer(req: InferRequest, request: Request):
     """
     Main inference endpoint.
-    Delegates heavy lifting to backend.engine.router.route_inference.
+    Delegates heavy lifting to backend.engine.router.route_inference,
+    reusing the app-wide pooled HTTP client (app.state.http).
     """
-    logger.info("Received inference request", prompt=req.prompt[:80], provider=req.provider)
+    logger.info("Received inference request provider=%s prompt=%.80s", req.provider, req.prompt)
     try:
-        text = await route_inference(prompt=req.prompt, provider=req.provider, max_tokens=req.max_tokens)
+        text = await route_inference(
+            prompt=req.prompt,
+            provider=req.provider,
+            max_tokens=req.max_tokens,
+            client=getattr(request.app.state, "http", None)
+        )
     except HTTPException:
         # re-raise FastAPI HTTP exceptions
         raise
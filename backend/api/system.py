@@ -5,10 +5,11 @@ Mounted at: /v1/system (main.py mounts routers under /v1 prefix).
 """
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
 
 from backend.core.config import settings
-from backend.core.logging import logger
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(tags=["system"])
 
@@ -20,16 +21,12 @@ async def info():
     Useful for quick checks and scripts that need app metadata.
     """
     logger.info("Served /v1/system/info")
-    return JSONResponse(
-        {
-            "app_name": settings.APP_NAME,
-            "version": settings.APP_VERSION,
-            "env": settings.ENV,
-            "ollama_host": f"{settings.OLLAMA_HOST}:{settings.OLLAMA_PORT}"
-            if settings.OLLAMA_HOST and settings.OLLAMA_PORT
-            else None,
-        }
-    )
+    return {
+        "app_name": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+        "env": settings.ENVIRONMENT,
+        "ollama_url": settings.OLLAMA_URL or None,
+    }
 
 
 @router.get("/health")
@@ -39,4 +36,4 @@ async def health_check():
     This is in addition to main /health; useful for internal health probes.
     """
     logger.debug("Health check ping")
-    return JSONResponse({"status": "ok", "component": "system", "env": settings.ENV})
+    return {"status": "ok", "component": "system", "env": settings.ENVIRONMENT}
@@ -1,8 +1,9 @@
 import os
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (once per process; other modules rely on this import)
 load_dotenv()
 
 
@@ -14,8 +15,21 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # --- Server (python -m backend.main) ---
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
     # --- Database (Postgres / Neon / Timescale) ---
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # 0 disables (required for poolers that reject startup options, e.g. Neon's -pooler host)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "10000"))
+    # asyncpg pool for the TimescaleDB market-data store
+    PG_POOL_MIN: int = int(os.getenv("PG_POOL_MIN", "10"))
+    PG_POOL_MAX: int = int(os.getenv("PG_POOL_MAX", "50"))
 
     # --- Redis ---
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
@@ -32,6 +46,19 @@ class Settings(BaseSettings):
     # --- Weaviate / Vector Memory ---
     WEAVIATE_ENDPOINT: str = os.getenv("WEAVIATE_ENDPOINT", "")
     WEAVIATE_API_KEY: str = os.getenv("WEAVIATE_API_KEY", "")
+    # Product-quantized HNSW for new collections (segments must divide the embedding dim)
+    WEAVIATE_PQ_ENABLED: bool = os.getenv("WEAVIATE_PQ_ENABLED", "True").lower() == "true"
+    WEAVIATE_PQ_SEGMENTS: int = int(os.getenv("WEAVIATE_PQ_SEGMENTS", "96"))
+    WEAVIATE_PQ_CENTROIDS: int = int(os.getenv("WEAVIATE_PQ_CENTROIDS", "256"))
+    WEAVIATE_PQ_TRAINING_LIMIT: int = int(os.getenv("WEAVIATE_PQ_TRAINING_LIMIT", "100000"))
+    # int8 scalar quantization instead of PQ (no segment constraint, ~4x smaller vectors)
+    WEAVIATE_SQ_ENABLED: bool = os.getenv("WEAVIATE_SQ_ENABLED", "False").lower() == "true"
+    # Threads dedicated to blocking Weaviate client calls
+    WEAVIATE_POOL: int = int(os.getenv("WEAVIATE_POOL", "16"))
+
+    # --- Market Data (Binance) ---
+    # Serve current prices from the mini-ticker WebSocket instead of REST polling (needs websockets)
+    BINANCE_PRICE_STREAM_ENABLED: bool = os.getenv("BINANCE_PRICE_STREAM_ENABLED", "False").lower() == "true"
 
     # --- LLM / AI Providers ---
     OLLAMA_URL: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
@@ -43,6 +70,21 @@ class Settings(BaseSettings):
     HF_EMBEDDING_MODEL: str = os.getenv("HF_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
     HF_INFERENCE_API: str = os.getenv("HF_INFERENCE_API", "https://api-inference.huggingface.co/models")
     OLLAMA_EMBED_MODEL: str = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+    # Local model runtime: "onnx" (int8 ONNX Runtime, ~2-4x faster on CPU) or "torch"
+    EMBEDDING_RUNTIME: str = os.getenv("EMBEDDING_RUNTIME", "onnx")
+    EMBEDDING_ONNX_FILE: str = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+    # Used when the model repo has no pre-quantized file: quantize once and cache on disk
+    EMBEDDING_ONNX_QUANTIZATION: str = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx512_vnni")
+    EMBEDDING_ONNX_CACHE_DIR: str = os.getenv("EMBEDDING_ONNX_CACHE_DIR", ".cache/onnx")
+    # Concurrent single-text embeds are coalesced into one model.encode() call
+    EMBED_BATCH_MAX_SIZE: int = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))
+    EMBED_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+    # In-process LRU of recent embeddings (float16-packed); 0 disables
+    EMBED_CACHE_SIZE: int = int(os.getenv("EMBED_CACHE_SIZE", "4096"))
+    # Torch threads per worker; 0 = cpu_count // WEB_CONCURRENCY
+    EMBED_NUM_THREADS: int = int(os.getenv("EMBED_NUM_THREADS", "0"))
+    # Load and exercise models during startup instead of on the first request
+    MODEL_WARMUP_ON_STARTUP: bool = os.getenv("MODEL_WARMUP_ON_STARTUP", "True").lower() == "true"
     APP_NAME: str = os.getenv("APP_NAME", "QuantForge AI Engine")
     APP_VERSION: str = os.getenv("APP_VERSION", "0.1.0")
     
@@ -50,14 +92,34 @@ class Settings(BaseSettings):
     # Hugging Face LLM (Primary - Free tier)
     HF_LLM_MODEL: str = os.getenv("HF_LLM_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
     HF_LLM_ENDPOINT: str = os.getenv("HF_LLM_ENDPOINT", "https://api-inference.huggingface.co/models")
+    # Concurrent prompts with identical parameters are sent as one `inputs` list
+    HF_BATCH_MAX_SIZE: int = int(os.getenv("HF_BATCH_MAX_SIZE", "8"))
+    HF_BATCH_MAX_WAIT_MS: float = float(os.getenv("HF_BATCH_MAX_WAIT_MS", "10"))
     
     # OpenAI (Paid Fallback)
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
     OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
     
-    # Ollama LLM (Local Fallback)
-    OLLAMA_LLM_MODEL: str = os.getenv("OLLAMA_LLM_MODEL", "mistral:latest")
-    
+    # Ollama LLM (Local Fallback) - 4-bit K-quant weights for faster decode
+    OLLAMA_LLM_MODEL: str = os.getenv("OLLAMA_LLM_MODEL", "mistral:7b-instruct-q4_K_M")
+    # How long Ollama keeps the model (and its prompt-prefix KV cache) resident between calls
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # Prompts in flight at once from LLMClient.generate_batch()
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # Skip a provider for LLM_BREAKER_COOLDOWN seconds after this many consecutive failures
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+    LLM_BREAKER_COOLDOWN: int = int(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+    # LLM response cache (exact + semantic)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_SIMILARITY: float = float(os.getenv("LLM_CACHE_SIMILARITY", "0.87"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "3600"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "4096"))
+    LLM_CACHE_MAX_TEMPERATURE: float = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.5"))
+    # Switch semantic lookup from flat scan to FAISS IVF-PQ past this many prompts (needs faiss-cpu)
+    LLM_CACHE_ANN_MIN_ENTRIES: int = int(os.getenv("LLM_CACHE_ANN_MIN_ENTRIES", "50000"))
+    LLM_CACHE_ANN_NPROBE: int = int(os.getenv("LLM_CACHE_ANN_NPROBE", "16"))
+
     # --- Authentication (Clerk) ---
     CLERK_SECRET_KEY: str = os.getenv("CLERK_SECRET_KEY", "")
     CLERK_PUBLISHABLE_KEY: str = os.getenv("CLERK_PUBLISHABLE_KEY", "")
@@ -66,18 +128,34 @@ class Settings(BaseSettings):
     # --- Error Tracking (Sentry) ---
     SENTRY_DSN: str = os.getenv("SENTRY_DSN", "")
     SENTRY_ENVIRONMENT: str = os.getenv("SENTRY_ENVIRONMENT", "development")
-    SENTRY_TRACES_SAMPLE_RATE: float = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1"))
+    SENTRY_TRACES_SAMPLE_RATE: float = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05"))
+    SENTRY_PROFILES_SAMPLE_RATE: float = float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.0"))
+    # Outbound hosts that receive sentry-trace/baggage headers (comma-separated URL prefixes/regexes)
+    SENTRY_TRACE_PROPAGATION_TARGETS: str = os.getenv(
+        "SENTRY_TRACE_PROPAGATION_TARGETS", os.getenv("OLLAMA_URL", "http://localhost:11434")
+    )
+    SENTRY_TRANSPORT_QUEUE_SIZE: int = int(os.getenv("SENTRY_TRANSPORT_QUEUE_SIZE", "100"))
+    SENTRY_DEBUG: bool = os.getenv("SENTRY_DEBUG", "False").lower() == "true"
     
    # --- Payments (Stripe) ---
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
     STRIPE_PUBLISHABLE_KEY: str = os.getenv("STRIPE_PUBLISHABLE_KEY", "")
     STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET", "")
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "allow"
+    # Frozen: settings are read-only after startup and safe to share across workers
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="allow",
+        frozen=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse and validate settings once per process."""
+    return Settings()
 
 
 # ✅ Global instance (import this anywhere)
-settings = Settings()
+settings = get_settings()
@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from backend.core.config import settings
 
@@ -14,21 +17,40 @@ class LogFormatter(logging.Formatter):
         return log_format
 
 
+# Loggers only enqueue records; a single background thread does the stdout I/O,
+# so request handlers and the event loop never block on a slow console/pipe.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_listener = None
+
+
+def _start_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    _queue_listener = logging.handlers.QueueListener(_log_queue, handler)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
-    Returns a configured logger with console handler.
+    Returns a configured logger backed by the shared non-blocking queue handler.
     All logs use the same consistent structure across the app.
+
+    Prefer lazy %-style arguments on hot paths (logger.debug("recv %s", x)):
+    formatting is skipped entirely when the level is filtered out.
     """
     logger = logging.getLogger(name)
 
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        _start_queue_listener()
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 
         logger.setLevel(settings.LOG_LEVEL.upper())
         logger.propagate = False
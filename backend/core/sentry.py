@@ -6,15 +6,54 @@ Captures errors, performance metrics, and custom events for production monitorin
 Essential for commercial SaaS to track issues and optimize performance.
 """
 
+import asyncio
+from typing import Callable, Set
+
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.asyncio import AsyncioIntegration
+from sentry_sdk.integrations.asyncpg import AsyncPGIntegration
+from sentry_sdk.integrations.httpx import HttpxIntegration
 
 from backend.core.config import settings
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Strong refs so in-flight capture tasks aren't garbage collected
+_capture_tasks: Set[asyncio.Task] = set()
+
+# Probe/docs endpoints that would otherwise dominate the transaction quota
+_UNTRACED_PATHS = frozenset({
+    "/",
+    "/health",
+    "/v1/health",
+    "/v1/system/health",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+})
+
+
+def _traces_sampler(sampling_context: dict) -> float:
+    """
+    Decide per-transaction sampling.
+    
+    Probes are never traced, continued traces keep the upstream decision
+    (so distributed traces stay whole), everything else uses the base rate.
+    Error events are unaffected - they are always sent regardless of tracing.
+    """
+    path = sampling_context.get("asgi_scope", {}).get("path", "")
+    if path in _UNTRACED_PATHS:
+        return 0.0
+    
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+    
+    return settings.SENTRY_TRACES_SAMPLE_RATE
+
 
 def init_sentry():
     """
@@ -34,7 +73,8 @@ def init_sentry():
             environment=settings.SENTRY_ENVIRONMENT,
             
             # Performance monitoring
-            traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
+            traces_sampler=_traces_sampler,
+            profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
             
             # Integrations
             integrations=[
@@ -42,16 +82,25 @@ def init_sentry():
                     transaction_style="url",  # Group by URL pattern
                     failed_request_status_codes={400, 500}  # Set instead of list
                 ),
-                AsyncioIntegration()
+                AsyncioIntegration(),
+                AsyncPGIntegration(),
+                HttpxIntegration()  # spans + sentry-trace/baggage on outbound httpx calls
+            ],
+            trace_propagation_targets=[
+                t.strip() for t in settings.SENTRY_TRACE_PROPAGATION_TARGETS.split(",") if t.strip()
             ],
             
             # Release tracking (for version comparison)
-            release=f"quantforge@{settings.API_VERSION}",
+            release=f"quantforge@{settings.APP_VERSION}",
+            
+            # Transport: reuse the connection; when the queue is full, events are dropped rather than blocking
+            keep_alive=True,
+            transport_queue_size=settings.SENTRY_TRANSPORT_QUEUE_SIZE,
             
             # Additional context
             send_default_pii=False,  # Don't send personal data
             attach_stacktrace=True,
-            debug=settings.DEBUG
+            debug=settings.SENTRY_DEBUG
         )
         
         logger.info(f"✅ Sentry initialized (env: {settings.SENTRY_ENVIRONMENT})")
@@ -60,6 +109,25 @@ def init_sentry():
         logger.error(f"Failed to initialize Sentry: {e}")
 
 
+def _submit(fn: Callable[[], None]):
+    """
+    Run a capture off the request path.
+    
+    Scope building and event serialization happen in a worker thread
+    (asyncio.to_thread copies contextvars, so request scope data is kept).
+    Without a running loop the capture runs inline.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        fn()
+        return
+    
+    task = asyncio.create_task(asyncio.to_thread(fn))
+    _capture_tasks.add(task)
+    task.add_done_callback(_capture_tasks.discard)
+
+
 def capture_llm_error(
     provider: str,
     error: Exception,
@@ -77,13 +145,16 @@ def capture_llm_error(
     if not settings.SENTRY_DSN:
         return
     
-    with sentry_sdk.push_scope() as scope:
-        scope.set_tag("llm_provider", provider)
-        scope.set_context("llm_context", context or {})
-        scope.level = "error"
-        
-        sentry_sdk.capture_exception(error)
-        logger.debug(f"Captured LLM error to Sentry: {provider}")
+    def _capture():
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("llm_provider", provider)
+            scope.set_context("llm_context", context or {})
+            scope.level = "error"
+            
+            sentry_sdk.capture_exception(error)
+            logger.debug("Captured LLM error to Sentry: %s", provider)
+    
+    _submit(_capture)
 
 
 def capture_validation_warning(
@@ -100,21 +171,24 @@ def capture_validation_warning(
     if not settings.SENTRY_DSN or not warnings:
         return
     
-    with sentry_sdk.push_scope() as scope:
-        scope.set_tag("event_type", "validation_warning")
-        scope.set_context("validation", {
-            "warnings": warnings,
-            "ticker": context.get("ticker"),
-            "analysis_type": response.get("analysis_type"),
-            "confidence": response.get("confidence")
-        })
-        scope.level = "warning"
-        
-        # Send as custom event (not exception)
-        sentry_sdk.capture_message(
-            f"AI validation warnings: {len(warnings)} issues",
-            level="warning"
-        )
+    def _capture():
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("event_type", "validation_warning")
+            scope.set_context("validation", {
+                "warnings": warnings,
+                "ticker": context.get("ticker"),
+                "analysis_type": response.get("analysis_type"),
+                "confidence": response.get("confidence")
+            })
+            scope.level = "warning"
+            
+            # Send as custom event (not exception)
+            sentry_sdk.capture_message(
+                f"AI validation warnings: {len(warnings)} issues",
+                level="warning"
+            )
+    
+    _submit(_capture)
 
 
 def capture_slow_analysis(
@@ -136,20 +210,26 @@ def capture_slow_analysis(
     if not settings.SENTRY_DSN or duration_ms < threshold_ms:
         return
     
-    with sentry_sdk.push_scope() as scope:
-        scope.set_tag("event_type", "slow_analysis")
-        scope.set_context("performance", {
-            "ticker": ticker,
-            "analysis_type": analysis_type,
-            "duration_ms": duration_ms,
-            "threshold_ms": threshold_ms
-        })
-        scope.level = "warning"
-        
-        sentry_sdk.capture_message(
-            f"Slow analysis detected: {duration_ms}ms for {ticker}",
-            level="warning"
-        )
+    def _capture():
+        with sentry_sdk.push_scope() as scope:
+            scope.set_tag("event_type", "slow_analysis")
+            # Group repeats per ticker/analysis instead of per duration-bearing message
+            scope.set_tag("fingerprint", f"{ticker}:{analysis_type}")
+            scope.fingerprint = ["slow_analysis", ticker, analysis_type]
+            scope.set_context("performance", {
+                "ticker": ticker,
+                "analysis_type": analysis_type,
+                "duration_ms": duration_ms,
+                "threshold_ms": threshold_ms
+            })
+            scope.level = "warning"
+            
+            sentry_sdk.capture_message(
+                f"Slow analysis detected: {duration_ms}ms for {ticker}",
+                level="warning"
+            )
+    
+    _submit(_capture)
 
 
 def set_user_context(user_id: str, org_id: str = None):
@@ -1,38 +1,77 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from backend.core.config import settings
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# --- SQLAlchemy Engine ---
-engine = create_engine(settings.DATABASE_URL, echo=False, pool_pre_ping=True)
+
+def _async_url(url: str):
+    """
+    Point a plain `postgresql://` DSN at the asyncpg driver.
+
+    asyncpg takes `ssl=` rather than libpq's `sslmode=`, and doesn't know
+    `channel_binding` (added by Neon's connection strings).
+    """
+    url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return url.set(query=query)
+
+
+# Server-side guard so a runaway query can't pin a pooled connection
+_connect_args = (
+    {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0
+    else {}
+)
+
+# --- SQLAlchemy Engine (asyncpg) ---
+# LIFO checkout keeps a small hot set of connections in use and lets idle
+# ones age out via pool_recycle instead of cycling through all of them.
+engine = create_async_engine(
+    _async_url(settings.DATABASE_URL),
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    connect_args=_connect_args,
+)
 
 # --- Session Factory ---
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(
+    engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
 def get_engine():
-    """Return initialized SQLAlchemy engine."""
+    """Return initialized SQLAlchemy async engine."""
     return engine
 
 
-def get_db():
-    """Provide a database session to FastAPI endpoints."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Provide an async database session to FastAPI endpoints."""
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def test_connection():
+async def test_connection():
     """Run a test query to confirm DB connectivity."""
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         logger.info("✅ PostgreSQL (Neon/Timescale) engine initialized successfully.")
         return True
     except Exception as e:
         logger.error(f"❌ Database connection failed: {e}")
         return False
+
+
+async def close_engine():
+    """Dispose pooled connections (called on app shutdown)."""
+    await engine.dispose()
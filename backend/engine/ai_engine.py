@@ -9,20 +9,100 @@ Orchestrates:
 - Validation
 """
 
-import json
+import asyncio
+import re
+import threading
+import time
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import orjson
 
 from backend.core.logging import get_logger
+from backend.core.sentry import capture_slow_analysis
 from backend.engine.llm.client import get_llm_client
 from backend.engine.llm.prompts import get_prompt_manager, PromptType
-from backend.engine.memory.vector_store import QuantForgeVectorStore
+from backend.engine.memory.vector_store import get_vector_store
 from backend.engine.memory.timeseries_store import get_timeseries_store
 from backend.engine.parsers.text_preprocessor import TextPreprocessor
 from backend.engine.validators import get_validator, get_calibrator
 
 logger = get_logger(__name__)
 
+_OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Quick-mode rules, checked in order: category -> (summary suffix, sentiment, confidence).
+# A None sentiment is decided by the period's price change.
+_QUICK_CATEGORY_RULES = {
+    "earnings": ("Earnings-related news detected.", None, 0.6),
+    "regulation": ("Regulatory news detected.", "bearish", 0.5),
+}
+
+# Leading ```/```json and trailing ``` around an LLM's JSON answer
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+class _JsonObjectScanner:
+    """
+    Incrementally locate the first top-level JSON object in streamed text.
+    
+    Tracks brace depth (ignoring braces inside strings) across chunks, so the
+    caller can stop the LLM stream as soon as the object closes instead of
+    waiting for trailing prose or the token limit.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Append a chunk; return the complete object text once it has closed."""
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = i + 1
+                    return text[self._start:i + 1]
+        self._pos = len(text)
+        return None
+
+
+def _summarize_ohlcv(ohlcv: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Period open/close/high/low/volume/change from columnar candles (vectorized reductions)."""
+    opens, highs, lows, closes, volumes = (ohlcv[k] for k in _OHLCV_FIELDS)
+    
+    open_price = float(opens[0])
+    close_price = float(closes[-1])
+    return {
+        "open": open_price,
+        "close": close_price,
+        "high": float(highs.max()),
+        "low": float(lows.min()),
+        "volume": float(volumes.sum()),
+        "change_percent": (close_price - open_price) / open_price * 100 if open_price > 0 else 0
+    }
+
 
 class AIEngine:
     """
@@ -44,7 +124,7 @@ class AIEngine:
     def __init__(self):
         self.llm_client = get_llm_client()
         self.prompt_manager = get_prompt_manager()
-        self.vector_store = QuantForgeVectorStore()
+        self.vector_store = get_vector_store()
         self.timeseries = get_timeseries_store()
         self.preprocessor = TextPreprocessor()
         self.validator = get_validator()
@@ -82,8 +162,8 @@ class AIEngine:
                 "meta": {...}
             }
         """
-        start_time = datetime.utcnow()
-        analysis_date = analysis_date or datetime.utcnow()
+        start_ns = time.perf_counter_ns()
+        analysis_date = analysis_date or datetime.now(timezone.utc)
         
         logger.info(f"Starting analysis: {ticker} ({analysis_type})")
         
@@ -106,10 +186,10 @@ class AIEngine:
                 result = await self._comprehensive_analysis(ticker, context)
             
             # Step 3: Add metadata
-            end_time = datetime.utcnow()
+            processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             result["meta"] = {
                 "analysis_date": analysis_date.isoformat(),
-                "processing_time_ms": int((end_time - start_time).total_seconds() * 1000),
+                "processing_time_ms": processing_time_ms,
                 "news_count": context["news_count"],
                 "has_price_data": context["has_price_data"],
                 "model_used": result.get("model_used", "mock"),
@@ -122,7 +202,8 @@ class AIEngine:
                     "prompt_version": self.prompt_manager.VERSION
                 }
             
-            logger.info(f"Analysis complete: {ticker} ({result['meta']['processing_time_ms']}ms)")
+            logger.info(f"Analysis complete: {ticker} ({processing_time_ms}ms)")
+            capture_slow_analysis(ticker, analysis_type, processing_time_ms)
             return result
             
         except Exception as e:
@@ -135,82 +216,91 @@ class AIEngine:
         start_date: datetime,
         end_date: datetime
     ) -> Dict[str, Any]:
-        """Gather all relevant data for analysis."""
+        """Gather all relevant data for analysis (news and prices fetched concurrently)."""
+        
+        news_articles, price_data = await asyncio.gather(
+            self._fetch_news(ticker, start_date, end_date),
+            self._fetch_prices(ticker, start_date, end_date),
+            return_exceptions=True
+        )
+        
+        if isinstance(news_articles, Exception):
+            logger.warning(f"Failed to fetch news: {news_articles}")
+            news_articles = []
+        if isinstance(price_data, Exception):
+            logger.warning(f"Failed to fetch price data: {price_data}")
+            price_data = None
+        
+        return {
+            "ticker": ticker,
+            "news_articles": news_articles,
+            "news_count": len(news_articles),
+            "price_data": price_data,
+            "has_price_data": price_data is not None,
+            "period": {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat()
+            }
+        }
+    
+    async def _fetch_news(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Embed the news query and fetch matching articles from the vector store."""
         
-        # Import embedder
-        from backend.engine.embeddings.hybrid_embedder import HybridEmbedder
-        embedder = HybridEmbedder()
+        # Shared embedder: concurrent analyses coalesce into one batched encode()
+        from backend.engine.embeddings.hybrid_embedder import get_embedder
+        embedder = get_embedder()
         
         # Embed the search query
         query_text = f"{ticker} news stock market"
         query_vector = await embedder.embed_text(query_text)
         
-        # Fetch news from vector store
+        # Fetch news from vector store (ticker + date range filtered inside Weaviate)
         news_results = await self.vector_store.search(
             query_vector=query_vector,
             collection_name="FinancialInsight",
             limit=20,
-            filters={"ticker": ticker} if ticker else None
+            filters={"ticker": ticker} if ticker else None,
+            min_distance=2.0,  # no distance cut-off (cosine max): filters + top-k decide
+            start_date=start_date,
+            end_date=end_date
         )
         
-        # Filter by date range
         news_articles = []
         for result in news_results:
             props = result.get("properties", {})
             timestamp = props.get("timestamp")
-            
-            if timestamp:
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                
-                if start_date <= timestamp <= end_date:
-                    news_articles.append({
-                        "title": props.get("title", ""),
-                        "content": props.get("content", "")[:300],  # Truncate
-                        "source": props.get("source", ""),
-                        "timestamp": timestamp.isoformat(),
-                        "category": props.get("category", "general")
-                    })
+            news_articles.append({
+                "title": props.get("title", ""),
+                "content": (props.get("content") or "")[:300],  # Truncate
+                "source": props.get("source", ""),
+                "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp,
+                "category": props.get("category", "general")
+            })
+        return news_articles
+    
+    async def _fetch_prices(
+        self,
+        ticker: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[Dict[str, float]]:
+        """Fetch OHLCV from TimescaleDB and summarize the period."""
+        await self.timeseries.connect()
         
-        # Fetch price data from TimescaleDB
-        price_data = None
-        try:
-            await self.timeseries.connect()
-            
-            symbol = ticker if "USDT" in ticker else f"{ticker}USDT"
-            
-            ohlcv = await self.timeseries.get_ohlcv(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            if ohlcv:
-                first = ohlcv[0]
-                last = ohlcv[-1]
-                
-                price_data = {
-                    "open": float(first.get("open", 0)),
-                    "close": float(last.get("close", 0)),
-                    "high": max(float(c.get("high", 0)) for c in ohlcv),
-                    "low": min(float(c.get("low", 0)) for c in ohlcv),
-                    "volume": sum(float(c.get("volume", 0)) for c in ohlcv),
-                    "change_percent": ((float(last.get("close", 0)) - float(first.get("open", 0))) / float(first.get("open", 0)) * 100) if float(first.get("open", 0)) > 0 else 0
-                }
-        except Exception as e:
-            logger.warning(f"Failed to fetch price data: {e}")
+        symbol = ticker if "USDT" in ticker else f"{ticker}USDT"
         
-        return {
-            "ticker": ticker,
-            "news_articles": news_articles,
-            "news_count": len(news_articles),
-            "price_data": price_data,
-            "has_price_data": price_data is not None,
-            "period": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            }
-        }
+        ohlcv = await self.timeseries.get_ohlcv_columnar(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date
+        )
+        
+        return _summarize_ohlcv(ohlcv) if len(ohlcv["close"]) else None
     
     async def _quick_analysis(self, ticker: str, context: Dict) -> Dict[str, Any]:
         """Quick analysis (<500ms target) using simple rules."""
@@ -225,16 +315,14 @@ class AIEngine:
             sentiment = "neutral"
             confidence = 0.3
         else:
-            # Count categories
-            categories = [n["category"] for n in context["news_articles"]]
-            if "earnings" in categories:
-                summary += "Earnings-related news detected."
-                sentiment = "bullish" if has_price and context["price_data"]["change_percent"] > 0 else "neutral"
-                confidence = 0.6
-            elif "regulation" in categories:
-                summary += "Regulatory news detected."
-                sentiment = "bearish"
-                confidence = 0.5
+            # One pass to collect categories, then O(1) lookups in rule priority order
+            categories = {n["category"] for n in context["news_articles"]}
+            for category, (summary_suffix, sentiment, confidence) in _QUICK_CATEGORY_RULES.items():
+                if category in categories:
+                    summary += summary_suffix
+                    if sentiment is None:
+                        sentiment = "bullish" if has_price and context["price_data"]["change_percent"] > 0 else "neutral"
+                    break
             else:
                 summary += f"{news_count} news articles found."
                 sentiment = "neutral"
@@ -284,17 +372,10 @@ class AIEngine:
             news_text=news_text
         )
         
-        # Call LLM
+        # Call LLM (streamed; returns as soon as the JSON object is complete)
         try:
-            llm_response = await self.llm_client.generate(
-                prompt=prompt["user"],
-                system_message=prompt["system"],
-                max_tokens=300,
-                temperature=0.3
-            )
-            
-            # Parse JSON response
-            analysis = self._parse_llm_json(llm_response["text"])
+            stream_info: Dict[str, str] = {}
+            analysis = await self._stream_llm_json(prompt, stream_info, max_tokens=300, temperature=0.3)
             
             # Validate response
             validation_result = self.validator.validate_analysis(analysis, context)
@@ -315,7 +396,7 @@ class AIEngine:
                 "confidence": adjusted_confidence,
                 "key_insights": analysis.get("themes", []),
                 "impact": analysis.get("impact", ""),
-                "model_used": llm_response["provider"]
+                "model_used": stream_info.get("provider", "unknown")
             }
             
             # Add validation warnings if verbose or if critical
@@ -351,29 +432,52 @@ class AIEngine:
         
         return result
     
+    async def _stream_llm_json(
+        self,
+        prompt: Dict[str, str],
+        info: Dict[str, str],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Stream an LLM answer, parsing its JSON object as soon as it closes."""
+        scanner = _JsonObjectScanner()
+        stream = self.llm_client.stream(
+            prompt=prompt["user"],
+            system_message=prompt["system"],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            info=info
+        )
+        try:
+            async for chunk in stream:
+                obj_text = scanner.feed(chunk)
+                if obj_text is not None:
+                    # The answer is complete: let the stream cache it when closed below
+                    info["complete"] = True
+                    return self._parse_llm_json(obj_text)
+        finally:
+            # Early return: closes the provider's HTTP stream instead of draining it
+            await stream.aclose()
+        
+        return self._parse_llm_json(scanner.text)
+    
     def _parse_llm_json(self, text: str) -> Dict[str, Any]:
         """Parse JSON from LLM response (handles markdown code blocks)."""
         try:
-            # Remove markdown code blocks if present
-            text = text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            if text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            
-            return json.loads(text.strip())
-        except:
+            return orjson.loads(_CODE_FENCE_RE.sub("", text.strip()).strip())
+        except orjson.JSONDecodeError:
             return {}
 
 
 # Singleton instance
 _ai_engine = None
+_ai_engine_lock = threading.Lock()
 
 def get_ai_engine() -> AIEngine:
     """Get singleton AIEngine instance."""
     global _ai_engine
     if _ai_engine is None:
-        _ai_engine = AIEngine()
+        with _ai_engine_lock:
+            if _ai_engine is None:
+                _ai_engine = AIEngine()
     return _ai_engine
@@ -1,4 +1,4 @@
 # backend/engine/embeddings/__init__.py
-from .hybrid_embedder import HybridEmbedder
+from .hybrid_embedder import HybridEmbedder, get_embedder
 
-__all__ = ["HybridEmbedder"]
+__all__ = ["HybridEmbedder", "get_embedder"]
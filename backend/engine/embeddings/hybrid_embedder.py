@@ -4,14 +4,33 @@ Uses local sentence-transformers for embeddings (more reliable than API)
 Supports Ollama as backup
 """
 
-from typing import List, Union, Optional
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Union, Optional
 import httpx
 import asyncio
+import numpy as np
+import orjson
+import sentry_sdk
 from backend.core.config import settings
 from backend.core.logging import get_logger
+from backend.utils.batching import MicroBatcher
 
 logger = get_logger(__name__)
 
+# Upper bound on in-flight Ollama embedding requests per batch
+OLLAMA_MAX_CONCURRENCY = 16
+
+# Known output dimensions for models we can't introspect (remote/Ollama)
+MODEL_DIMENSIONS = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "nomic-embed-text": 768,
+}
+
 
 class HybridEmbedder:
     """
@@ -22,25 +41,109 @@ class HybridEmbedder:
     
     def __init__(self):
         self.backend = settings.EMBEDDING_BACKEND
-        self.ollama_url = f"{settings.OLLAMA_URL}/api/embeddings"
         self.model = None
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # text digest -> float16 vector bytes; ordered oldest -> newest for LRU eviction
+        self._cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._cache_size = settings.EMBED_CACHE_SIZE
         
         # Initialize local model if using HuggingFace
         if self.backend == "huggingface":
             try:
                 from sentence_transformers import SentenceTransformer
+                self._limit_torch_threads()
                 model_name = settings.HF_EMBEDDING_MODEL
-                logger.info(f"Loading local model: {model_name}")
-                self.model = SentenceTransformer(model_name)
+                logger.info(f"Loading local model: {model_name} (runtime={settings.EMBEDDING_RUNTIME})")
+                if settings.EMBEDDING_RUNTIME == "onnx":
+                    self.model = self._load_onnx(SentenceTransformer, model_name)
+                if self.model is None:
+                    self.model = SentenceTransformer(model_name)
                 logger.info(f"✅ Model loaded successfully (dim={self.model.get_sentence_embedding_dimension()})")
             except Exception as e:
                 logger.error(f"Failed to load local model: {e}")
                 logger.warning("Falling back to Ollama if available")
                 self.backend = "ollama"
         
+        # Coalesce concurrent single-text requests into one batched encode()
+        self._batcher = MicroBatcher(
+            self._embed_local_batch,
+            max_batch=settings.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBED_BATCH_MAX_WAIT_MS,
+            name="embedder"
+        )
+        
+        # Resolved once: the local model reports its own dimension
+        if self.model is not None:
+            self._dim = self.model.get_sentence_embedding_dimension()
+        elif self.backend == "ollama":
+            self._dim = MODEL_DIMENSIONS.get(settings.OLLAMA_EMBED_MODEL, 768)
+        else:
+            self._dim = MODEL_DIMENSIONS.get(settings.HF_EMBEDDING_MODEL, 384)
+        
         logger.info(f"HybridEmbedder initialized with backend: {self.backend}")
     
-    async def embed_text(self, text: str) -> List[float]:
+    @staticmethod
+    def _limit_torch_threads():
+        """Split CPU cores across uvicorn workers instead of every worker claiming all of them."""
+        try:
+            import torch
+        except ImportError:
+            return
+        threads = settings.EMBED_NUM_THREADS or max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+        torch.set_num_threads(threads)
+        logger.info(f"Torch intra-op threads: {threads}")
+    
+    @staticmethod
+    def _load_onnx(model_cls, model_name: str):
+        """
+        Load an int8-quantized ONNX export through ONNX Runtime.
+        
+        Uses the pre-quantized file from the model repo when present, otherwise
+        quantizes locally once and caches the result under EMBEDDING_ONNX_CACHE_DIR.
+        Requires `optimum[onnxruntime]`; returns None so the caller can fall back to PyTorch.
+        """
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        try:
+            return model_cls(
+                model_name,
+                backend="onnx",
+                model_kwargs={**model_kwargs, "file_name": settings.EMBEDDING_ONNX_FILE}
+            )
+        except Exception as e:
+            logger.info(f"Pre-quantized ONNX file unavailable ({e}), quantizing locally")
+        
+        try:
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            
+            config = settings.EMBEDDING_ONNX_QUANTIZATION
+            cache_dir = Path(settings.EMBEDDING_ONNX_CACHE_DIR) / model_name.replace("/", "__")
+            file_name = f"onnx/model_qint8_{config}.onnx"
+            
+            if not (cache_dir / file_name).exists():
+                fp32_model = model_cls(model_name, backend="onnx", model_kwargs=model_kwargs)
+                fp32_model.save_pretrained(str(cache_dir))
+                export_dynamic_quantized_onnx_model(fp32_model, config, str(cache_dir))
+                logger.info(f"✅ Quantized ONNX model cached at {cache_dir / file_name}")
+            
+            return model_cls(
+                str(cache_dir),
+                backend="onnx",
+                model_kwargs={**model_kwargs, "file_name": file_name}
+            )
+        except Exception as e:
+            logger.warning(f"ONNX embedding runtime unavailable, using PyTorch: {e}")
+            return None
+    
+    async def warmup(self):
+        """Run one embedding so weights are paged in before the first request."""
+        try:
+            await self.embed_text("warmup")
+            logger.info(f"✅ Embedder warmed up ({self.backend})")
+        except Exception as e:
+            logger.warning(f"Embedder warmup failed: {e}")
+    
+    async def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text string.
         
@@ -48,19 +151,28 @@ class HybridEmbedder:
             text: Text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            1-D float32 array holding the embedding vector
         """
-        if self.backend == "huggingface" and self.model:
-            # Use local sentence-transformers model
-            return await self._embed_local([text])
+        key = self._cache_key(text)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         
-        elif self.backend == "ollama":
-            return await self._embed_ollama([text])
+        with sentry_sdk.start_span(op=f"embed.{self.backend}", name="embed_text"):
+            if self.backend == "huggingface" and self.model:
+                # Use local sentence-transformers model (micro-batched)
+                embedding = await self._batcher.submit(text)
+            
+            elif self.backend == "ollama":
+                embedding = await self._embed_ollama([text])
+            
+            else:
+                raise ValueError(f"No working embedding backend available")
         
-        else:
-            raise ValueError(f"No working embedding backend available")
+        self._cache_put(key, embedding)
+        return embedding
     
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts (batch processing).
         
@@ -68,63 +180,118 @@ class HybridEmbedder:
             texts: List of texts to embed
             
         Returns:
-            List of embedding vectors
+            (N, D) float32 array, one row per input text
         """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
         
-        if self.backend == "huggingface" and self.model:
-            # Use local model for batch
-            return await self._embed_local_batch(texts)
+        keys = [self._cache_key(text) for text in texts]
+        results: Dict[bytes, np.ndarray] = {}
+        misses: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in misses:
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                misses[key] = text
         
-        elif self.backend == "ollama":
-            return await self._embed_ollama_batch(texts)
+        if misses:
+            if self.backend == "huggingface" and self.model:
+                # Use local model for batch
+                embeddings = await self._embed_local_batch(list(misses.values()))
+            
+            elif self.backend == "ollama":
+                embeddings = await self._embed_ollama_batch(list(misses.values()))
+            
+            else:
+                raise ValueError(f"No working embedding backend available")
+            
+            for key, embedding in zip(misses, embeddings):
+                self._cache_put(key, embedding)
+                results[key] = embedding
         
-        else:
-            raise ValueError(f"No working embedding backend available")
+        # Stitch back into input order (duplicates share one computation)
+        return np.stack([results[key] for key in keys])
+    
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        packed = self._cache.get(key)
+        if packed is None:
+            return None
+        self._cache.move_to_end(key)
+        return np.frombuffer(packed, dtype=np.float16).astype(np.float32)
     
-    async def _embed_local(self, texts: List[str]) -> List[float]:
-        """Use local sentence-transformers model for single text"""
+    def _cache_put(self, key: bytes, embedding: np.ndarray):
+        if self._cache_size <= 0 or not len(embedding):
+            return
+        # float16 halves memory; cosine similarity is unaffected at this precision
+        self._cache[key] = np.asarray(embedding, dtype=np.float16).tobytes()
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
+    async def _embed_local_batch(self, texts: List[str]) -> np.ndarray:
+        """Use local sentence-transformers model for batch ((N, D) float32, rows unit-length)"""
         # Run in thread pool to avoid blocking
-        def _encode():
-            embedding = self.model.encode(texts[0], convert_to_numpy=True)
-            return embedding.tolist()
-        
-        return await asyncio.to_thread(_encode)
+        return await asyncio.to_thread(
+            self.model.encode,
+            texts,
+            batch_size=settings.EMBED_BATCH_MAX_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
     
-    async def _embed_local_batch(self, texts: List[str]) -> List[List[float]]:
-        """Use local sentence-transformers model for batch"""
-        def _encode():
-            embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-            return [emb.tolist() for emb in embeddings]
-        
-        return await asyncio.to_thread(_encode)
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for Ollama calls (created lazily inside the running loop)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=settings.OLLAMA_URL,
+                # Fail fast when Ollama is down; embeddings themselves may take a while
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Stop the batcher and close the shared HTTP client."""
+        await self._batcher.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
-    async def _embed_ollama(self, texts: List[str]) -> List[float]:
+    async def _embed_ollama(self, texts: List[str]) -> np.ndarray:
         """Call Ollama API for single text"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.ollama_url,
-                json={
-                    "model": settings.OLLAMA_EMBED_MODEL,
-                    "prompt": texts[0]
-                }
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Ollama API error: {response.status_code}")
-                raise Exception(f"Ollama API returned {response.status_code}")
-            
-            result = response.json()
-            return result.get("embedding", [])
+        response = await self._get_client().post(
+            "/api/embeddings",
+            content=orjson.dumps({
+                "model": settings.OLLAMA_EMBED_MODEL,
+                "prompt": texts[0]
+            }),
+            headers={"Content-Type": "application/json"}
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Ollama API error: {response.status_code}")
+            raise Exception(f"Ollama API returned {response.status_code}")
+        
+        result = orjson.loads(response.content)
+        return np.asarray(result.get("embedding", []), dtype=np.float32)
     
-    async def _embed_ollama_batch(self, texts: List[str]) -> List[List[float]]:
-        """Call Ollama API for batch of texts"""
-        embeddings = []
-        for text in texts:
-            embedding = await self._embed_ollama([text])
-            embeddings.append(embedding)
-        return embeddings
+    async def _embed_ollama_batch(self, texts: List[str]) -> np.ndarray:
+        """Call Ollama API for batch of texts (concurrently, bounded)"""
+        semaphore = asyncio.Semaphore(OLLAMA_MAX_CONCURRENCY)
+        
+        async def _one(text: str) -> np.ndarray:
+            async with semaphore:
+                return await self._embed_ollama([text])
+        
+        return np.stack(await asyncio.gather(*[_one(text) for text in texts]))
     
     def get_embedding_dimension(self) -> int:
         """
@@ -133,26 +300,24 @@ class HybridEmbedder:
         Returns:
             Embedding dimension (e.g., 384 for all-MiniLM-L6-v2)
         """
-        model_dimensions = {
-            "sentence-transformers/all-MiniLM-L6-v2": 384,
-            "sentence-transformers/all-mpnet-base-v2": 768,
-            "nomic-embed-text": 768,
-        }
-        
-        if self.backend == "huggingface":
-            return model_dimensions.get(self.hf_model, 384)
-        elif self.backend == "ollama":
-            return model_dimensions.get(settings.OLLAMA_EMBED_MODEL, 768)
-        
-        return 384  # Default
+        return self._dim
 
 
 # Singleton instance
 _embedder_instance: Optional[HybridEmbedder] = None
+_embedder_lock = threading.Lock()
 
 def get_embedder() -> HybridEmbedder:
-    """Get or create the singleton HybridEmbedder instance"""
+    """Get or create the singleton HybridEmbedder instance (model loads once even under concurrent first use)"""
     global _embedder_instance
     if _embedder_instance is None:
-        _embedder_instance = HybridEmbedder()
+        with _embedder_lock:
+            if _embedder_instance is None:
+                _embedder_instance = HybridEmbedder()
     return _embedder_instance
+
+
+async def close_embedder():
+    """Release the singleton's pooled connections (called on app shutdown)."""
+    if _embedder_instance is not None:
+        await _embedder_instance.aclose()
@@ -10,10 +10,11 @@ Supports multiple data sources:
 
 from .base import BaseFeedConnector
 from .rss_connector import RSSFeedConnector
-from .binance_connector import BinanceConnector
+from .binance_connector import BinanceConnector, OHLCVColumns
 
 __all__ = [
     "BaseFeedConnector",
     "RSSFeedConnector",
     "BinanceConnector",
+    "OHLCVColumns",
 ]
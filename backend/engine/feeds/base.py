@@ -7,10 +7,18 @@ Provides common interface and utilities.
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import httpx
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# HTTP/2 needs the optional `h2` package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class BaseFeedConnector(ABC):
     """
@@ -18,10 +26,34 @@ class BaseFeedConnector(ABC):
     All feed implementations should inherit from this.
     """
     
+    # Default headers / pool limits for the connector's pooled HTTP client
+    HTTP_HEADERS: Dict[str, str] = {}
+    HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    
     def __init__(self, source_name: str):
         self.source_name = source_name
+        self.timeout = 30
+        self._client: Optional[httpx.AsyncClient] = None
         logger.info(f"Initialized {self.__class__.__name__} for source: {source_name}")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client (created lazily inside the running loop)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.HTTP_HEADERS,
+                limits=self.HTTP_LIMITS,
+                # Hosts that negotiate h2 via ALPN multiplex requests over one TLS session
+                http2=HTTP2_AVAILABLE
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close pooled connections (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     @abstractmethod
     async def fetch(self, **kwargs) -> List[Dict[str, Any]]:
         """
@@ -8,18 +8,76 @@ Fetches:
 - Multiple trading pairs (BTC-USD, ETH-USD, etc.)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
-import httpx
+import time
+from collections import OrderedDict, defaultdict, deque
+import numpy as np
+import orjson
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
 
 from .base import BaseFeedConnector
 from backend.core.logging import get_logger
+from backend.utils.throttle import AsyncTokenBucket
 from backend.core.config import settings
 
 logger = get_logger(__name__)
 
 
+class OHLCVColumns:
+    """
+    Columnar (SoA) OHLCV batch: one ndarray per field.
+    
+    Prices/volume are float64, timestamps datetime64[ms] (UTC), num_trades int64.
+    Index with a field name for a column, or with an int for a single row dict.
+    """
+    
+    FIELDS = {
+        "timestamp": "datetime64[ms]",
+        "open": np.float64,
+        "high": np.float64,
+        "low": np.float64,
+        "close": np.float64,
+        "volume": np.float64,
+        "num_trades": np.int64,
+    }
+    
+    __slots__ = ("columns",)
+    
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+    
+    @classmethod
+    def empty(cls) -> "OHLCVColumns":
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in cls.FIELDS.items()})
+    
+    @classmethod
+    def concat(cls, parts: List["OHLCVColumns"]) -> "OHLCVColumns":
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls({name: np.concatenate([p.columns[name] for p in parts]) for name in cls.FIELDS})
+    
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+    
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        """Open times as int64 epoch milliseconds (a view, no copy)."""
+        return self.columns["timestamp"].view(np.int64)
+    
+    def __getitem__(self, key: Union[str, int]):
+        if isinstance(key, str):
+            return self.columns[key]
+        return {name: column[key].item() for name, column in self.columns.items()}
+
+
 class BinanceConnector(BaseFeedConnector):
     """
     Binance API connector for cryptocurrency market data.
@@ -44,10 +102,47 @@ class BinanceConnector(BaseFeedConnector):
         "1w": "1w",
     }
     
+    # Candle length per interval, used to precompute page windows
+    INTERVAL_MS = {
+        "1m": 60_000,
+        "5m": 300_000,
+        "15m": 900_000,
+        "1h": 3_600_000,
+        "4h": 14_400_000,
+        "1d": 86_400_000,
+        "1w": 604_800_000,
+    }
+    
+    # Symbols paginated in parallel by fetch_multiple_symbols()
+    MAX_CONCURRENT_SYMBOLS = 8
+    
+    # Page requests in flight per symbol when windows are known up front
+    MAX_CONCURRENT_PAGES = 4
+    
+    # Ticker prices are reused for this long (seconds) by fetch_current_price()
+    PRICE_CACHE_TTL = 2.0
+    PRICE_CACHE_SIZE = 1024
+    
+    # All-market mini-ticker stream (one frame per second with every changed symbol)
+    STREAM_URL = "wss://stream.binance.com:9443/ws/!miniTicker@arr"
+    # Streamed prices are trusted while a frame arrived within this many seconds
+    STREAM_STALE_AFTER = 10.0
+    
     def __init__(self, source_name: str = "Binance"):
         super().__init__(source_name)
         self.timeout = 30
-        self.rate_limit_delay = 0.05  # 50ms between requests (1200/min max)
+        # Binance allows 1200 requests/min per IP: concurrent requests share the budget
+        self._limiter = AsyncTokenBucket(1200, 60)
+        # symbol -> (expires_at, price); ordered oldest -> newest for eviction
+        self._price_cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        # One in-flight ticker request per symbol; concurrent callers wait for it
+        self._price_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Latest streamed close price per symbol (see start_price_stream)
+        self._live_prices: Dict[str, float] = {}
+        self._stream_symbols: Optional[Set[str]] = None
+        self._stream_last_frame = 0.0
+        self._stream_task: Optional[asyncio.Task] = None
+        self._sem = asyncio.Semaphore(self.MAX_CONCURRENT_SYMBOLS)
     
     async def fetch_ohlcv(
         self,
@@ -56,7 +151,7 @@ class BinanceConnector(BaseFeedConnector):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 1000
-    ) -> List[Dict[str, Any]]:
+    ) -> "OHLCVColumns":
         """
         Fetch OHLCV data for a symbol.
         
@@ -68,7 +163,31 @@ class BinanceConnector(BaseFeedConnector):
             limit: Max candles to fetch (default: 1000, max: 1000)
             
         Returns:
-            List of OHLCV records
+            Columnar OHLCV batch (one array per field)
+        """
+        pages = [
+            page async for page in self.fetch_ohlcv_stream(
+                symbol, interval, start_date, end_date, limit
+            )
+        ]
+        
+        data = OHLCVColumns.concat(pages)
+        logger.info(f"Fetched {len(data)} total candles for {symbol}")
+        return data
+    
+    async def fetch_ohlcv_stream(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> AsyncIterator["OHLCVColumns"]:
+        """
+        Yield OHLCV pages as Binance returns them.
+        
+        Same arguments as fetch_ohlcv; only the pages in flight are held, so
+        consumers can process/store each page while later ones are fetched.
         """
         # Validate interval
         if interval not in self.INTERVALS:
@@ -80,72 +199,115 @@ class BinanceConnector(BaseFeedConnector):
         if not end_date:
             end_date = datetime.utcnow()
         
-        all_data = []
-        current_start = start_date
+        start_ms = int(start_date.timestamp() * 1000)
+        end_ms = int(end_date.timestamp() * 1000)
+        
+        if interval in self.INTERVAL_MS:
+            pages = self._stream_windows(symbol, interval, start_ms, end_ms, limit)
+        else:
+            pages = self._stream_serial(symbol, interval, start_ms, end_ms, limit)
+        
+        async for page in pages:
+            yield page
+    
+    async def _stream_windows(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int, limit: int
+    ) -> AsyncIterator["OHLCVColumns"]:
+        """
+        Fixed-length candles: every page's time window is known up front, so up to
+        MAX_CONCURRENT_PAGES requests are kept in flight and pages are yielded in order.
+        """
+        step = min(limit, 1000) * self.INTERVAL_MS[interval]
+        windows = iter([(s, min(s + step - 1, end_ms)) for s in range(start_ms, end_ms, step)])
+        
+        def _launch(window) -> asyncio.Task:
+            return asyncio.create_task(self._fetch_single_batch(
+                symbol=symbol, interval=interval, start_ms=window[0], end_ms=window[1], limit=limit
+            ))
         
-        # Binance limits to 1000 candles per request, so paginate
-        while current_start < end_date:
+        in_flight = deque()
+        try:
+            for window in windows:
+                in_flight.append(_launch(window))
+                if len(in_flight) == self.MAX_CONCURRENT_PAGES:
+                    break
+            
+            while in_flight:
+                try:
+                    page = await in_flight.popleft()
+                except Exception as e:
+                    logger.error(f"Failed to fetch batch for {symbol}: {e}")
+                    return
+                
+                window = next(windows, None)
+                if window is not None:
+                    in_flight.append(_launch(window))
+                
+                if len(page):
+                    logger.debug("Fetched %d candles for %s", len(page), symbol)
+                    yield page
+        finally:
+            # Consumer stopped early or a page failed: drop the remaining requests
+            for task in in_flight:
+                task.cancel()
+    
+    async def _stream_serial(
+        self, symbol: str, interval: str, current_ms: int, end_ms: int, limit: int
+    ) -> AsyncIterator["OHLCVColumns"]:
+        """Page by page, each request starting after the previous page's last candle."""
+        while current_ms < end_ms:
             try:
-                data = await self._fetch_single_batch(
+                page = await self._fetch_single_batch(
                     symbol=symbol,
                     interval=interval,
-                    start_time=current_start,
-                    end_time=end_date,
+                    start_ms=current_ms,
+                    end_ms=end_ms,
                     limit=limit
                 )
-                
-                if not data:
-                    break
-                
-                all_data.extend(data)
-                
-                # Update start time for next batch
-                last_timestamp = data[-1]["timestamp"]
-                current_start = last_timestamp + timedelta(milliseconds=1)
-                
-                # Rate limiting
-                await asyncio.sleep(self.rate_limit_delay)
-                
-                logger.debug(f"Fetched {len(data)} candles for {symbol}")
-                
             except Exception as e:
                 logger.error(f"Failed to fetch batch for {symbol}: {e}")
-                break
-        
-        logger.info(f"Fetched {len(all_data)} total candles for {symbol} from {start_date} to {end_date}")
-        return all_data
+                return
+            
+            if not len(page):
+                return
+            
+            logger.debug("Fetched %d candles for %s", len(page), symbol)
+            yield page
+            
+            # Next batch starts just after the last open time
+            current_ms = int(page.timestamps_ms[-1]) + 1
     
     async def _fetch_single_batch(
         self,
         symbol: str,
         interval: str,
-        start_time: datetime,
-        end_time: datetime,
+        start_ms: int,
+        end_ms: int,
         limit: int
-    ) -> List[Dict[str, Any]]:
+    ) -> "OHLCVColumns":
         """Fetch a single batch of OHLCV data."""
         params = {
             "symbol": symbol,
             "interval": self.INTERVALS[interval],
-            "startTime": int(start_time.timestamp() * 1000),
-            "endTime": int(end_time.timestamp() * 1000),
+            "startTime": start_ms,
+            "endTime": end_ms,
             "limit": min(limit, 1000)
         }
         
         url = f"{self.BASE_URL}/klines"
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            
-            raw_data = response.json()
-            
-            # Parse Binance format
-            return self._parse_klines(raw_data)
+        async with self._limiter:
+            response = await self._get_client().get(url, params=params)
+        response.raise_for_status()
+        
+        raw_data = orjson.loads(response.content)
+        
+        # Parse Binance format
+        return self._parse_klines(raw_data)
     
-    def _parse_klines(self, raw_data: List[List]) -> List[Dict[str, Any]]:
+    def _parse_klines(self, raw_data: List[List]) -> "OHLCVColumns":
         """
-        Parse Binance klines response.
+        Parse Binance klines response into columns.
         
         Binance format:
         [
@@ -165,30 +327,29 @@ class BinanceConnector(BaseFeedConnector):
             ]
         ]
         """
-        parsed = []
-        
-        for kline in raw_data:
-            parsed.append({
-                "timestamp": datetime.fromtimestamp(kline[0] / 1000),
-                "open": float(kline[1]),
-                "high": float(kline[2]),
-                "low": float(kline[3]),
-                "close": float(kline[4]),
-                "volume": float(kline[5]),
-                "close_timestamp": datetime.fromtimestamp(kline[6] / 1000),
-                "num_trades": int(kline[8]),
-            })
+        if not raw_data:
+            return OHLCVColumns.empty()
         
-        return parsed
+        # Transpose rows -> columns once; NumPy parses the decimal strings in C
+        cols = list(zip(*raw_data))
+        return OHLCVColumns({
+            "timestamp": np.array(cols[0], dtype="datetime64[ms]"),
+            "open": np.array(cols[1], dtype=np.float64),
+            "high": np.array(cols[2], dtype=np.float64),
+            "low": np.array(cols[3], dtype=np.float64),
+            "close": np.array(cols[4], dtype=np.float64),
+            "volume": np.array(cols[5], dtype=np.float64),
+            "num_trades": np.array(cols[8], dtype=np.int64),
+        })
     
     async def fetch_multiple_symbols(
         self,
         symbols: List[str],
         interval: str = "1h",
         days: int = 30
-    ) -> Dict[str, List[Dict[str, Any]]]:
+    ) -> Dict[str, OHLCVColumns]:
         """
-        Fetch OHLCV data for multiple symbols.
+        Fetch OHLCV data for multiple symbols concurrently.
         
         Args:
             symbols: List of trading pairs (e.g., ["BTCUSDT", "ETHUSDT"])
@@ -201,57 +362,182 @@ class BinanceConnector(BaseFeedConnector):
         start_date = datetime.utcnow() - timedelta(days=days)
         end_date = datetime.utcnow()
         
-        results = {}
-        
-        for symbol in symbols:
-            try:
-                data = await self.fetch_ohlcv(
+        async def _fetch(symbol: str) -> OHLCVColumns:
+            # Bounded so a long symbol list doesn't burst past Binance's request budget
+            async with self._sem:
+                return await self.fetch_ohlcv(
                     symbol=symbol,
                     interval=interval,
                     start_date=start_date,
                     end_date=end_date
                 )
-                results[symbol] = data
-                
-            except Exception as e:
-                logger.error(f"Failed to fetch {symbol}: {e}")
-                results[symbol] = []
+        
+        results_list = await asyncio.gather(*[_fetch(s) for s in symbols], return_exceptions=True)
+        
+        results = {}
+        for symbol, data in zip(symbols, results_list):
+            if isinstance(data, Exception):
+                logger.error(f"Failed to fetch {symbol}: {data}")
+                data = OHLCVColumns.empty()
+            results[symbol] = data
         
         return results
     
+    def _cached_price(self, symbol: str) -> Optional[float]:
+        entry = self._price_cache.get(symbol)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def _cache_price(self, symbol: str, price: float):
+        self._price_cache[symbol] = (time.monotonic() + self.PRICE_CACHE_TTL, price)
+        self._price_cache.move_to_end(symbol)
+        while len(self._price_cache) > self.PRICE_CACHE_SIZE:
+            self._price_cache.popitem(last=False)
+    
     async def fetch_current_price(self, symbol: str) -> Optional[float]:
         """
         Fetch current price for a symbol.
         
+        Served from the live price stream when it is running; otherwise (or
+        before the symbol's first frame) from REST, cached for PRICE_CACHE_TTL
+        seconds, with concurrent callers for the same symbol sharing one request.
+        
         Args:
             symbol: Trading pair (e.g., "BTCUSDT")
             
         Returns:
             Current price or None
         """
-        try:
-            url = f"{self.BASE_URL}/ticker/price"
-            params = {"symbol": symbol}
+        price = self.live_price(symbol)
+        if price is not None:
+            return price
+        
+        price = self._cached_price(symbol)
+        if price is not None:
+            return price
+        
+        async with self._price_locks[symbol]:
+            # Another caller may have fetched it while we waited
+            price = self._cached_price(symbol)
+            if price is not None:
+                return price
             
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
+            try:
+                url = f"{self.BASE_URL}/ticker/price"
+                params = {"symbol": symbol}
                 
-                data = response.json()
-                return float(data["price"])
+                async with self._limiter:
+                    response = await self._get_client().get(url, params=params, timeout=10)
+                response.raise_for_status()
                 
+                data = orjson.loads(response.content)
+                price = float(data["price"])
+                self._cache_price(symbol, price)
+                return price
+                    
+            except Exception as e:
+                logger.error(f"Failed to fetch current price for {symbol}: {e}")
+                return None
+    
+    async def fetch_all_prices(self) -> Dict[str, float]:
+        """
+        Fetch current prices for every symbol in one request (for dashboards).
+        
+        Also refreshes the cache used by fetch_current_price().
+        """
+        try:
+            url = f"{self.BASE_URL}/ticker/price"
+            
+            async with self._limiter:
+                response = await self._get_client().get(url, timeout=10)
+            response.raise_for_status()
+            
+            prices = {item["symbol"]: float(item["price"]) for item in orjson.loads(response.content)}
         except Exception as e:
-            logger.error(f"Failed to fetch current price for {symbol}: {e}")
+            logger.error(f"Failed to fetch all prices: {e}")
+            return {}
+        
+        for symbol, price in prices.items():
+            self._cache_price(symbol, price)
+        return prices
+    
+    # === Live price stream ===
+    
+    def live_price(self, symbol: str) -> Optional[float]:
+        """Latest streamed price, or None if the stream is down or hasn't seen the symbol."""
+        if time.monotonic() - self._stream_last_frame > self.STREAM_STALE_AFTER:
             return None
+        return self._live_prices.get(symbol)
+    
+    def start_price_stream(self, symbols: Optional[Iterable[str]] = None) -> bool:
+        """
+        Keep latest prices from the Binance mini-ticker WebSocket in memory.
+        
+        Args:
+            symbols: Symbols to track (default: all)
+            
+        Returns:
+            False if the `websockets` package isn't installed
+        """
+        if websockets is None:
+            logger.warning("websockets not installed - live prices fall back to REST")
+            return False
+        
+        self._stream_symbols = set(symbols) if symbols else None
+        if self._stream_task is None or self._stream_task.done():
+            self._stream_task = asyncio.create_task(self._run_price_stream())
+        return True
+    
+    async def stop_price_stream(self):
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            try:
+                await self._stream_task
+            except asyncio.CancelledError:
+                pass
+            self._stream_task = None
+        self._stream_last_frame = 0.0
+    
+    async def _run_price_stream(self):
+        """Consume the stream forever, reconnecting with backoff (Binance drops sockets every 24h)."""
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.STREAM_URL, ping_interval=20) as ws:
+                    logger.info("Binance price stream connected")
+                    backoff = 1.0
+                    async for frame in ws:
+                        self._apply_ticker_frame(frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Binance price stream dropped: {e}; reconnecting in {backoff:.0f}s")
+            
+            self._stream_last_frame = 0.0
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+    
+    def _apply_ticker_frame(self, frame: Union[str, bytes]):
+        """Update live prices from one `!miniTicker@arr` frame."""
+        symbols = self._stream_symbols
+        for ticker in orjson.loads(frame):
+            if symbols is None or ticker["s"] in symbols:
+                self._live_prices[ticker["s"]] = float(ticker["c"])
+        self._stream_last_frame = time.monotonic()
+    
+    async def aclose(self):
+        """Stop the price stream and close pooled connections."""
+        await self.stop_price_stream()
+        await super().aclose()
     
     async def validate_connection(self) -> bool:
         """Test Binance API connectivity."""
         try:
             url = f"{self.BASE_URL}/ping"
             
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(url)
-                return response.status_code == 200
+            response = await self._get_client().get(url, timeout=5)
+            return response.status_code == 200
                 
         except:
             return False
@@ -43,6 +43,15 @@ class FinancialFeedSources:
     # All feeds combined
     ALL_FEEDS = BUSINESS_NEWS + TECHNOLOGY + CRYPTO + INVESTING
     
+    # Category name -> feed list (built once with the class)
+    _CATEGORY_MAP: Dict[str, List[str]] = {
+        "business": BUSINESS_NEWS,
+        "technology": TECHNOLOGY,
+        "crypto": CRYPTO,
+        "investing": INVESTING,
+        "all": ALL_FEEDS,
+    }
+    
     @classmethod
     def get_by_category(cls, category: str) -> List[str]:
         """
@@ -54,15 +63,7 @@ class FinancialFeedSources:
         Returns:
             List of RSS feed URLs
         """
-        category_map = {
-            "business": cls.BUSINESS_NEWS,
-            "technology": cls.TECHNOLOGY,
-            "crypto": cls.CRYPTO,
-            "investing": cls.INVESTING,
-            "all": cls.ALL_FEEDS,
-        }
-        
-        return category_map.get(category.lower(), [])
+        return cls._CATEGORY_MAP.get(category.lower(), [])
     
     @classmethod
     def get_recommended(cls, count: int = 5) -> List[str]:
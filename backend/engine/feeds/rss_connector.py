@@ -5,18 +5,87 @@ RSS Feed Connector for financial news ingestion.
 Supports parsing multiple RSS/Atom feeds from financial news sources.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 import asyncio
+import hashlib
+import math
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import feedparser
 from bs4 import BeautifulSoup
 import httpx
+import orjson
+
+try:
+    from selectolax.parser import HTMLParser  # C (Modest) HTML parser
+except ImportError:
+    HTMLParser = None
 
 from .base import BaseFeedConnector
+from backend.core.config import settings
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+_WS_RE = re.compile(r"\s+")
+
+# Entry date fields, most specific first
+_TIMESTAMP_FIELDS = ("published_parsed", "updated_parsed", "created_parsed")
+
+# feedparser is pure Python: feeds above this size are parsed in a worker process
+# so concurrent parses use real cores; smaller ones aren't worth the pickling round-trip
+PROCESS_PARSE_MIN_BYTES = 64 * 1024
+
+# Per-feed ETag/Last-Modified, persisted so conditional GETs survive restarts
+VALIDATOR_KEY_PREFIX = "quantforge:rss_validators"
+VALIDATOR_TTL = 7 * 24 * 3600
+
+# fetch() state of one feed, applied by commit() once its documents were ingested:
+# (validators to save or None, keys of the new entries returned, all new entries returned?)
+PendingFeed = Tuple[Optional[Tuple[Optional[str], Optional[str]]], Set[bytes], bool]
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _parse_feed(feed_content: str) -> feedparser.FeedParserDict:
+    """Parse in a worker process; the result must survive pickling back to the parent."""
+    feed = feedparser.parse(feed_content)
+    # SAX exceptions keep a reference to a closed file and can't be pickled
+    if feed.get("bozo_exception") is not None:
+        feed["bozo_exception"] = str(feed["bozo_exception"])
+    return feed
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool for large feed parses (created on first use)."""
+    global _parse_pool
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                # Split cores across uvicorn workers; forkserver children don't inherit
+                # this multithreaded process (locks held by other threads at fork time)
+                workers = max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context(method)
+                )
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    """Stop feed-parsing worker processes (called on app shutdown)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
 
 class RSSFeedConnector(BaseFeedConnector):
     """
@@ -29,15 +98,72 @@ class RSSFeedConnector(BaseFeedConnector):
     - Error handling with retries
     """
     
-    def __init__(self, source_name: str = "RSS"):
+    # Feeds downloaded at once by fetch()
+    MAX_CONCURRENT_FEEDS = 10
+    
+    # Many feeds block the default httpx User-Agent
+    HTTP_HEADERS = {"User-Agent": "QuantForge/1.0 (+https://quantforge.ai)"}
+    
+    # Entry links remembered for de-duplication across polls (LRU)
+    SEEN_CACHE_SIZE = 100_000
+    
+    # Fan-out across many feed hosts: keep warm connections to each of them
+    HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+    
+    def __init__(self, source_name: str = "RSS", redis_client=None):
         super().__init__(source_name)
         self.timeout = 30
         self.max_retries = 3
+        self._sem = asyncio.Semaphore(self.MAX_CONCURRENT_FEEDS)
+        # feed URL -> (etag, last_modified) from the last committed fetch
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._redis = redis_client
+        # 8-byte digests of entries already ingested, oldest first
+        self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+    
+    def _get_redis(self):
+        if self._redis is None:
+            from backend.utils.cache import RedisClient
+            self._redis = RedisClient()
+        return self._redis.client
+    
+    async def _load_validators(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """ETag/Last-Modified for a feed (memory first, then Redis)."""
+        if url in self._validators:
+            return self._validators[url]
+        
+        validators = (None, None)
+        try:
+            client = self._get_redis()
+            if client:
+                raw = await asyncio.to_thread(client.get, f"{VALIDATOR_KEY_PREFIX}:{url}")
+                if raw:
+                    validators = tuple(orjson.loads(raw))
+        except Exception as e:
+            logger.debug("RSS validator lookup failed for %s: %s", url, e)
+        
+        self._validators[url] = validators
+        return validators
+    
+    async def _save_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        self._validators[url] = (etag, last_modified)
+        try:
+            client = self._get_redis()
+            if client:
+                await asyncio.to_thread(
+                    client.set,
+                    f"{VALIDATOR_KEY_PREFIX}:{url}",
+                    orjson.dumps([etag, last_modified]),
+                    ex=VALIDATOR_TTL
+                )
+        except Exception as e:
+            logger.debug("RSS validator write failed for %s: %s", url, e)
     
     async def fetch(
         self, 
         feed_urls: List[str],
-        max_articles: Optional[int] = None
+        max_articles: Optional[int] = None,
+        pending: Optional[Dict[str, PendingFeed]] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch articles from RSS feeds.
@@ -45,48 +171,73 @@ class RSSFeedConnector(BaseFeedConnector):
         Args:
             feed_urls: List of RSS feed URLs
             max_articles: Maximum articles to fetch (None = all)
+            pending: Filled with this call's per-feed state; pass it to commit() once
+                the documents are ingested (kept per call, so overlapping fetches on the
+                shared connector don't commit each other's entries)
             
         Returns:
             List of normalized documents
         """
-        all_documents = []
+        # Each feed only processes its share of max_articles
+        per_feed = math.ceil(max_articles / len(feed_urls)) if max_articles and feed_urls else None
         
-        for url in feed_urls:
-            try:
-                logger.info(f"Fetching RSS feed: {url}")
-                documents = await self._fetch_single_feed(url)
-                all_documents.extend(documents)
-                
-                if max_articles and len(all_documents) >= max_articles:
-                    all_documents = all_documents[:max_articles]
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Failed to fetch RSS feed {url}: {e}")
+        # Feeds are independent: fetch them concurrently, then merge in the given order
+        results = await asyncio.gather(
+            *[self._fetch_single_feed(url, limit=per_feed, pending=pending) for url in feed_urls],
+            return_exceptions=True
+        )
+        
+        all_documents = []
+        for url, documents in zip(feed_urls, results):
+            if isinstance(documents, Exception):
+                logger.error(f"Failed to fetch RSS feed {url}: {documents}")
                 continue
+            all_documents.extend(documents)
+        
+        if max_articles:
+            all_documents = all_documents[:max_articles]
         
         logger.info(f"Fetched {len(all_documents)} articles from {len(feed_urls)} feeds")
         return all_documents
     
-    async def _fetch_single_feed(self, url: str) -> List[Dict[str, Any]]:
-        """Fetch and parse a single RSS feed with proper User-Agent."""
+    async def _fetch_single_feed(
+        self,
+        url: str,
+        limit: Optional[int] = None,
+        pending: Optional[Dict[str, PendingFeed]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch and parse a single RSS feed (at most `limit` entries) with proper User-Agent."""
         
-        # Fetch with proper User-Agent (many feeds block default UA)
+        # Conditional GET: an unchanged feed answers 304 with no body
+        etag, last_modified = await self._load_validators(url)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        # Fetch over the shared client (sends the QuantForge User-Agent)
         try:
-            headers = {"User-Agent": "QuantForge/1.0 (+https://quantforge.ai)"}
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers)
+            async with self._sem:
+                logger.info(f"Fetching RSS feed: {url}")
+                response = await self._get_client().get(url, headers=headers)
+                # httpx treats 304 as a redirect status and raise_for_status() would raise on it
+                if response.status_code == 304:
+                    logger.info(f"RSS feed not modified: {url}")
+                    return []
                 response.raise_for_status()
                 feed_content = response.text
         except Exception as e:
             logger.error(f"HTTP fetch failed for {url}: {e}")
             raise
         
-        # Parse feed content
-        def _parse():
-            return feedparser.parse(feed_content)
-        
-        feed = await asyncio.to_thread(_parse)
+        # Parse feed content off the event loop
+        if len(feed_content) > PROCESS_PARSE_MIN_BYTES:
+            feed = await asyncio.get_running_loop().run_in_executor(
+                _get_parse_pool(), _parse_feed, feed_content
+            )
+        else:
+            feed = await asyncio.to_thread(feedparser.parse, feed_content)
         
         if feed.get("bozo"):  # Parse error
             logger.warning(f"RSS parse error for {url}: {feed.get('bozo_exception')}")
@@ -97,17 +248,82 @@ class RSSFeedConnector(BaseFeedConnector):
         
         logger.info(f"Found {len(feed.entries)} entries in feed: {url}")
         
+        new_etag = response.headers.get("etag")
+        new_last_modified = response.headers.get("last-modified")
+        validators = None
+        if (new_etag, new_last_modified) != (etag, last_modified):
+            validators = (new_etag, new_last_modified)
+        
+        entries = feed.entries[:limit] if limit else feed.entries
+        
         documents = []
-        for entry in feed.entries:
+        keys: Set[bytes] = set()
+        skipped = 0
+        for entry in entries:
+            # Entries ingested after an earlier poll skip HTML cleaning and normalization
+            key = self._entry_key(entry, url)
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                skipped += 1
+                continue
+            
             try:
                 doc = self._parse_entry(entry, url)
                 documents.append(doc)
             except Exception as e:
                 logger.error(f"Failed to parse entry: {e}")
                 continue
+            keys.add(key)
         
+        # Seen keys and validators are only recorded by commit(), after the caller has
+        # ingested the documents: a failed ingest must see these entries again
+        if pending is not None:
+            pending[url] = (validators, keys, len(entries) == len(feed.entries))
+        
+        if skipped:
+            logger.info(f"Skipped {skipped} already-seen entries in feed: {url}")
         return documents
     
+    async def commit(
+        self,
+        documents: List[Dict[str, Any]],
+        pending: Optional[Dict[str, PendingFeed]] = None
+    ):
+        """
+        Mark documents returned by fetch() as ingested.
+        
+        Their entries are skipped by later polls, and a feed's ETag/Last-Modified (from
+        the `pending` state that fetch() filled) is saved once every new entry of that
+        fetch has been committed (so a 304 can't hide entries that were never ingested).
+        """
+        committed: Dict[str, Set[bytes]] = {}
+        for doc in documents:
+            feed_url = doc.get("metadata", {}).get("feed_url")
+            committed.setdefault(feed_url, set()).add(self._document_key(doc["url"], doc["title"]))
+        
+        for keys in committed.values():
+            for key in keys:
+                self._seen[key] = None
+                self._seen.move_to_end(key)
+        while len(self._seen) > self.SEEN_CACHE_SIZE:
+            self._seen.popitem(last=False)
+        
+        for url, (validators, keys, complete) in (pending or {}).items():
+            if not complete or not keys <= committed.get(url, set()):
+                continue
+            if validators is not None:
+                await self._save_validators(url, *validators)
+    
+    @classmethod
+    def _entry_key(cls, entry: Any, feed_url: str) -> bytes:
+        """Key of the document _parse_entry builds for this entry."""
+        return cls._document_key(entry.get("link", feed_url) or "", entry.get("title", "") or "")
+    
+    @staticmethod
+    def _document_key(url: str, title: str) -> bytes:
+        """Digest of a document's URL and title (8 bytes)."""
+        return hashlib.blake2b(f"{url}\x00{title}".encode(), digest_size=8).digest()
+    
     def _parse_entry(self, entry: Any, feed_url: str) -> Dict[str, Any]:
         """Parse a single RSS entry."""
         # Extract content
@@ -151,25 +367,30 @@ class RSSFeedConnector(BaseFeedConnector):
         if not html_content:
             return ""
         
-        soup = BeautifulSoup(html_content, "html.parser")
-        text = soup.get_text(separator=" ", strip=True)
+        text = None
+        if HTMLParser is not None:
+            try:
+                text = HTMLParser(html_content).text(separator=" ", strip=True)
+            except Exception as e:
+                logger.debug(f"selectolax failed, falling back to BeautifulSoup: {e}")
         
-        # Remove extra whitespace
-        text = " ".join(text.split())
+        if text is None:
+            soup = BeautifulSoup(html_content, "html.parser")
+            text = soup.get_text(separator=" ", strip=True)
         
-        return text
+        # Remove extra whitespace
+        return _WS_RE.sub(" ", text).strip()
     
     def _parse_timestamp(self, entry: Any) -> datetime:
         """Parse entry timestamp from various RSS date fields."""
-        # Try different date fields
-        for field in ["published_parsed", "updated_parsed", "created_parsed"]:
-            if hasattr(entry, field):
-                time_struct = getattr(entry, field)
-                if time_struct:
-                    try:
-                        return datetime(*time_struct[:6])
-                    except:
-                        pass
+        # Try different date fields (plain dict lookups on the FeedParserDict)
+        for field in _TIMESTAMP_FIELDS:
+            time_struct = entry.get(field)
+            if time_struct:
+                try:
+                    return datetime(*time_struct[:6])
+                except Exception:
+                    pass
         
         # Fallback to current time
         return datetime.utcnow()
@@ -178,8 +399,7 @@ class RSSFeedConnector(BaseFeedConnector):
         """Test RSS feed connectivity."""
         test_url = "https://feeds.reuters.com/reuters/businessNews"
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(test_url)
-                return response.status_code == 200
+            response = await self._get_client().get(test_url, timeout=10)
+            return response.status_code == 200
         except:
             return False
@@ -0,0 +1,378 @@
+# backend/engine/llm/cache.py
+"""
+LLM Response Cache
+
+Sits in front of LLMClient.generate() so repeated (or near-identical)
+prompts skip the provider round-trip entirely.
+
+Lookup order:
+1. Exact hit    - sha256 of the full request (in-process LRU, then Redis)
+2. Semantic hit - cosine similarity of prompt embeddings >= threshold
+
+Only low-temperature requests are cached; sampling at high temperature
+is expected to vary between calls. Semantic hits are limited to greedy
+(temperature 0) requests: templated prompts that differ only in a ticker
+embed close together, and must not be answered with another ticker's result.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.utils.batching import BatchedWriter
+
+logger = get_logger(__name__)
+
+REDIS_KEY_PREFIX = "quantforge:llm_cache"
+
+
+@dataclass
+class CacheProbe:
+    """Lookup state carried from lookup() to store() so the prompt is embedded once."""
+    key: str
+    namespace: str
+    vector: Optional[np.ndarray] = None
+
+
+class SemanticIndex:
+    """
+    Inner-product index over L2-normalized float32 embeddings.
+
+    Starts as a flat matmul (exact). Once it holds `ann_min_entries` rows and
+    faiss is installed, an IVF-PQ index is trained in a background thread and
+    then used to shortlist candidates, which are re-scored exactly against the
+    flat matrix so the similarity threshold keeps its meaning. The IVF index
+    is retrained whenever the row count doubles since the last training.
+
+    Rows are never removed eagerly; stale keys are filtered by the caller
+    and the index is compacted once it grows past twice the live size.
+    """
+
+    def __init__(self, ann_min_entries: int = None, nprobe: int = None, shortlist: int = 5):
+        self.ann_min_entries = (
+            ann_min_entries if ann_min_entries is not None else settings.LLM_CACHE_ANN_MIN_ENTRIES
+        )
+        self.nprobe = nprobe if nprobe is not None else settings.LLM_CACHE_ANN_NPROBE
+        self.shortlist = shortlist
+
+        self._keys: List[str] = []
+        self._buffer: Optional[np.ndarray] = None
+        self._matrix: Optional[np.ndarray] = None
+
+        self._ann = None
+        self._ann_trained_size = 0
+        # Training runs off-thread on a snapshot; the result is adopted by the
+        # owning thread on its next add/search. Bumped on compact to discard stale builds.
+        self._generation = 0
+        self._trainer: Optional[threading.Thread] = None
+        self._trained: Optional[Tuple[int, int, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, vector: np.ndarray):
+        row = vector.reshape(1, -1).astype(np.float32, copy=False)
+        size = len(self._keys)
+
+        # Amortized O(1) append: grow the backing buffer geometrically
+        if self._buffer is None:
+            self._buffer = np.empty((64, row.shape[1]), dtype=np.float32)
+        elif size == len(self._buffer):
+            self._buffer = np.concatenate([self._buffer, np.empty_like(self._buffer)])
+        self._buffer[size] = row
+        self._matrix = self._buffer[:size + 1]
+        self._keys.append(key)
+
+        self._adopt_trained()
+        if self._ann is not None:
+            self._ann.add(row)
+        self._maybe_train()
+
+    def search(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        """Return (best_key, cosine_similarity) or (None, 0.0) when empty."""
+        if self._matrix is None:
+            return None, 0.0
+
+        self._adopt_trained()
+        if self._ann is not None:
+            _, ids = self._ann.search(vector.reshape(1, -1).astype(np.float32, copy=False), self.shortlist)
+            candidates = ids[0][ids[0] >= 0]
+            if len(candidates):
+                scores = self._matrix[candidates] @ vector
+                best = int(np.argmax(scores))
+                return self._keys[int(candidates[best])], float(scores[best])
+
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        return self._keys[best], float(scores[best])
+
+    def compact(self, live_keys) -> None:
+        """Drop rows whose keys are no longer cached."""
+        keep = [i for i, k in enumerate(self._keys) if k in live_keys]
+        self._keys = [self._keys[i] for i in keep]
+        self._buffer = self._matrix[keep] if keep else None
+        self._matrix = self._buffer
+        self._ann = None
+        self._ann_trained_size = 0
+        self._generation += 1
+        self._maybe_train()
+
+    def wait_for_training(self, timeout: Optional[float] = None):
+        """Block until an in-flight IVF-PQ build finishes (tests/shutdown)."""
+        if self._trainer is not None:
+            self._trainer.join(timeout)
+        self._adopt_trained()
+
+    def _maybe_train(self):
+        if faiss is None or self._matrix is None:
+            return
+        if self._trainer is not None and self._trainer.is_alive():
+            return
+        size = len(self._keys)
+        if size < self.ann_min_entries or size < 2 * self._ann_trained_size:
+            return
+
+        self._trainer = threading.Thread(
+            target=self._train,
+            args=(self._matrix.copy(), self._generation),
+            name="semantic-index-train",
+            daemon=True,
+        )
+        self._trainer.start()
+
+    def _train(self, rows: np.ndarray, generation: int):
+        size, dim = rows.shape
+        nlist = max(1, int(4 * np.sqrt(size)))
+        # ~8 dims per PQ sub-quantizer (384-d MiniLM -> PQ48)
+        m = next(m for m in range(max(1, dim // 8), 0, -1) if dim % m == 0)
+        try:
+            index = faiss.index_factory(dim, f"IVF{nlist},PQ{m}", faiss.METRIC_INNER_PRODUCT)
+            index.train(rows)
+            index.add(rows)
+            index.nprobe = self.nprobe
+        except Exception as e:
+            logger.warning(f"Semantic index IVF-PQ training failed, staying flat: {e}")
+            self.ann_min_entries = float("inf")
+            return
+
+        self._trained = (generation, size, index)
+        logger.info(f"Semantic index trained IVF{nlist},PQ{m} over {size} prompts")
+
+    def _adopt_trained(self):
+        trained, self._trained = self._trained, None
+        if trained is None:
+            return
+
+        generation, size, index = trained
+        if generation != self._generation:
+            return
+
+        # Rows appended while training ran
+        if len(self._keys) > size:
+            index.add(self._matrix[size:])
+        self._ann = index
+        self._ann_trained_size = size
+
+
+class LLMCache:
+    """
+    Exact + semantic cache for LLM responses.
+
+    Usage:
+        cache = LLMCache()
+        cached, probe = await cache.lookup(prompt, system_message, max_tokens, temperature)
+        if cached:
+            return cached
+        result = await call_provider(...)
+        await cache.store(probe, result)
+    """
+
+    def __init__(
+        self,
+        threshold: float = None,
+        ttl: int = None,
+        max_entries: int = None,
+        max_temperature: float = None,
+        embedder=None,
+        redis_client=None
+    ):
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.threshold = threshold if threshold is not None else settings.LLM_CACHE_SIMILARITY
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else settings.LLM_CACHE_MAX_ENTRIES
+        self.max_temperature = (
+            max_temperature if max_temperature is not None else settings.LLM_CACHE_MAX_TEMPERATURE
+        )
+
+        # key -> (expires_at, response); ordered oldest -> newest for LRU eviction
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # namespace (system message + generation params) -> index of prompt embeddings
+        self._indexes: Dict[str, SemanticIndex] = {}
+
+        self._embedder = embedder
+        self._redis = redis_client
+        self._writer: Optional[BatchedWriter] = None
+
+    def _get_embedder(self):
+        if self._embedder is None:
+            from backend.engine.embeddings.hybrid_embedder import get_embedder
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def _get_redis(self):
+        if self._redis is None:
+            from backend.utils.cache import RedisClient
+            self._redis = RedisClient()
+        return self._redis.client
+
+    def _get_writer(self) -> Optional[BatchedWriter]:
+        client = self._get_redis()
+        if not client:
+            return None
+        if self._writer is None or self._writer.client is not client:
+            self._writer = BatchedWriter(client, name="llm-cache-writer")
+        return self._writer
+
+    def is_cacheable(self, temperature: float) -> bool:
+        return self.enabled and temperature <= self.max_temperature
+
+    @staticmethod
+    def _make_keys(
+        prompt: str,
+        system_message: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Tuple[str, str]:
+        namespace = hashlib.sha256(
+            f"{system_message or ''}\x00{max_tokens}\x00{temperature}".encode()
+        ).hexdigest()
+        key = hashlib.sha256(f"{namespace}\x00{prompt}".encode()).hexdigest()
+        return key, namespace
+
+    async def lookup(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[CacheProbe]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            (cached_response or None, probe to pass to store() or None if not cacheable)
+        """
+        if not self.is_cacheable(temperature):
+            return None, None
+
+        key, namespace = self._make_keys(prompt, system_message, max_tokens, temperature)
+        probe = CacheProbe(key=key, namespace=namespace)
+
+        # 1. Exact hit (in-process)
+        hit = self._get_local(key)
+        if hit is not None:
+            logger.debug("LLM cache exact hit: %.12s", key)
+            return hit, probe
+
+        # 2. Exact hit (Redis, shared across workers)
+        hit = await self._get_remote(key)
+        if hit is not None:
+            logger.debug("LLM cache Redis hit: %.12s", key)
+            self._put_local(key, hit)
+            return dict(hit), probe
+
+        # 3. Semantic hit (greedy decoding only; the prompt isn't even embedded otherwise)
+        if temperature != 0:
+            return None, probe
+        probe.vector = await self._embed(prompt)
+        index = self._indexes.get(namespace)
+        if probe.vector is not None and index is not None:
+            best_key, score = index.search(probe.vector)
+            if best_key is not None and score >= self.threshold:
+                hit = self._get_local(best_key)
+                if hit is not None:
+                    logger.debug("LLM cache semantic hit: %.12s (sim=%.3f)", best_key, score)
+                    return hit, probe
+
+        return None, probe
+
+    async def store(self, probe: Optional[CacheProbe], response: Dict[str, Any]):
+        """Store a provider response for a probe returned by lookup()."""
+        if probe is None:
+            return
+
+        self._put_local(probe.key, response)
+
+        if probe.vector is not None:
+            index = self._indexes.setdefault(probe.namespace, SemanticIndex())
+            index.add(probe.key, probe.vector)
+            if len(index) > 2 * self.max_entries:
+                index.compact(self._entries)
+
+        await self._set_remote(probe.key, response)
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return dict(response)
+
+    def _put_local(self, key: str, response: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl, dict(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await self._get_embedder().embed_text(prompt), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"LLM cache embedding failed, semantic lookup disabled: {e}")
+            return None
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    async def _get_remote(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            client = self._get_redis()
+            if not client:
+                return None
+            raw = await asyncio.to_thread(client.hget, f"{REDIS_KEY_PREFIX}:{key}", "response")
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            logger.debug("LLM cache Redis lookup failed: %s", e)
+            return None
+
+    async def _set_remote(self, key: str, response: Dict[str, Any]):
+        # Queued, not awaited: the HSET/EXPIRE pair rides the next pipeline flush
+        try:
+            writer = self._get_writer()
+            if writer is None:
+                return
+            redis_key = f"{REDIS_KEY_PREFIX}:{key}"
+            writer.enqueue("hset", redis_key, mapping={"response": orjson.dumps(response)})
+            writer.enqueue("expire", redis_key, self.ttl)
+        except Exception as e:
+            logger.debug("LLM cache Redis write failed: %s", e)
@@ -8,17 +8,55 @@ Priority Order:
 3. Ollama (LOCAL - last resort)
 """
 
+import asyncio
+import threading
+import time
 import httpx
-import json
-from typing import Dict, Any, Optional, List
+import orjson
+import sentry_sdk
+from collections import Counter
+from functools import lru_cache, partial
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple, Union
 from enum import Enum
 
 from backend.core.config import settings
 from backend.core.logging import get_logger
 from backend.utils.retry import async_retry
+from backend.engine.llm.cache import CacheProbe, LLMCache
+from backend.utils.batching import MicroBatcher
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 logger = get_logger(__name__)
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# Request bodies are pre-encoded with orjson (content=...), so the type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """cl100k_base BPE encoder (loaded once; None if tiktoken is unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Token count for usage reporting when the provider doesn't return one."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4  # ~4 characters per token for English text
+    return len(encoding.encode_ordinary(text))
+
 
 class LLMProvider(str, Enum):
     HUGGINGFACE = "huggingface"
@@ -31,9 +69,78 @@ class LLMClient:
     
     def __init__(self):
         self.timeout = 30
+        self._client: Optional[httpx.AsyncClient] = None
         self.providers = self._check_available_providers()
+        self.cache = LLMCache()
+        
+        # Provider endpoints/headers are fixed for the client's lifetime
+        self._hf_url = f"{settings.HF_LLM_ENDPOINT}/{settings.HF_LLM_MODEL}"
+        self._hf_headers = {"Authorization": f"Bearer {settings.HF_API_KEY}", **_JSON_HEADERS}
+        self._openai_headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}", **_JSON_HEADERS}
+        self._ollama_url = f"{settings.OLLAMA_URL}/api/generate"
+        self._hf_batchers: Dict[Tuple[int, float], MicroBatcher] = {}
+        # Bounds in-flight prompts from generate_batch()
+        self._batch_sem = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        
+        # Provider -> implementation, resolved once
+        self._generators = {
+            LLMProvider.HUGGINGFACE: self._generate_huggingface,
+            LLMProvider.OPENAI: self._generate_openai,
+            LLMProvider.OLLAMA: self._generate_ollama,
+        }
+        self._streamers = {
+            LLMProvider.HUGGINGFACE: self._stream_huggingface,
+            LLMProvider.OPENAI: self._stream_openai,
+            LLMProvider.OLLAMA: self._stream_ollama,
+        }
+        
+        # Circuit breaker: consecutive failures per provider, and when a tripped one may be retried
+        self._failures: Counter = Counter()
+        self._open_until: Dict[LLMProvider, float] = {}
+        
         logger.info(f"Available LLM providers: {[p.value for p in self.providers]}")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client so provider calls reuse TCP/TLS connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=64)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Stop request batchers and close the shared HTTP client."""
+        for batcher in self._hf_batchers.values():
+            await batcher.stop()
+        self._hf_batchers.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def warmup(self):
+        """
+        Ask Ollama to load its model now so the first request doesn't pay
+        the weight load. An empty prompt loads the model without generating.
+        """
+        if LLMProvider.OLLAMA not in self.providers:
+            return
+        try:
+            response = await self._get_client().post(
+                self._ollama_url,
+                content=orjson.dumps({
+                    "model": settings.OLLAMA_LLM_MODEL,
+                    "prompt": "",
+                    "keep_alive": settings.OLLAMA_KEEP_ALIVE
+                }),
+                headers=_JSON_HEADERS,
+                timeout=120
+            )
+            response.raise_for_status()
+            logger.info(f"✅ Ollama model '{settings.OLLAMA_LLM_MODEL}' preloaded")
+        except Exception as e:
+            logger.warning(f"Ollama warmup skipped: {e}")
+    
     def _check_available_providers(self) -> List[LLMProvider]:
         available = []
         if settings.HF_API_KEY:
@@ -43,6 +150,31 @@ class LLMClient:
         available.append(LLMProvider.OLLAMA)
         return available
     
+    # === Circuit breaker ===
+    
+    def _is_open(self, provider: LLMProvider) -> bool:
+        """True while a repeatedly failing provider is being skipped."""
+        return time.monotonic() < self._open_until.get(provider, 0.0)
+    
+    def _record_failure(self, provider: LLMProvider):
+        self._failures[provider] += 1
+        # Stays tripped after the cooldown, so a single failed retry re-opens it
+        if self._failures[provider] >= settings.LLM_BREAKER_FAILURES:
+            self._open_until[provider] = time.monotonic() + settings.LLM_BREAKER_COOLDOWN
+            logger.warning(
+                f"{provider.value} failed {self._failures[provider]} times in a row; "
+                f"skipping it for {settings.LLM_BREAKER_COOLDOWN}s"
+            )
+    
+    def _record_success(self, provider: LLMProvider):
+        self._failures.pop(provider, None)
+        self._open_until.pop(provider, None)
+    
+    def _all_failed(self, last_error: Optional[Exception]) -> Exception:
+        if last_error is None:
+            return Exception("All LLM providers are temporarily skipped after repeated failures")
+        return Exception(f"All LLM providers failed. Last error: {last_error}")
+    
     async def generate(
         self,
         prompt: str,
@@ -51,29 +183,55 @@ class LLMClient:
         system_message: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate text using best available provider."""
+        cached, probe = await self.cache.lookup(prompt, system_message, max_tokens, temperature)
+        if cached:
+            cached["cached"] = True
+            return cached
+        
         last_error = None
         
         for provider in self.providers:
+            if self._is_open(provider):
+                continue
             try:
                 logger.info(f"Attempting generation with {provider.value}")
                 
-                if provider == LLMProvider.HUGGINGFACE:
-                    result = await self._generate_huggingface(prompt, max_tokens, temperature, system_message)
-                elif provider == LLMProvider.OPENAI:
-                    result = await self._generate_openai(prompt, max_tokens, temperature, system_message)
-                elif provider == LLMProvider.OLLAMA:
-                    result = await self._generate_ollama(prompt, max_tokens, temperature, system_message)
+                with sentry_sdk.start_span(op="http.llm", name=f"{provider.value} generate"):
+                    result = await self._generators[provider](prompt, max_tokens, temperature, system_message)
                 
                 logger.info(f"✅ Success with {provider.value}")
+                self._record_success(provider)
                 result["provider"] = provider.value
+                await self.cache.store(probe, result)
                 return result
                 
             except Exception as e:
                 logger.warning(f"Failed with {provider.value}: {e}")
+                self._record_failure(provider)
                 last_error = e
                 continue
         
-        raise Exception(f"All LLM providers failed. Last error: {last_error}")
+        raise self._all_failed(last_error)
+    
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        system_message: Optional[str] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Generate for many prompts concurrently (bulk sentiment/summaries).
+        
+        At most LLM_MAX_CONCURRENCY prompts are in flight; HF requests issued
+        together are coalesced into one `inputs` list by the HF batcher.
+        Results are in prompt order, with failures returned as exceptions.
+        """
+        async def _one(prompt: str) -> Dict[str, Any]:
+            async with self._batch_sem:
+                return await self.generate(prompt, max_tokens, temperature, system_message)
+        
+        return await asyncio.gather(*[_one(p) for p in prompts], return_exceptions=True)
     
     @async_retry(max_attempts=2, delay=1.0, exceptions=(httpx.HTTPError,))
     async def _generate_huggingface(
@@ -81,37 +239,60 @@ class LLMClient:
     ) -> Dict[str, Any]:
         """Generate using Hugging Face Inference API (FREE)."""
         
-        full_prompt = f"{system_message}\n\n{prompt}" if system_message else prompt
-        
-        url = f"{settings.HF_LLM_ENDPOINT}/{settings.HF_LLM_MODEL}"
-        headers = {"Authorization": f"Bearer {settings.HF_API_KEY}"}
+        # Concurrent requests with the same parameters share one POST
+        full_prompt = self._huggingface_prompt(prompt, system_message)
+        text = await self._hf_batcher(max_tokens, temperature).submit(full_prompt)
         
-        payload = {
-            "inputs": full_prompt,
-            "parameters": {
-                "max_new_tokens": max_tokens,
-                "temperature": temperature,
-                "return_full_text": False
-            }
+        return {
+            "text": text.strip(),
+            "model": settings.HF_LLM_MODEL,
+            "tokens_used": _count_tokens(text)
         }
+    
+    def _hf_batcher(self, max_tokens: int, temperature: float) -> MicroBatcher:
+        # HF applies one `parameters` block to every input, so batch per parameter set
+        key = (max_tokens, temperature)
+        batcher = self._hf_batchers.get(key)
+        if batcher is None:
+            batcher = MicroBatcher(
+                partial(self._huggingface_batch, max_tokens=max_tokens, temperature=temperature),
+                max_batch=settings.HF_BATCH_MAX_SIZE,
+                max_wait_ms=settings.HF_BATCH_MAX_WAIT_MS,
+                name=f"hf-batch[{max_tokens},{temperature}]"
+            )
+            self._hf_batchers[key] = batcher
+        return batcher
+    
+    async def _huggingface_batch(
+        self, prompts: List[str], max_tokens: int, temperature: float
+    ) -> List[str]:
+        """One Inference API call for a batch of prompts; returns texts in order."""
+        inputs = prompts[0] if len(prompts) == 1 else prompts
+        payload = self._huggingface_payload(inputs, max_tokens, temperature)
+        response = await self._get_client().post(
+            self._hf_url, headers=self._hf_headers, content=orjson.dumps(payload)
+        )
+        response.raise_for_status()
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # HF returns list of generated texts
-            if isinstance(data, list) and len(data) > 0:
-                text = data[0].get("generated_text", "")
-            else:
-                text = data.get("generated_text", "")
-            
-            return {
-                "text": text.strip(),
-                "model": settings.HF_LLM_MODEL,
-                "tokens_used": len(text.split())  # Approximate
-            }
+        data = orjson.loads(response.content)
+        
+        if len(prompts) == 1:
+            return [self._parse_huggingface(data)]
+        if not isinstance(data, list) or len(data) != len(prompts):
+            error = data.get("error") if isinstance(data, dict) else None
+            raise ValueError(f"Unexpected Hugging Face batch response: {error or str(data)[:200]}")
+        return [self._parse_huggingface(item) for item in data]
+    
+    @staticmethod
+    def _parse_huggingface(data: Any) -> str:
+        # HF returns list of generated texts; errors come back as {"error": ...}
+        if isinstance(data, list) and data and isinstance(data[0], dict) and "generated_text" in data[0]:
+            return data[0]["generated_text"]
+        elif isinstance(data, dict) and "generated_text" in data:
+            return data["generated_text"]
+        
+        error = data.get("error") if isinstance(data, dict) else None
+        raise ValueError(f"Unexpected Hugging Face response: {error or str(data)[:200]}")
     
     @async_retry(max_attempts=2, delay=1.0, exceptions=(httpx.HTTPError,))
     async def _generate_openai(
@@ -119,78 +300,260 @@ class LLMClient:
     ) -> Dict[str, Any]:
         """Generate using OpenAI API (PAID fallback)."""
         
-        url = "https://api.openai.com/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        payload = self._openai_payload(prompt, max_tokens, temperature, system_message)
+        response = await self._get_client().post(
+            OPENAI_CHAT_URL, headers=self._openai_headers, content=orjson.dumps(payload)
+        )
+        response.raise_for_status()
         
-        messages = []
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
-        messages.append({"role": "user", "content": prompt})
+        data = orjson.loads(response.content)
         
-        payload = {
+        return {
+            "text": data["choices"][0]["message"]["content"].strip(),
             "model": settings.OPENAI_MODEL,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature
+            "tokens_used": data["usage"]["total_tokens"]
         }
-        
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            return {
-                "text": data["choices"][0]["message"]["content"].strip(),
-                "model": settings.OPENAI_MODEL,
-                "tokens_used": data["usage"]["total_tokens"]
-            }
     
     async def _generate_ollama(
         self, prompt: str, max_tokens: int, temperature: float, system_message: Optional[str]
     ) -> Dict[str, Any]:
         """Generate using Ollama (LOCAL fallback)."""
         
-        url = f"{settings.OLLAMA_URL}/api/generate"
+        payload = self._ollama_payload(prompt, max_tokens, temperature, system_message)
+        response = await self._get_client().post(
+            self._ollama_url, content=orjson.dumps(payload), headers=_JSON_HEADERS,
+            timeout=60  # Longer timeout for local
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
         
-        # Combine system message with prompt
-        full_prompt = prompt
+        return {
+            "text": data["response"].strip(),
+            "model": settings.OLLAMA_LLM_MODEL,
+            "tokens_used": data.get("eval_count") or _count_tokens(data["response"])
+        }
+
+    
+    # === Request payloads (shared by generate and stream) ===
+    
+    @staticmethod
+    def _huggingface_prompt(prompt: str, system_message: Optional[str]) -> str:
+        return f"{system_message}\n\n{prompt}" if system_message else prompt
+    
+    @staticmethod
+    def _huggingface_payload(
+        inputs: Union[str, List[str]], max_tokens: int, temperature: float, stream: bool = False
+    ) -> Dict[str, Any]:
+        payload = {
+            "inputs": inputs,
+            "parameters": {
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "return_full_text": False
+            }
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+    
+    @staticmethod
+    def _openai_payload(
+        prompt: str, max_tokens: int, temperature: float, system_message: Optional[str], stream: bool = False
+    ) -> Dict[str, Any]:
+        messages = []
         if system_message:
-            full_prompt = f"{system_message}\n\nUser: {prompt}\nAssistant:"
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
         
+        return {
+            "model": settings.OPENAI_MODEL,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": stream
+        }
+    
+    @staticmethod
+    def _ollama_payload(
+        prompt: str, max_tokens: int, temperature: float, system_message: Optional[str], stream: bool = False
+    ) -> Dict[str, Any]:
+        # Pass the system message separately so Ollama renders it through the
+        # model's chat template as an identical leading prefix; with the model
+        # kept resident, the KV cache for that prefix is reused across calls.
         payload = {
             "model": settings.OLLAMA_LLM_MODEL,
-            "prompt": full_prompt,
-            "stream": False,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens
             }
         }
+        if system_message:
+            payload["system"] = system_message
+        return payload
+    
+    # === Streaming ===
+    
+    async def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        system_message: Optional[str] = None,
+        info: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks as the provider produces them.
         
-        async with httpx.AsyncClient(timeout=60) as client:  # Longer timeout for local
-            headers = {"Content-Type": "application/json"}
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
+        Falls back to the next provider only if nothing has been emitted yet;
+        a provider failing mid-stream raises. Completed streams are cached
+        like generate() results, and cache hits are emitted as a single chunk.
+        Closing the generator early closes the provider's HTTP stream and skips
+        caching, unless the caller first sets info["complete"] (it got a whole answer).
+        
+        If `info` is given, it is filled with the serving provider and model.
+        """
+        if info is None:
+            info = {}
+        
+        cached, probe = await self.cache.lookup(prompt, system_message, max_tokens, temperature)
+        if cached:
+            info.update(provider=cached.get("provider", "cache"), model=cached.get("model", ""))
+            yield cached["text"]
+            return
+        
+        last_error = None
+        
+        for provider in self.providers:
+            if self._is_open(provider):
+                continue
+            chunks: List[str] = []
+            info.update(provider=provider.value, model=self._model_name(provider))
+            try:
+                logger.info(f"Attempting streaming generation with {provider.value}")
+                async for chunk in self._streamers[provider](prompt, max_tokens, temperature, system_message):
+                    chunks.append(chunk)
+                    yield chunk
+            except GeneratorExit:
+                if info.get("complete"):
+                    self._record_success(provider)
+                    await self._store_stream(probe, provider, chunks)
+                raise
+            except Exception as e:
+                self._record_failure(provider)
+                if chunks:
+                    raise
+                logger.warning(f"Streaming failed with {provider.value}: {e}")
+                last_error = e
+                continue
             
-            return {
-                "text": data["response"].strip(),
-                "model": settings.OLLAMA_LLM_MODEL,
-                "tokens_used": data.get("eval_count", len(data["response"].split()))
-            }
+            self._record_success(provider)
+            await self._store_stream(probe, provider, chunks)
+            return
+        
+        raise self._all_failed(last_error)
+    
+    async def _store_stream(self, probe: Optional[CacheProbe], provider: LLMProvider, chunks: List[str]):
+        """Cache a streamed answer like a generate() result."""
+        text = "".join(chunks)
+        await self.cache.store(probe, {
+            "text": text.strip(),
+            "model": self._model_name(provider),
+            "tokens_used": _count_tokens(text),
+            "provider": provider.value
+        })
+    
+    @staticmethod
+    def _model_name(provider: LLMProvider) -> str:
+        return {
+            LLMProvider.HUGGINGFACE: settings.HF_LLM_MODEL,
+            LLMProvider.OPENAI: settings.OPENAI_MODEL,
+            LLMProvider.OLLAMA: settings.OLLAMA_LLM_MODEL,
+        }[provider]
+    
+    @staticmethod
+    async def _sse_data(response: httpx.Response) -> AsyncIterator[str]:
+        """Yield the payload of each `data:` line of a server-sent event stream."""
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                yield line[5:].strip()
+    
+    async def _stream_huggingface(
+        self, prompt: str, max_tokens: int, temperature: float, system_message: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Stream from the HF text-generation endpoint (TGI server-sent events)."""
+        payload = self._huggingface_payload(
+            self._huggingface_prompt(prompt, system_message), max_tokens, temperature, stream=True
+        )
+        
+        async with self._get_client().stream(
+            "POST", self._hf_url, headers=self._hf_headers, content=orjson.dumps(payload)
+        ) as response:
+            response.raise_for_status()
+            async for data in self._sse_data(response):
+                event = orjson.loads(data)
+                if "error" in event:
+                    raise ValueError(f"Hugging Face stream error: {event['error']}")
+                token = event.get("token") or {}
+                if token.get("text") and not token.get("special"):
+                    yield token["text"]
+    
+    async def _stream_openai(
+        self, prompt: str, max_tokens: int, temperature: float, system_message: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Stream chat completion deltas from OpenAI."""
+        payload = self._openai_payload(prompt, max_tokens, temperature, system_message, stream=True)
+        
+        async with self._get_client().stream(
+            "POST", OPENAI_CHAT_URL, headers=self._openai_headers, content=orjson.dumps(payload)
+        ) as response:
+            response.raise_for_status()
+            async for data in self._sse_data(response):
+                if data == "[DONE]":
+                    break
+                choices = orjson.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+    
+    async def _stream_ollama(
+        self, prompt: str, max_tokens: int, temperature: float, system_message: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Stream from Ollama (newline-delimited JSON)."""
+        payload = self._ollama_payload(prompt, max_tokens, temperature, system_message, stream=True)
+        
+        async with self._get_client().stream(
+            "POST", self._ollama_url, content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=60
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = orjson.loads(line)
+                if event.get("response"):
+                    yield event["response"]
+                if event.get("done"):
+                    break
 
 
 # Singleton instance
 _llm_client = None
+_llm_client_lock = threading.Lock()
 
 def get_llm_client() -> LLMClient:
-    """Get singleton LLM client instance."""
+    """Get singleton LLM client instance (one client, pool and cache even under concurrent first use)."""
     global _llm_client
     if _llm_client is None:
-        _llm_client = LLMClient()
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
     return _llm_client
+
+
+async def close_llm_client():
+    """Release the singleton's pooled connections (called on app shutdown)."""
+    if _llm_client is not None:
+        await _llm_client.aclose()
@@ -6,9 +6,24 @@ Versioned prompts for different analysis types.
 Follows production MLOps best practices.
 """
 
-from typing import Dict, Any, Optional
+import functools
+import string
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 
+_FORMATTER = string.Formatter()
+
+
+def _compile_template(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a str.format template once into (literal, field) parts ({{ }} already unescaped)."""
+    parts = []
+    for literal, field, spec, conversion in _FORMATTER.parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported conversion/format spec on template field {field!r}")
+        parts.append((literal, field))
+    return parts
+
 
 class PromptType(str, Enum):
     """Available prompt types"""
@@ -19,31 +34,10 @@ class PromptType(str, Enum):
     MARKET_SUMMARY = "market_summary"
 
 
-class PromptManager:
-    """
-    Manages prompt templates for different analysis tasks.
-    
-    Usage:
-        pm = PromptManager()
-        prompt = pm.get_prompt(
-            PromptType.SENTIMENT_ANALYSIS,
-            ticker="AAPL",
-            news="Apple reports earnings..."
-        )
-    """
-    
-    # Version tracking for A/B testing
-    VERSION = "v1"
-    
-    def __init__(self):
-        self.templates = self._load_templates()
-    
-    def _load_templates(self) -> Dict[PromptType, Dict[str, str]]:
-        """Load all prompt templates."""
-        return {
-            PromptType.SENTIMENT_ANALYSIS: {
-                "system": "You are an expert financial analyst. Analyze sentiment objectively based on facts.",
-                "template": """Analyze the sentiment of the following financial news about {ticker}:
+def _build_sentiment_template() -> Dict[str, str]:
+    return {
+        "system": "You are an expert financial analyst. Analyze sentiment objectively based on facts.",
+        "template": """Analyze the sentiment of the following financial news about {ticker}:
 
 News Articles:
 {news_text}
@@ -61,11 +55,13 @@ Respond in JSON format:
     "themes": ["theme1", "theme2", "theme3"],
     "impact": "short explanation"
 }}"""
-            },
-            
-            PromptType.PRICE_EXPLANATION: {
-                "system": "You are a professional market researcher. Explain price movements using factual analysis.",
-                "template": """Explain why {ticker} price moved as follows:
+    }
+
+
+def _build_price_explanation_template() -> Dict[str, str]:
+    return {
+        "system": "You are a professional market researcher. Explain price movements using factual analysis.",
+        "template": """Explain why {ticker} price moved as follows:
 
 Price Data:
 - Period: {start_date} to {end_date}
@@ -91,11 +87,13 @@ Respond in JSON format:
     "macro_factors": ["macro1", "macro2"],
     "confidence": 0.80
 }}"""
-            },
-            
-            PromptType.RISK_ASSESSMENT: {
-                "system": "You are a risk analyst. Assess risks objectively without speculation.",
-                "template": """Assess the investment risk for {ticker}:
+    }
+
+
+def _build_risk_assessment_template() -> Dict[str, str]:
+    return {
+        "system": "You are a risk analyst. Assess risks objectively without speculation.",
+        "template": """Assess the investment risk for {ticker}:
 
 Recent News:
 {news_text}
@@ -120,11 +118,13 @@ Respond in JSON format:
     "risk_factors": ["factor1", "factor2", "factor3"],
     "mitigations": ["mitigation1", "mitigation2"]
 }}"""
-            },
-            
-            PromptType.RECOMMENDATION: {
-                "system": "You are a portfolio analyst. Provide balanced guidance based on data, NOT direct financial advice.",
-                "template": """Based on this analysis of {ticker}, provide guidance:
+    }
+
+
+def _build_recommendation_template() -> Dict[str, str]:
+    return {
+        "system": "You are a portfolio analyst. Provide balanced guidance based on data, NOT direct financial advice.",
+        "template": """Based on this analysis of {ticker}, provide guidance:
 
 Analysis Summary:
 {analysis_summary}
@@ -148,11 +148,13 @@ Respond in JSON format:
     "confidence": 0.75,
     "considerations": ["consider1", "consider2"]
 }}"""
-            },
-            
-            PromptType.MARKET_SUMMARY: {
-                "system": "You are a financial journalist. Summarize market events clearly and concisely.",
-                "template": """Summarize this market event for {ticker}:
+    }
+
+
+def _build_market_summary_template() -> Dict[str, str]:
+    return {
+        "system": "You are a financial journalist. Summarize market events clearly and concisely.",
+        "template": """Summarize this market event for {ticker}:
 
 Event Details:
 {event_text}
@@ -170,8 +172,57 @@ Respond in JSON format:
     "summary": "concise summary text here",
     "key_points": ["point1", "point2", "point3"]
 }}"""
-            }
-        }
+    }
+
+
+# Template builders, called the first time a prompt type is requested
+_BUILDERS = {
+    PromptType.SENTIMENT_ANALYSIS: _build_sentiment_template,
+    PromptType.PRICE_EXPLANATION: _build_price_explanation_template,
+    PromptType.RISK_ASSESSMENT: _build_risk_assessment_template,
+    PromptType.RECOMMENDATION: _build_recommendation_template,
+    PromptType.MARKET_SUMMARY: _build_market_summary_template,
+}
+
+
+class PromptManager:
+    """
+    Manages prompt templates for different analysis tasks.
+    
+    Usage:
+        pm = PromptManager()
+        prompt = pm.get_prompt(
+            PromptType.SENTIMENT_ANALYSIS,
+            ticker="AAPL",
+            news="Apple reports earnings..."
+        )
+    """
+    
+    # Version tracking for A/B testing
+    VERSION = "v1"
+    
+    # PromptType values, materialized once
+    _AVAILABLE_TYPES = tuple(pt.value for pt in PromptType)
+    
+    # Formatted prompts kept per manager (retries / A/B runs repeat the same context)
+    PROMPT_CACHE_SIZE = 512
+    
+    def __init__(self):
+        # Filled per prompt type on first use (see _get_template)
+        self.templates: Dict[PromptType, Dict[str, Any]] = {}
+        self._format_cached = functools.lru_cache(maxsize=self.PROMPT_CACHE_SIZE)(self._format)
+    
+    def _get_template(self, prompt_type: PromptType) -> Dict[str, Any]:
+        """Build (and compile) a template the first time its type is requested."""
+        template = self.templates.get(prompt_type)
+        if template is None:
+            builder = _BUILDERS.get(prompt_type)
+            if builder is None:
+                raise ValueError(f"Unknown prompt type: {prompt_type}")
+            template = builder()
+            template["template_parts"] = _compile_template(template["template"])
+            self.templates[prompt_type] = template
+        return template
     
     def get_prompt(
         self,
@@ -191,13 +242,31 @@ Respond in JSON format:
                 "user": "formatted prompt"
             }
         """
-        if prompt_type not in self.templates:
-            raise ValueError(f"Unknown prompt type: {prompt_type}")
+        self._get_template(prompt_type)
         
-        template = self.templates[prompt_type]
+        key = tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if key is None:
+            # Lists/dicts can't key the cache: format directly
+            return self._format(prompt_type, tuple(kwargs.items()))
+        
+        # Copy so callers can't mutate the cached entry
+        return dict(self._format_cached(prompt_type, key))
+    
+    def _format(self, prompt_type: PromptType, kwargs_items: tuple) -> Dict[str, str]:
+        """Fill a template from sorted (name, value) pairs."""
+        template = self._get_template(prompt_type)
+        values = dict(kwargs_items)
         
         try:
-            formatted_prompt = template["template"].format(**kwargs)
+            # Concatenate the pre-split parts instead of re-parsing the template
+            formatted_prompt = "".join([
+                literal + str(values[field]) if field is not None else literal
+                for literal, field in template["template_parts"]
+            ])
         except KeyError as e:
             raise ValueError(f"Missing required template variable: {e}")
         
@@ -209,15 +278,18 @@ Respond in JSON format:
     
     def get_available_types(self) -> list:
         """Get list of available prompt types."""
-        return [pt.value for pt in PromptType]
+        return list(self._AVAILABLE_TYPES)
 
 
 # Singleton instance
 _prompt_manager = None
+_prompt_manager_lock = threading.Lock()
 
 def get_prompt_manager() -> PromptManager:
     """Get singleton PromptManager instance."""
     global _prompt_manager
     if _prompt_manager is None:
-        _prompt_manager = PromptManager()
+        with _prompt_manager_lock:
+            if _prompt_manager is None:
+                _prompt_manager = PromptManager()
     return _prompt_manager
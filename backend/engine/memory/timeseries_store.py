@@ -9,15 +9,105 @@ Handles:
 - Data compression & retention policies
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+import asyncio
+import threading
 import asyncpg
+import numpy as np
 
 from backend.core.logging import get_logger
 from backend.core.config import settings
 
 logger = get_logger(__name__)
 
+if TYPE_CHECKING:
+    from backend.engine.feeds.binance_connector import OHLCVColumns
+
+# Parallel COPY: one shard (and pooled connection) per this many rows, up to MAX_COPY_SHARDS
+COPY_SHARD_ROWS = 10_000
+MAX_COPY_SHARDS = 8
+
+# Hash partitions on symbol (space dimension): per-symbol reads prune to one partition's chunks
+SYMBOL_PARTITIONS = 8
+
+# market_data columns written by insert_ohlcv, in record order
+OHLCV_COLUMNS = ["time", "symbol", "open", "high", "low", "close", "volume", "num_trades", "source"]
+
+# Hot read queries. Kept as fixed strings so each pooled connection prepares them
+# once and reuses the plan from asyncpg's statement cache (statement_cache_size).
+# Prices are cast to float8 so tables created with the older NUMERIC schema still
+# decode to floats rather than Decimal objects (a no-op on DOUBLE PRECISION columns).
+_Q_GET_OHLCV_BUCKET = """
+    SELECT time_bucket($1, time) AS bucket,
+           symbol,
+           first(open, time)::float8 as open,
+           max(high)::float8 as high,
+           min(low)::float8 as low,
+           last(close, time)::float8 as close,
+           sum(volume)::float8 as volume
+    FROM market_data
+    WHERE symbol = $2
+      AND time >= $3
+      AND time <= $4
+    GROUP BY bucket, symbol
+    ORDER BY bucket
+"""
+
+_Q_GET_OHLCV_RAW = """
+    SELECT time, symbol, open::float8 AS open, high::float8 AS high, low::float8 AS low,
+           close::float8 AS close, volume::float8 AS volume
+    FROM market_data
+    WHERE symbol = $1
+      AND time >= $2
+      AND time <= $3
+    ORDER BY time
+"""
+
+_Q_LATEST_TS = "SELECT MAX(time) AS latest FROM market_data WHERE symbol = $1"
+
+# Continuous aggregate views: name -> (bucket width, refresh start_offset, end_offset, schedule)
+_CONTINUOUS_AGGREGATES = {
+    "market_data_1m": ("1 minute", "3 hours", "1 minute", "1 minute"),
+    "market_data_1h": ("1 hour", "3 days", "1 hour", "30 minutes"),
+    "market_data_1d": ("1 day", "7 days", "1 day", "1 hour"),
+}
+
+# get_ohlcv(interval=...) values served from a continuous aggregate (normalized to lowercase)
+_AGGREGATE_VIEW_BY_INTERVAL = {
+    "1 minute": "market_data_1m", "1 min": "market_data_1m", "1m": "market_data_1m",
+    "1 hour": "market_data_1h", "1h": "market_data_1h",
+    "1 day": "market_data_1d", "1d": "market_data_1d",
+}
+
+_Q_GET_OHLCV_VIEW = {
+    view: f"""
+        SELECT bucket, symbol, open::float8 AS open, high::float8 AS high, low::float8 AS low,
+               close::float8 AS close, volume::float8 AS volume
+        FROM {view}
+        WHERE symbol = $1
+          AND bucket >= $2
+          AND bucket <= $3
+        ORDER BY bucket
+    """
+    for view in _CONTINUOUS_AGGREGATES
+}
+
+# Price/volume columns of the read queries, by position (after time and symbol)
+_VALUE_COLUMNS = (("open", 2), ("high", 3), ("low", 4), ("close", 5), ("volume", 6))
+
+
+def _rows_to_columns(rows: List[asyncpg.Record]) -> Dict[str, np.ndarray]:
+    """Read-query rows -> one array per column, filled straight from the records."""
+    n = len(rows)
+    # Epoch seconds -> datetime64[us] (UTC); avoids numpy's tz-aware datetime path
+    seconds = np.fromiter((r[0].timestamp() for r in rows), dtype=np.float64, count=n)
+    columns = {"timestamp": np.round(seconds * 1e6).astype(np.int64).view("datetime64[us]")}
+    for name, idx in _VALUE_COLUMNS:
+        columns[name] = np.fromiter((r[idx] for r in rows), dtype=np.float64, count=n)
+    return columns
+
 
 class TimeseriesStore:
     """
@@ -32,6 +122,8 @@ class TimeseriesStore:
     
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        # Concurrent first calls to connect() must not each create a pool
+        self._connect_lock = asyncio.Lock()
         logger.info("TimeseriesStore initialized")
     
     async def connect(self):
@@ -39,61 +131,82 @@ class TimeseriesStore:
         if self.pool:
             return
         
-        try:
-            self.pool = await asyncpg.create_pool(
-                host=settings.POSTGRES_HOST,
-                port=settings.POSTGRES_PORT,
-                user=settings.POSTGRES_USER,
-                password=settings.POSTGRES_PASSWORD,
-                database=settings.POSTGRES_DB,
-                min_size=2,
-                max_size=10
-            )
-            
-            # Create tables if not exist
-            await self.create_schema()
+        async with self._connect_lock:
+            if self.pool:
+                return
             
-            logger.info("✅ Connected to TimescaleDB")
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to TimescaleDB: {e}")
-            raise
+            try:
+                self.pool = await asyncpg.create_pool(
+                    host=settings.POSTGRES_HOST,
+                    port=settings.POSTGRES_PORT,
+                    user=settings.POSTGRES_USER,
+                    password=settings.POSTGRES_PASSWORD,
+                    database=settings.POSTGRES_DB,
+                    # Warm connections keep TCP/TLS/auth and prepared statements amortized;
+                    # max_size also covers the parallel COPY shards in insert_ohlcv
+                    min_size=settings.PG_POOL_MIN,
+                    max_size=settings.PG_POOL_MAX,
+                    max_inactive_connection_lifetime=300,
+                    max_queries=50000,
+                    statement_cache_size=1024,
+                    command_timeout=60,
+                    # Short analytic queries don't benefit from JIT compilation
+                    server_settings={"application_name": "quantforge", "jit": "off"}
+                )
+                
+                # Create tables if not exist
+                await self.create_schema()
+                
+                logger.info("✅ Connected to TimescaleDB")
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to TimescaleDB: {e}")
+                raise
     
     async def create_schema(self):
         """Create hypertable and indexes."""
         async with self.pool.acquire() as conn:
-            # Enable TimescaleDB extension
-            await conn.execute("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;")
-            
-            # Create market_data table
+            # Extension, table and index in one round-trip (multi-statement simple query)
             await conn.execute("""
+                CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;
+                
                 CREATE TABLE IF NOT EXISTS market_data (
                     time TIMESTAMPTZ NOT NULL,
                     symbol VARCHAR(20) NOT NULL,
-                    open NUMERIC NOT NULL,
-                    high NUMERIC NOT NULL,
-                    low NUMERIC NOT NULL,
-                    close NUMERIC NOT NULL,
-                    volume NUMERIC NOT NULL,
+                    open DOUBLE PRECISION NOT NULL,
+                    high DOUBLE PRECISION NOT NULL,
+                    low DOUBLE PRECISION NOT NULL,
+                    close DOUBLE PRECISION NOT NULL,
+                    volume DOUBLE PRECISION NOT NULL,
                     num_trades INTEGER,
                     source VARCHAR(20) DEFAULT 'binance'
                 );
+                
+                CREATE INDEX IF NOT EXISTS idx_market_data_symbol_time 
+                ON market_data (symbol, time DESC);
             """)
             
-            # Convert to hypertable (if not already)
+            # Convert to hypertable (if not already), partitioned by time and symbol hash.
+            # An existing time-only hypertable keeps its layout: add_dimension() only works
+            # while it is empty, otherwise re-create it and reload the data.
             try:
-                await conn.execute("""
-                    SELECT create_hypertable('market_data', 'time', if_not_exists => TRUE);
+                await conn.execute(f"""
+                    SELECT create_hypertable('market_data', 'time', 'symbol',
+                        number_partitions => {SYMBOL_PARTITIONS}, if_not_exists => TRUE);
                 """)
                 logger.info("✅ Created hypertable: market_data")
             except Exception as e:
                 logger.debug(f"Hypertable may already exist: {e}")
             
-            # Create indexes
-            await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_market_data_symbol_time 
-                ON market_data (symbol, time DESC);
-            """)
+            # One row per (symbol, time): the conflict target for the staged INSERT in _copy_records
+            try:
+                await conn.execute("""
+                    ALTER TABLE market_data
+                    ADD CONSTRAINT market_data_symbol_time_uniq UNIQUE (symbol, time);
+                """)
+                logger.info("✅ Added unique constraint on (symbol, time)")
+            except Exception as e:
+                logger.debug(f"Unique constraint may already exist: {e}")
             
             # Add compression policy (compress data older than 7 days)
             try:
@@ -112,11 +225,38 @@ class TimeseriesStore:
                 logger.info("✅ Added retention policy (90 days)")
             except Exception as e:
                 logger.debug(f"Retention policy may already exist: {e}")
+            
+            # Continuous aggregates: incrementally materialized candles for get_ohlcv(interval=...)
+            for view, (bucket, start_offset, end_offset, schedule) in _CONTINUOUS_AGGREGATES.items():
+                try:
+                    await conn.execute(f"""
+                        CREATE MATERIALIZED VIEW IF NOT EXISTS {view}
+                        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                        SELECT time_bucket(INTERVAL '{bucket}', time) AS bucket,
+                               symbol,
+                               first(open, time) AS open,
+                               max(high) AS high,
+                               min(low) AS low,
+                               last(close, time) AS close,
+                               sum(volume) AS volume
+                        FROM market_data
+                        GROUP BY bucket, symbol;
+                    """)
+                    await conn.execute(f"""
+                        SELECT add_continuous_aggregate_policy('{view}',
+                            start_offset => INTERVAL '{start_offset}',
+                            end_offset => INTERVAL '{end_offset}',
+                            schedule_interval => INTERVAL '{schedule}',
+                            if_not_exists => TRUE);
+                    """)
+                    logger.info(f"✅ Continuous aggregate ready: {view}")
+                except Exception as e:
+                    logger.debug(f"Continuous aggregate {view} not created: {e}")
     
     async def insert_ohlcv(
         self,
         symbol: str,
-        data: List[Dict[str, Any]],
+        data: "OHLCVColumns",
         source: str = "binance"
     ) -> int:
         """
@@ -124,7 +264,7 @@ class TimeseriesStore:
         
         Args:
             symbol: Trading pair symbol
-            data: List of OHLCV records
+            data: Columnar OHLCV batch (from BinanceConnector.fetch_ohlcv)
             source: Data source name
             
         Returns:
@@ -133,34 +273,108 @@ class TimeseriesStore:
         if not data:
             return 0
         
+        # Drop repeated open times (overlapping pages) before they reach the database
+        _, first = np.unique(data.timestamps_ms, return_index=True)
+        if len(first) < len(data):
+            data = type(data)({name: column[first] for name, column in data.columns.items()})
+        
+        records = self._ohlcv_records(symbol, data, source)
+        
+        # Large batches are split into contiguous time ranges and loaded over
+        # separate connections, each in its own transaction
+        n_shards = min(MAX_COPY_SHARDS, len(records) // COPY_SHARD_ROWS + 1)
+        shard_size = -(-len(records) // n_shards)
+        shards = [records[i:i + shard_size] for i in range(0, len(records), shard_size)]
+        
+        async def _copy_shard(shard: List[tuple]) -> int:
+            async with self.pool.acquire() as conn:
+                return await self._copy_records(conn, shard)
+        
+        results = await asyncio.gather(*[_copy_shard(s) for s in shards], return_exceptions=True)
+        
+        inserted = sum(r for r in results if not isinstance(r, BaseException))
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.error(
+                f"{len(errors)}/{len(shards)} OHLCV shards failed for {symbol} "
+                f"({inserted} records inserted): {errors[0]}"
+            )
+            raise errors[0]
+        
+        logger.info(f"Inserted {inserted} OHLCV records for {symbol}")
+        
+        if inserted:
+            await self._refresh_aggregates(
+                datetime.fromtimestamp(int(data.timestamps_ms.min()) / 1000, tz=timezone.utc),
+                datetime.fromtimestamp(int(data.timestamps_ms.max()) / 1000, tz=timezone.utc)
+            )
+        return inserted
+    
+    async def _refresh_aggregates(self, start: datetime, end: datetime):
+        """
+        Re-materialize the continuous aggregate buckets covering [start, end].
+        
+        Backfilled rows land behind the views' materialization watermark: the refresh
+        policies only revisit their recent window and real-time aggregation only covers
+        data after the watermark, so interval reads would miss them otherwise.
+        """
         async with self.pool.acquire() as conn:
-            # Prepare batch insert
-            records = [
-                (
-                    record["timestamp"],
-                    symbol,
-                    record["open"],
-                    record["high"],
-                    record["low"],
-                    record["close"],
-                    record["volume"],
-                    record.get("num_trades"),
-                    source
-                )
-                for record in data
-            ]
-            
-            # Use ON CONFLICT to handle duplicates
-            query = """
-                INSERT INTO market_data (time, symbol, open, high, low, close, volume, num_trades, source)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                ON CONFLICT DO NOTHING
-            """
-            
-            result = await conn.executemany(query, records)
-            
-            logger.info(f"Inserted {len(records)} OHLCV records for {symbol}")
-            return len(records)
+            for view, (bucket, *_) in _CONTINUOUS_AGGREGATES.items():
+                # Literal timestamps: CALL runs outside a transaction, over the simple query protocol
+                try:
+                    await conn.execute(f"""
+                        CALL refresh_continuous_aggregate('{view}',
+                            time_bucket(INTERVAL '{bucket}', TIMESTAMPTZ '{start.isoformat()}'),
+                            time_bucket(INTERVAL '{bucket}', TIMESTAMPTZ '{end.isoformat()}') + INTERVAL '{bucket}');
+                    """)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh {view} for {start} - {end}: {e}")
+    
+    @staticmethod
+    def _ohlcv_records(symbol: str, data: "OHLCVColumns", source: str) -> List[tuple]:
+        """Rows in OHLCV_COLUMNS order: columns -> Python scalars in C via tolist(), then zip."""
+        n = len(data)
+        times = [
+            t.replace(tzinfo=timezone.utc)
+            for t in data["timestamp"].astype("datetime64[us]").tolist()
+        ]
+        return list(zip(
+            times,
+            repeat(symbol, n),
+            data["open"].tolist(),
+            data["high"].tolist(),
+            data["low"].tolist(),
+            data["close"].tolist(),
+            data["volume"].tolist(),
+            data["num_trades"].tolist(),
+            repeat(source, n)
+        ))
+    
+    @staticmethod
+    async def _copy_records(conn: asyncpg.Connection, records: List[tuple]) -> int:
+        """
+        Bulk-load rows with binary COPY into a temp staging table, then move them
+        into market_data, skipping rows already stored for (symbol, time) (COPY itself
+        can't skip duplicates).
+        Returns the number of rows inserted.
+        """
+        async with conn.transaction():
+            # Temp tables are already unlogged; ON COMMIT DROP cleans up with the transaction
+            await conn.execute(
+                "CREATE TEMP TABLE market_data_stage (LIKE market_data INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            await conn.copy_records_to_table(
+                "market_data_stage", records=records, columns=OHLCV_COLUMNS
+            )
+            columns = ", ".join(OHLCV_COLUMNS)
+            status = await conn.execute(f"""
+                INSERT INTO market_data ({columns})
+                SELECT {columns} FROM market_data_stage
+                ON CONFLICT (symbol, time) DO NOTHING
+            """)
+        
+        # Command tag: "INSERT 0 <rows>"
+        return int(status.rsplit(" ", 1)[-1])
     
     async def get_ohlcv(
         self,
@@ -182,46 +396,49 @@ class TimeseriesStore:
             List of OHLCV records
         """
         async with self.pool.acquire() as conn:
-            if interval:
-                # Use time_bucket for aggregation
-                query = """
-                    SELECT time_bucket($1, time) AS bucket,
-                           symbol,
-                           first(open, time) as open,
-                           max(high) as high,
-                           min(low) as low,
-                           last(close, time) as close,
-                           sum(volume) as volume
-                    FROM market_data
-                    WHERE symbol = $2
-                      AND time >= $3
-                      AND time <= $4
-                    GROUP BY bucket, symbol
-                    ORDER BY bucket
-                """
-                rows = await conn.fetch(query, interval, symbol, start_date, end_date)
-            else:
-                # Raw data
-                query = """
-                    SELECT time, symbol, open, high, low, close, volume
-                    FROM market_data
-                    WHERE symbol = $1
-                      AND time >= $2
-                      AND time <= $3
-                    ORDER BY time
-                """
-                rows = await conn.fetch(query, symbol, start_date, end_date)
-            
+            rows = await self._fetch_ohlcv_rows(conn, symbol, start_date, end_date, interval)
             return [dict(row) for row in rows]
     
+    async def get_ohlcv_columnar(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Same as get_ohlcv, but one array per column instead of a dict per row.
+        
+        Returns:
+            {"timestamp": datetime64[us] (UTC), "open"/"high"/"low"/"close"/"volume": float64}
+        """
+        async with self.pool.acquire() as conn:
+            rows = await self._fetch_ohlcv_rows(conn, symbol, start_date, end_date, interval)
+        
+        return _rows_to_columns(rows)
+    
+    @staticmethod
+    async def _fetch_ohlcv_rows(
+        conn: asyncpg.Connection,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: Optional[str]
+    ) -> List[asyncpg.Record]:
+        if not interval:
+            # Raw data
+            return await conn.fetch(_Q_GET_OHLCV_RAW, symbol, start_date, end_date)
+        
+        # Standard intervals read their continuous aggregate; others bucket raw rows
+        view = _AGGREGATE_VIEW_BY_INTERVAL.get(" ".join(interval.lower().split()))
+        if view:
+            return await conn.fetch(_Q_GET_OHLCV_VIEW[view], symbol, start_date, end_date)
+        return await conn.fetch(_Q_GET_OHLCV_BUCKET, interval, symbol, start_date, end_date)
+    
     async def get_latest_timestamp(self, symbol: str) -> Optional[datetime]:
         """Get the most recent timestamp for a symbol."""
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT MAX(time) as latest FROM market_data WHERE symbol = $1",
-                symbol
-            )
-            return row["latest"] if row else None
+            return await conn.fetchval(_Q_LATEST_TS, symbol)
     
     async def close(self):
         """Close connection pool."""
@@ -232,10 +449,13 @@ class TimeseriesStore:
 
 # Singleton instance
 _timeseries_store = None
+_timeseries_store_lock = threading.Lock()
 
 def get_timeseries_store() -> TimeseriesStore:
     """Get singleton TimescaleDB instance."""
     global _timeseries_store
     if _timeseries_store is None:
-        _timeseries_store = TimeseriesStore()
+        with _timeseries_store_lock:
+            if _timeseries_store is None:
+                _timeseries_store = TimeseriesStore()
     return _timeseries_store
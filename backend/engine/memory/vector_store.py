@@ -1,14 +1,54 @@
 # backend/engine/memory/vector_store.py
+import asyncio
+import functools
+import threading
 import time
 import logging
-from typing import List, Dict, Any, Optional
-import anyio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Union
+import numpy as np
+import orjson
 
 from backend.core.config import settings
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Embeddings arrive as float32 ndarrays (rows of an (N, D) batch or a 1-D query)
+Vector = Union[np.ndarray, Sequence[float]]
+
+
+def _to_wire(vector: Vector) -> List[float]:
+    """Materialize a vector as Python floats only at the Weaviate client boundary."""
+    if isinstance(vector, np.ndarray):
+        return vector.astype(np.float32, copy=False).tolist()
+    return list(vector)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool for blocking Weaviate calls (created on first use)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.WEAVIATE_POOL, thread_name_prefix="weaviate"
+                )
+    return _executor
+
+
+def shutdown_vector_executor():
+    """Stop the Weaviate worker threads (called on app shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
 # Weaviate v4 client (preferred)
 try:
     import weaviate
@@ -24,6 +64,8 @@ class QuantForgeVectorStore:
 
     def __init__(self):
         self.client = None
+        # collection name -> Collection handle (see _collection)
+        self._coll_cache: Dict[str, Any] = {}
         if not weaviate:
             logger.error("weaviate library not installed. Vector store disabled.")
             return
@@ -59,9 +101,18 @@ class QuantForgeVectorStore:
             logger.error(f"❌ Failed to initialize Weaviate client: {e}")
             self.client = None
 
-    # Utility: run a blocking function in threadpool
+    def _collection(self, name: str):
+        """Collection handle, built once per name."""
+        coll = self._coll_cache.get(name)
+        if coll is None:
+            coll = self.client.collections.get(name)
+            self._coll_cache[name] = coll
+        return coll
+
+    # Utility: run a blocking function in the dedicated Weaviate threadpool
     async def _run(self, func, *a, **kw):
-        return await anyio.to_thread.run_sync(lambda: func(*a, **kw))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), functools.partial(func, *a, **kw))
 
     async def create_collection_if_not_exists(self, collection_name: str = "FinancialInsight"):
         """Create Weaviate collection (class) with a minimal financial schema.
@@ -81,11 +132,26 @@ class QuantForgeVectorStore:
 
                 # Create using manual vector mode (vectorizer_config=None)
                 # Weaviate v4 auto-detects vector dimensions from first insert
-                from weaviate.classes.config import Property, DataType
+                from weaviate.classes.config import Configure, Property, DataType
+
+                # Stored vectors are SQ/PQ-compressed server-side once training_limit objects
+                # exist; query vectors stay float32 (embeddings are L2-normalized at encode time).
+                quantizer = None
+                if settings.WEAVIATE_SQ_ENABLED:
+                    quantizer = Configure.VectorIndex.Quantizer.sq(
+                        training_limit=settings.WEAVIATE_PQ_TRAINING_LIMIT,
+                    )
+                elif settings.WEAVIATE_PQ_ENABLED:
+                    quantizer = Configure.VectorIndex.Quantizer.pq(
+                        segments=settings.WEAVIATE_PQ_SEGMENTS,
+                        centroids=settings.WEAVIATE_PQ_CENTROIDS,
+                        training_limit=settings.WEAVIATE_PQ_TRAINING_LIMIT,
+                    )
 
                 self.client.collections.create(
                     name=collection_name,
                     vectorizer_config=None,  # manual vectors
+                    vector_index_config=Configure.VectorIndex.hnsw(quantizer=quantizer),
                     properties=[
                         Property(name="content", data_type=DataType.TEXT),
                         Property(name="source", data_type=DataType.TEXT),
@@ -110,6 +176,7 @@ class QuantForgeVectorStore:
         
         def _delete():
             try:
+                self._coll_cache.pop(collection_name, None)
                 if self.client.collections.exists(collection_name):
                     self.client.collections.delete(collection_name)
                     logger.info(f"🗑️ Deleted collection: {collection_name}")
@@ -126,7 +193,7 @@ class QuantForgeVectorStore:
     async def ingest_documents(
         self,
         documents: List[Dict[str, Any]],
-        vectors: List[List[float]],
+        vectors: Union[np.ndarray, Sequence[Vector]],
         collection_name: str = "FinancialInsight",
         upsert: bool = True
     ) -> Dict[str, int]:
@@ -139,41 +206,56 @@ class QuantForgeVectorStore:
             raise ValueError("documents and vectors must be same length")
 
         def _ingest():
-            import json
             ingested = 0
             updated = 0
             failed = 0
             errors = []
 
             try:
-                coll = self.client.collections.get(collection_name)
+                coll = self._collection(collection_name)
             except Exception as e:
                 raise RuntimeError(f"Collection {collection_name} not found: {e}")
 
-            for doc, vec in zip(documents, vectors):
-                try:
-                    # If doc already has an 'id' field use it; else create new
-                    obj_id = doc.get("id")
-                    
-                    # Convert metadata dict to JSON string for TEXT field
-                    metadata_str = json.dumps(doc.get("metadata", {}))
-                    
-                    properties = {
-                        "content": doc.get("content"),
-                        "source": doc.get("source"),
-                        "ticker": doc.get("ticker"),
-                        "category": doc.get("category"),
-                        "timestamp": doc.get("timestamp"),
-                        "metadata": metadata_str,  # Store as JSON string
-                    }
-
-                    # Insert object with explicit vector
-                    coll.data.insert(properties=properties, vector=vec, uuid=obj_id)
-                    ingested += 1
-                except Exception as ee:
-                    logger.error(f"Failed to ingest doc: {ee}")
-                    errors.append(str(ee))
-                    failed += 1
+            # One contiguous float32 matrix, converted to Python floats in a single C pass
+            wire_vectors = np.ascontiguousarray(vectors, dtype=np.float32).tolist()
+
+            # One dynamic batch: objects go out in multi-object requests sized by server load
+            added = 0
+            with coll.batch.dynamic() as batch:
+                for doc, vec in zip(documents, wire_vectors):
+                    try:
+                        # If doc already has an 'id' field use it; else create new
+                        obj_id = doc.get("id")
+                        
+                        # Convert metadata dict to compact JSON string for TEXT field
+                        metadata_str = orjson.dumps(
+                            doc.get("metadata", {}), option=orjson.OPT_NON_STR_KEYS
+                        ).decode()
+                        
+                        properties = {
+                            "content": doc.get("content"),
+                            "source": doc.get("source"),
+                            "ticker": doc.get("ticker"),
+                            "category": doc.get("category"),
+                            "timestamp": doc.get("timestamp"),
+                            "metadata": metadata_str,  # Store as JSON string
+                        }
+
+                        # Queue object with explicit vector
+                        batch.add_object(properties=properties, vector=vec, uuid=obj_id)
+                        added += 1
+                    except Exception as ee:
+                        logger.error(f"Failed to ingest doc: {ee}")
+                        errors.append(str(ee))
+                        failed += 1
+
+            # Server-side rejections are only known once the batch has flushed
+            rejected = coll.batch.failed_objects
+            for failed_obj in rejected:
+                logger.error(f"Failed to ingest doc: {failed_obj.message}")
+                errors.append(failed_obj.message)
+            failed += len(rejected)
+            ingested = added - len(rejected)
 
             return {"ingested": ingested, "updated": updated, "failed": failed, "errors": errors}
 
@@ -181,75 +263,88 @@ class QuantForgeVectorStore:
 
     async def search(
         self,
-        query_vector: List[float],
+        query_vector: Vector,
         limit: int = 10,
         collection_name: str = "FinancialInsight",
         filters: Optional[Dict[str, Any]] = None,
-        min_distance: float = 0.0
+        min_distance: float = 0.0,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
-        """Semantic search with optional filters. Returns list of {content, metadata, distance, confidence}"""
+        """Semantic search with optional filters. Returns list of {content, metadata, properties, distance, confidence}
+
+        start_date/end_date bound the `timestamp` property inside the query, so the
+        date range is applied by Weaviate's filtered HNSW search rather than afterwards.
+        """
 
         if not self.client:
             raise RuntimeError("Weaviate client not configured")
 
         def _search():
-            import json
             try:
-                coll = self.client.collections.get(collection_name)
+                coll = self._collection(collection_name)
             except Exception as e:
                 raise RuntimeError(f"Collection {collection_name} not found: {e}")
 
             # Build "where" filter if filters provided
             from weaviate.classes.query import Filter
-            where_filter = None
+            # Build "where" filter using Weaviate v4 Filter API
+            filter_conditions = []
             if filters:
-                # Build filters using Weaviate v4 Filter API
-                filter_conditions = []
                 for k, v in filters.items():
                     if v is not None:
-                        filter_conditions.append(Filter.by_property(k).equal(str(v)))
-                
-                if len(filter_conditions) == 1:
-                    where_filter = filter_conditions[0]
-                elif len(filter_conditions) > 1:
-                    where_filter = filter_conditions[0]
-                    for condition in filter_conditions[1:]:
-                        where_filter = where_filter & condition
+                        # Filterable properties are TEXT: only non-strings need converting
+                        value = v if isinstance(v, str) else str(v)
+                        filter_conditions.append(Filter.by_property(k).equal(value))
+            if start_date:
+                filter_conditions.append(Filter.by_property("timestamp").greater_or_equal(start_date))
+            if end_date:
+                filter_conditions.append(Filter.by_property("timestamp").less_or_equal(end_date))
+            
+            # One flat AND node rather than a chain of nested pairs
+            where_filter = None
+            if len(filter_conditions) == 1:
+                where_filter = filter_conditions[0]
+            elif filter_conditions:
+                where_filter = Filter.all_of(filter_conditions)
 
             # Run near_vector query
             resp = coll.query.near_vector(
-                near_vector=query_vector, 
+                near_vector=_to_wire(query_vector),
                 limit=limit,
                 filters=where_filter
             )
             
-            # resp.objects holds results
+            # resp.objects holds results; lookups used per hit are hoisted out of the loop
             results = []
+            append = results.append
+            loads = orjson.loads
             for item in resp.objects:
-                # Get distance, default to 0.0 if None
-                distance = getattr(item.metadata, 'distance', None)
-                if distance is None:
-                    distance = 0.0
-                else:
-                    distance = float(distance)
+                # Distance defaults to 0.0 if the server didn't return one
+                distance = getattr(item.metadata, "distance", None)
+                distance = 0.0 if distance is None else float(distance)
                 
                 # Skip if distance exceeds threshold
                 if distance > min_distance:
                     continue
                 
-                # Calculate confidence (1.0 - distance)
-                confidence = max(0.0, min(1.0, 1.0 - distance))
+                # Confidence = 1 - distance; distances are >= 0, so only the lower bound needs clamping
+                confidence = 1.0 - distance
+                if confidence < 0.0:
+                    confidence = 0.0
                 
                 # Parse metadata JSON string back to dict
-                metadata_str = item.properties.get("metadata", "{}")
+                properties = item.properties
+                metadata_str = properties.get("metadata")
                 try:
-                    metadata = json.loads(metadata_str) if metadata_str else {}
-                except:
+                    metadata = loads(metadata_str) if metadata_str else {}
+                except (ValueError, TypeError):
                     metadata = {}
                 
-                results.append({
-                    "content": item.properties.get("content"),
+                append({
+                    "content": properties.get("content"),
                     "metadata": metadata,
+                    "properties": properties,
                     "distance": distance,
                     "confidence": confidence
                 })
@@ -263,3 +358,33 @@ class QuantForgeVectorStore:
             return self.client.is_ready() if self.client else False
         except Exception:
             return False
+
+    def close(self):
+        """Close the Weaviate connection."""
+        if self.client:
+            self.client.close()
+            self.client = None
+            self._coll_cache.clear()
+
+
+# Singleton instance: one Weaviate connection shared by routes and the AI engine
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+def get_vector_store() -> QuantForgeVectorStore:
+    """Get singleton QuantForgeVectorStore instance."""
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = QuantForgeVectorStore()
+    return _vector_store
+
+
+def close_vector_store():
+    """Close the shared Weaviate connection (called on app shutdown)."""
+    global _vector_store
+    with _vector_store_lock:
+        if _vector_store is not None:
+            _vector_store.close()
+            _vector_store = None
@@ -10,14 +10,31 @@ Extracts:
 """
 
 import re
+import functools
 import hashlib
-from typing import List, Dict, Any, Optional, Set
+from collections import Counter, OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 from datetime import datetime
+import numpy as np
+
+try:
+    import ahocorasick  # pyahocorasick: all keyword hits in one pass over the text
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # google-re2: linear-time (non-backtracking) matching
+except ImportError:
+    re2 = None
 
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Characters stripped by clean_text. Stays on stdlib re: RE2's \w is ASCII-only and
+# would also strip accented letters.
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?$%-]')
+
 
 class TextPreprocessor:
     """
@@ -30,12 +47,19 @@ class TextPreprocessor:
     - Category classification
     """
     
-    # Common stock ticker patterns
-    TICKER_PATTERNS = [
-        r'\b([A-Z]{1,5})\b',  # Standard tickers (AAPL, TSLA, MSFT)
-        r'\$([A-Z]{1,5})\b',  # Twitter-style ($AAPL)
-        r'\b([A-Z]+)-USD\b',  # Crypto pairs (BTC-USD, ETH-USD)
-    ]
+    # Common words that look like tickers
+    TICKER_BLACKLIST = ("THE", "AND", "FOR", "ARE", "WITH", "HAS", "WAS", "ITS", "NOT", "BUT", "FROM")
+    
+    # Ticker patterns, fused into one alternation so the text is scanned once: crypto pairs
+    # (BTC-USD), Twitter-style ($AAPL), standard tickers (AAPL). Validity is encoded in the
+    # pattern itself (no lookarounds, so RE2 can compile it): symbols are 1-5 letters, and
+    # longer pairs and blacklisted words match an alternative with no named group.
+    TICKER_PATTERN = (
+        r'\b(?:(?P<crypto>[A-Z]{1,5})|[A-Z]{6,})-USD\b'
+        r'|\$?\b(?:' + "|".join(TICKER_BLACKLIST) + r')\b'
+        r'|\$(?P<cash>[A-Z]{1,5})\b'
+        r'|\b(?P<plain>[A-Z]{1,5})\b'
+    )
     
     # Known company to ticker mappings (expanded for better accuracy)
     COMPANY_TICKER_MAP = {
@@ -120,11 +144,45 @@ class TextPreprocessor:
         "merger": ["merger", "acquisition", "deal", "buyout", "takeover"],
     }
     
+    # Processed (title, content) pairs remembered across calls (LRU): overlapping
+    # feeds and re-runs see the same articles again
+    PROCESS_CACHE_SIZE = 10_000
+    
     def __init__(self):
-        # Compile regex patterns
-        self.ticker_regex = [re.compile(pattern) for pattern in self.TICKER_PATTERNS]
+        # 16-byte digest of title + content -> (cleaned content, tickers, category, content hash)
+        self._cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        
+        # Compiled matchers are shared by every instance (built on first construction)
+        self.ticker_regex, self._company_automaton, self._category_automaton = self._compile_matchers()
         logger.info("TextPreprocessor initialized")
     
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _compile_matchers(cls) -> Tuple[Any, Any, Any]:
+        """
+        Ticker regex plus keyword automata (company -> ticker, keyword -> category).
+        The automata are None without pyahocorasick.
+        """
+        ticker_regex = (re2 or re).compile(cls.TICKER_PATTERN)
+        if ahocorasick is None:
+            return ticker_regex, None, None
+        
+        company_automaton = cls._build_automaton(cls.COMPANY_TICKER_MAP.items())
+        category_automaton = cls._build_automaton(
+            (keyword, (keyword, category))
+            for category, keywords in cls.CATEGORY_KEYWORDS.items()
+            for keyword in keywords
+        )
+        return ticker_regex, company_automaton, category_automaton
+    
+    @staticmethod
+    def _build_automaton(items) -> "ahocorasick.Automaton":
+        automaton = ahocorasick.Automaton()
+        for word, value in items:
+            automaton.add_word(word, value)
+        automaton.make_automaton()
+        return automaton
+    
     def process(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a document and extract features.
@@ -138,17 +196,31 @@ class TextPreprocessor:
         content = document.get("content", "")
         title = document.get("title", "")
         
-        # Extract tickers
-        tickers = self.extract_tickers(content + " " + title)
-        
-        # Classify category
-        category = self.classify_category(content + " " + title)
-        
-        # Generate content hash for dedup
-        content_hash = self.generate_hash(content)
-        
-        # Clean text
-        cleaned_content = self.clean_text(content)
+        # process() is deterministic in (title, content): reuse an earlier result
+        key = self._cache_key(title, content)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            cleaned_content, tickers, category, content_hash = cached
+            tickers = list(tickers)
+        else:
+            # Tickers and category both match against the same text: build and lowercase it once
+            text = content + " " + title
+            text_lower = text.lower()
+            
+            # Extract tickers
+            tickers = self.extract_tickers(text, text_lower=text_lower)
+            
+            # Classify category
+            category = self.classify_category(text, text_lower=text_lower)
+            
+            # Generate content hash for dedup
+            content_hash = self.generate_hash(content)
+            
+            # Clean text
+            cleaned_content = self.clean_text(content)
+            
+            self._cache_put(key, (cleaned_content, tuple(tickers), category, content_hash))
         
         # Update document
         document["content"] = cleaned_content
@@ -160,66 +232,120 @@ class TextPreprocessor:
         
         return document
     
-    def extract_tickers(self, text: str) -> List[str]:
+    def process_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process many documents (same result as process() on each).
+        
+        Keyword and ticker matching run as one scan over the joined batch, with each
+        hit mapped back to its document by offset; the results seed the process()
+        cache, so the per-document pass only cleans up and fills in fields.
+        """
+        if self._company_automaton is None or len(documents) < 2:
+            return [self.process(doc) for doc in documents]
+        
+        pending = {}
+        for doc in documents:
+            title, content = doc.get("title", ""), doc.get("content", "")
+            key = self._cache_key(title, content)
+            if key not in self._cache:
+                pending[key] = (title, content)
+        
+        if pending:
+            texts = [content + " " + title for title, content in pending.values()]
+            lowers = [text.lower() for text in texts]
+            tickers: List[Set[str]] = [set() for _ in texts]
+            keywords: List[Set[tuple]] = [set() for _ in texts]
+            
+            # "\x1f" can't occur in a keyword or ticker, so no match spans two documents
+            hits = list(self._company_automaton.iter("\x1f".join(lowers)))
+            for i, (_, ticker) in zip(self._doc_index(lowers, [end for end, _ in hits]), hits):
+                tickers[i].add(ticker)
+            
+            hits = list(self._category_automaton.iter("\x1f".join(lowers)))
+            for i, (_, hit) in zip(self._doc_index(lowers, [end for end, _ in hits]), hits):
+                keywords[i].add(hit)
+            
+            matches = list(self.ticker_regex.finditer("\x1f".join(texts)))
+            for i, match in zip(self._doc_index(texts, [m.start() for m in matches]), matches):
+                ticker = self._match_ticker(match)
+                if ticker:
+                    tickers[i].add(ticker)
+            
+            for i, (key, (title, content)) in enumerate(pending.items()):
+                self._cache_put(key, (
+                    self.clean_text(content),
+                    tuple(tickers[i]),
+                    self._best_category(keywords[i]),
+                    self.generate_hash(content),
+                ))
+        
+        return [self.process(doc) for doc in documents]
+    
+    @staticmethod
+    def _doc_index(texts: List[str], positions: List[int]) -> np.ndarray:
+        """Index of the document each position falls in, for texts joined by one separator."""
+        separators = np.cumsum([len(text) + 1 for text in texts]) - 1
+        return np.searchsorted(separators, positions)
+    
+    @staticmethod
+    def _cache_key(title: str, content: str) -> bytes:
+        return hashlib.blake2b(f"{title}\x00{content}".encode(), digest_size=16).digest()
+    
+    def _cache_put(self, key: bytes, entry: tuple):
+        self._cache[key] = entry
+        if len(self._cache) > self.PROCESS_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def extract_tickers(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Extract stock tickers from text.
         
+        Args:
+            text: Text to scan
+            text_lower: text.lower(), if the caller already has it
+        
         Returns:
             List of unique ticker symbols
         """
         tickers: Set[str] = set()
-        text_lower = text.lower()
-        
-        # Check company name mappings
-        for company, ticker in self.COMPANY_TICKER_MAP.items():
-            if company in text_lower:
-                tickers.add(ticker)
+        if text_lower is None:
+            text_lower = text.lower()
         
-        # Extract using regex
-        for regex in self.ticker_regex:
-            matches = regex.findall(text)
-            tickers.update(matches)
+        # Check company name mappings (substring match, like `company in text_lower`)
+        if self._company_automaton is not None:
+            tickers.update(ticker for _, ticker in self._company_automaton.iter(text_lower))
+        else:
+            for company, ticker in self.COMPANY_TICKER_MAP.items():
+                if company in text_lower:
+                    tickers.add(ticker)
         
-        # Filter invalid tickers
-        valid_tickers = self._filter_tickers(list(tickers))
+        # Extract using regex (one pass; the matching group tells the form)
+        for match in self.ticker_regex.finditer(text):
+            ticker = self._match_ticker(match)
+            if ticker:
+                tickers.add(ticker)
         
-        logger.debug(f"Extracted tickers: {valid_tickers}")
+        valid_tickers = list(tickers)
+        logger.debug("Extracted tickers: %s", valid_tickers)
         return valid_tickers
     
-    def _filter_tickers(self, tickers: List[str]) -> List[str]:
-        """
-        Filter out invalid/common words that look like tickers.
-        """
-        # Common words to exclude
-        BLACKLIST = {"THE", "AND", "FOR", "ARE", "WITH", "HAS", "WAS", "ITS", "NOT", "BUT", "FROM"}
-        
-        filtered = []
-        for ticker in tickers:
-            ticker = ticker.upper().strip()
-            
-            # Skip if in blacklist
-            if ticker in BLACKLIST:
-                continue
-            
-            # Skip if too long
-            if len(ticker) > 5:
-                continue
-            
-            # Skip if too short
-            if len(ticker) < 1:
-                continue
-            
-            filtered.append(ticker)
-        
-        return filtered
+    @staticmethod
+    def _match_ticker(match) -> Optional[str]:
+        """Ticker for a TICKER_PATTERN match; None for blacklisted words and over-long pairs."""
+        cash, crypto, plain = match.group("cash", "crypto", "plain")
+        return cash or plain or (f"{crypto}-USD" if crypto else None)
     
-    def classify_category(self, text: str) -> Optional[str]:
+    def classify_category(self, text: str, text_lower: Optional[str] = None) -> Optional[str]:
         """
-        Classify document category based on keywords.
+        Classify document category based on keywords (text_lower: text.lower(), if known).
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Count keyword matches per category (each distinct keyword once)
+        if self._category_automaton is not None:
+            return self._best_category({hit for _, hit in self._category_automaton.iter(text_lower)})
         
-        # Count keyword matches per category
         scores = {}
         for category, keywords in self.CATEGORY_KEYWORDS.items():
             score = sum(1 for keyword in keywords if keyword in text_lower)
@@ -232,6 +358,15 @@ class TextPreprocessor:
         
         return "general"
     
+    def _best_category(self, matched: Set[tuple]) -> str:
+        """Highest-scoring category from distinct (keyword, category) automaton hits."""
+        counts = Counter(category for _, category in matched)
+        # Same insertion order as the substring loop, so ties resolve identically
+        scores = {c: counts[c] for c in self.CATEGORY_KEYWORDS if counts[c]}
+        if scores:
+            return max(scores, key=scores.get)
+        return "general"
+    
     def clean_text(self, text: str) -> str:
         """
         Clean and normalize text.
@@ -240,15 +375,19 @@ class TextPreprocessor:
         text = " ".join(text.split())
         
         # Remove special characters (keep alphanumeric, spaces, basic punctuation)
-        text = re.sub(r'[^\w\s.,!?$%-]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         
         return text.strip()
     
-    def generate_hash(self, content: str) -> str:
+    def generate_hash(self, content: Union[str, bytes]) -> str:
         """
         Generate content hash for deduplication.
+        
+        BLAKE2b-128: faster than MD5 on 64-bit CPUs, same 32-char hex digest.
         """
-        return hashlib.md5(content.encode()).hexdigest()
+        if isinstance(content, str):
+            content = content.encode()
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
     
     def is_duplicate(self, content_hash: str, seen_hashes: Set[str]) -> bool:
         """
@@ -10,21 +10,40 @@ The functions are async and return the final text string produced by the provide
 """
 
 from typing import Optional
+from contextlib import asynccontextmanager
 import httpx
 import json
 import asyncio
 
 from backend.core.config import settings
-from backend.core.logging import logger
+from backend.core.logging import get_logger
 from fastapi import HTTPException
 
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def _use_client(client: Optional[httpx.AsyncClient], timeout: int):
+    """Yield the caller's shared client, or a short-lived one if none was given."""
+    if client is not None:
+        yield client
+    else:
+        async with httpx.AsyncClient(timeout=timeout) as own_client:
+            yield own_client
+
 
 # ---------- Ollama (local) ----------
-async def infer_ollama(prompt: str, max_tokens: int = 512, timeout: int = 30) -> str:
+async def infer_ollama(
+    prompt: str,
+    max_tokens: int = 512,
+    timeout: int = 30,
+    client: Optional[httpx.AsyncClient] = None
+) -> str:
     """
     Calls a local Ollama / similar local REST LLM server.
     Expects an endpoint: POST http://{OLLAMA_HOST}:{OLLAMA_PORT}/api/generate
     The payload shape depends on the local server; this implementation uses a flexible shape.
+    Pass `client` (app.state.http) to reuse pooled connections.
     """
     url = f"{settings.OLLAMA_HOST}:{settings.OLLAMA_PORT}/api/generate"
     payload = {
@@ -35,10 +54,10 @@ async def infer_ollama(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
         "temperature": 0.7,
     }
 
-    logger.debug("Calling Ollama", url=url, truncate_prompt=prompt[:120])
+    logger.debug("Calling Ollama url=%s prompt=%.120s", url, prompt)
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(url, json=payload)
+        async with _use_client(client, timeout) as http:
+            resp = await http.post(url, json=payload, timeout=timeout)
             resp.raise_for_status()
             data = resp.json()
             # expected shape depends on Ollama server; try to adapt common patterns:
@@ -53,7 +72,7 @@ async def infer_ollama(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
             # fallback: return raw text
             return str(data)
     except httpx.HTTPStatusError as exc:
-        logger.error("Ollama returned non-2xx", status=exc.response.status_code, body=exc.response.text)
+        logger.error("Ollama returned non-2xx status=%s body=%s", exc.response.status_code, exc.response.text)
         raise HTTPException(status_code=502, detail="Local model error")
     except Exception as e:
         logger.exception("Ollama inference failed")
@@ -61,10 +80,16 @@ async def infer_ollama(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
 
 
 # ---------- OpenAI (cloud) ----------
-async def infer_openai(prompt: str, max_tokens: int = 512, timeout: int = 30) -> str:
+async def infer_openai(
+    prompt: str,
+    max_tokens: int = 512,
+    timeout: int = 30,
+    client: Optional[httpx.AsyncClient] = None
+) -> str:
     """
     Calls OpenAI Chat Completions API as a fallback or for heavy reasoning.
     Requires settings.OPENAI_API_KEY to be set.
+    Pass `client` (app.state.http) to reuse pooled connections.
     """
     api_key = settings.OPENAI_API_KEY
     if not api_key:
@@ -79,10 +104,10 @@ async def infer_openai(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
         "temperature": 0.7,
     }
 
-    logger.debug("Calling OpenAI", url=url)
+    logger.debug("Calling OpenAI url=%s", url)
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(url, headers=headers, json=payload)
+        async with _use_client(client, timeout) as http:
+            resp = await http.post(url, headers=headers, json=payload, timeout=timeout)
             resp.raise_for_status()
             j = resp.json()
             # Standard chat completion structure
@@ -98,7 +123,7 @@ async def infer_openai(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
             # fallback: return entire response
             return json.dumps(j)
     except httpx.HTTPStatusError as exc:
-        logger.error("OpenAI returned non-2xx", status=exc.response.status_code, body=exc.response.text)
+        logger.error("OpenAI returned non-2xx status=%s body=%s", exc.response.status_code, exc.response.text)
         raise HTTPException(status_code=502, detail="OpenAI API returned error")
     except Exception as e:
         logger.exception("OpenAI inference failed")
@@ -106,7 +131,12 @@ async def infer_openai(prompt: str, max_tokens: int = 512, timeout: int = 30) ->
 
 
 # ---------- Router (chooses provider) ----------
-async def route_inference(prompt: str, provider: str = "ollama", max_tokens: int = 512) -> str:
+async def route_inference(
+    prompt: str,
+    provider: str = "ollama",
+    max_tokens: int = 512,
+    client: Optional[httpx.AsyncClient] = None
+) -> str:
     """
     Top-level router that decides which provider to call.
     Strategy:
@@ -114,21 +144,21 @@ async def route_inference(prompt: str, provider: str = "ollama", max_tokens: int
      - If provider == 'ollama' but local service is down, fall back to OpenAI (if configured).
     """
     provider = provider.lower().strip()
-    logger.debug("Routing inference", provider=provider)
+    logger.debug("Routing inference provider=%s", provider)
 
     if provider == "ollama":
         # try local ollama, fallback to openai if configured
         try:
-            return await infer_ollama(prompt=prompt, max_tokens=max_tokens)
+            return await infer_ollama(prompt=prompt, max_tokens=max_tokens, client=client)
         except HTTPException as e:
             # if OpenAI configured, fallback, otherwise re-raise
-            logger.warning("Ollama failed, attempting OpenAI fallback", reason=str(e.detail))
+            logger.warning("Ollama failed, attempting OpenAI fallback reason=%s", e.detail)
             if settings.OPENAI_API_KEY:
-                return await infer_openai(prompt=prompt, max_tokens=max_tokens)
+                return await infer_openai(prompt=prompt, max_tokens=max_tokens, client=client)
             raise
 
     if provider == "openai":
-        return await infer_openai(prompt=prompt, max_tokens=max_tokens)
+        return await infer_openai(prompt=prompt, max_tokens=max_tokens, client=client)
 
     # Unknown provider
     raise HTTPException(status_code=400, detail=f"Unknown provider '{provider}'")
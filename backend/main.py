@@ -1,15 +1,22 @@
 # backend/main.py
 
+import asyncio
+import httpx
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from backend.core.config import settings
 from backend.core.logging import get_logger
-from backend.db.session import engine
+from backend.db.session import close_engine, engine
 from backend.utils.cache import RedisClient
 from backend.utils.minio_client import MinioClient
 from backend.routes import system, vector, feeds, market, analysis, ai
 from backend.core.sentry import init_sentry
 from backend.middleware.rate_limiter import get_rate_limiter, rate_limit_middleware
+from backend.engine.llm.client import _get_encoding, close_llm_client, get_llm_client
+from backend.engine.embeddings.hybrid_embedder import close_embedder, get_embedder
+from backend.engine.ai_engine import get_ai_engine
+from backend.engine.feeds.rss_connector import shutdown_parse_pool
+from backend.engine.memory.vector_store import close_vector_store, shutdown_vector_executor
 # from backend.engine.memory.vector_store import WeaviateClient  # to be implemented later
 import sqlalchemy
 
@@ -22,6 +29,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="QuantForge AI Engine — Core Backend Runtime",
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiting middleware
@@ -50,7 +58,7 @@ async def health_check():
     Basic health check endpoint.
     Returns a simple OK response to verify that the FastAPI service is running.
     """
-    return JSONResponse({"status": "ok", "app": settings.APP_NAME})
+    return {"status": "ok", "app": settings.APP_NAME}
 
 
 @app.get("/v1/system/ping", tags=["System"])
@@ -73,8 +81,8 @@ async def check_dependencies():
     # --- Redis ---
     try:
         if redis_client.client:
-            redis_client.set("quantforge:ping", "1", ex=5)
-            val = redis_client.get("quantforge:ping")
+            await asyncio.to_thread(redis_client.set, "quantforge:ping", "1", ex=5)
+            val = await asyncio.to_thread(redis_client.get, "quantforge:ping")
             status["redis"] = "✅ Connected" if val == "1" else "⚠️ Read/Write issue"
         else:
             status["redis"] = "❌ Not Connected"
@@ -83,16 +91,17 @@ async def check_dependencies():
 
     # --- PostgreSQL ---
     try:
-        with engine.connect() as conn:
-            result = conn.execute(sqlalchemy.text("SELECT NOW()")).fetchone()
-            status["postgres"] = f"✅ Connected — {result[0]}"
+        async with engine.connect() as conn:
+            result = (await conn.execute(sqlalchemy.text("SELECT NOW()"))).fetchone()
+        status["postgres"] = f"✅ Connected — {result[0]}"
     except Exception as e:
         status["postgres"] = f"❌ Error: {str(e)}"
 
     # --- MinIO ---
     try:
         bucket_name = settings.MINIO_BUCKET
-        if bucket_name in [b.name for b in minio_client.client.list_buckets()]:
+        buckets = await asyncio.to_thread(minio_client.client.list_buckets)
+        if bucket_name in [b.name for b in buckets]:
             status["minio"] = f"✅ Connected — bucket '{bucket_name}' found"
         else:
             status["minio"] = "⚠️ Connected but bucket missing"
@@ -105,18 +114,39 @@ async def check_dependencies():
     except Exception as e:
         status["weaviate"] = f"❌ Error: {str(e)}"
 
-    logger.info("Dependency check results: " + str(status))
-    return JSONResponse(status)
+    logger.info("Dependency check results: %s", status)
+    return status
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 QuantForge AI Engine starting...")
     
+    # Shared async HTTP client for outbound provider calls (keep-alive pool)
+    app.state.http = httpx.AsyncClient(
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=64)
+    )
+    
     # Start rate limiter
     limiter = get_rate_limiter()
     await limiter.start()
     logger.info("✅ Rate limiter started")
+    
+    # Live prices over one WebSocket instead of per-lookup REST calls
+    if settings.BINANCE_PRICE_STREAM_ENABLED:
+        market.binance.start_price_stream()
+    
+    # tiktoken may download/parse its BPE file: do it off the event loop, before the
+    # first token count needs it
+    await asyncio.to_thread(_get_encoding)
+    
+    # Load models now so the first user request doesn't pay load + warmup
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        embedder = await asyncio.to_thread(get_embedder)
+        await asyncio.to_thread(get_ai_engine)
+        await embedder.warmup()
+        await get_llm_client().warmup()
 
 # Shutdown event  
 @app.on_event("shutdown")
@@ -127,3 +157,30 @@ async def shutdown_event():
     limiter = get_rate_limiter()
     await limiter.stop()
     logger.info("✅ Rate limiter stopped")
+    
+    # Close pooled LLM provider / embedder / feed connections
+    await close_llm_client()
+    await close_embedder()
+    await market.binance.aclose()
+    await feeds.rss_connector.aclose()
+    shutdown_parse_pool()
+    close_vector_store()
+    shutdown_vector_executor()
+    await app.state.http.aclose()
+    await close_engine()
+
+
+if __name__ == "__main__":
+    # Production entrypoint: C event loop + C HTTP parser (both ship with uvicorn[standard]).
+    # Each worker holds its own models, LLM cache and in-memory rate limiter, so
+    # raise WEB_CONCURRENCY only once rate limiting is moved to shared storage.
+    import uvicorn
+
+    uvicorn.run(
+        "backend.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WEB_CONCURRENCY,
+    )
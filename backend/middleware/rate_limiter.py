@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 import asyncio
 
 from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from backend.core.logging import get_logger
 from backend.core.config import settings
@@ -213,7 +213,7 @@ async def rate_limit_middleware(request: Request, call_next):
     )
     
     if not allowed:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content={
                 "error": "Rate limit exceeded",
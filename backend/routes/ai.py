@@ -3,14 +3,18 @@
 AI Analysis API Routes
 
 Main endpoint: POST /v1/ai/analyze
+Streaming:     POST /v1/ai/generate/stream (server-sent events)
 """
 
+import orjson
 from typing import Optional
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from backend.engine.ai_engine import get_ai_engine
+from backend.engine.llm.client import get_llm_client
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -44,6 +48,14 @@ class AnalyzeResponse(BaseModel):
     meta: dict
 
 
+class GenerateRequest(BaseModel):
+    """Request schema for raw streaming generation"""
+    prompt: str = Field(..., min_length=1, description="Prompt text")
+    system_message: Optional[str] = Field(None, description="Optional system instruction")
+    max_tokens: int = Field(default=500, ge=1, le=4096)
+    temperature: float = Field(default=0.7, ge=0.0, le=2.0)
+
+
 # === API Endpoints ===
 
 @router.post("/analyze", response_model=AnalyzeResponse)
@@ -115,6 +127,40 @@ async def analyze_asset(request: AnalyzeRequest):
         )
 
 
+@router.post("/generate/stream")
+async def generate_stream(body: GenerateRequest, request: Request):
+    """
+    Stream LLM output as server-sent events.
+    
+    Each event is `data: {"text": "<chunk>"}`; the stream ends with `data: [DONE]`.
+    Generation stops as soon as the client disconnects.
+    """
+    llm_client = get_llm_client()
+    
+    async def event_stream():
+        try:
+            async for chunk in llm_client.stream(
+                body.prompt,
+                max_tokens=body.max_tokens,
+                temperature=body.temperature,
+                system_message=body.system_message
+            ):
+                if await request.is_disconnected():
+                    logger.info("Client disconnected, aborting stream")
+                    return
+                yield f"data: {orjson.dumps({'text': chunk}).decode()}\n\n"
+        except Exception as e:
+            logger.error(f"Streaming generation failed: {e}")
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/status")
 async def ai_status():
     """
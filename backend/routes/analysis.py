@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, status, Query
 from pydantic import BaseModel, Field
 
-from backend.engine.memory.vector_store import QuantForgeVectorStore
+from backend.engine.memory.vector_store import get_vector_store
 from backend.engine.memory.timeseries_store import get_timeseries_store
 from backend.core.logging import get_logger
 
@@ -21,7 +21,7 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/v1/analysis", tags=["Analysis & Correlation"])
 
 # Singleton instances
-vector_store = QuantForgeVectorStore()
+vector_store = get_vector_store()
 timeseries = get_timeseries_store()
 
 
@@ -14,8 +14,8 @@ from pydantic import BaseModel, Field
 
 from backend.engine.feeds import RSSFeedConnector
 from backend.engine.parsers import TextPreprocessor
-from backend.engine.embeddings import HybridEmbedder
-from backend.engine.memory.vector_store import QuantForgeVectorStore
+from backend.engine.embeddings import get_embedder
+from backend.engine.memory.vector_store import get_vector_store
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -24,8 +24,8 @@ router = APIRouter(prefix="/v1/feeds", tags=["Data Feeds"])
 # Singleton instances
 rss_connector = RSSFeedConnector()
 preprocessor = TextPreprocessor()
-embedder = HybridEmbedder()
-vector_store = QuantForgeVectorStore()
+embedder = get_embedder()
+vector_store = get_vector_store()
 
 
 # === Pydantic Schemas ===
@@ -75,12 +75,16 @@ async def ingest_rss_feeds(request: RSSIngestRequest):
     try:
         # Step 1: Fetch from RSS feeds
         logger.info(f"Fetching from {len(request.feed_urls)} RSS feeds")
+        pending = {}
         raw_documents = await rss_connector.fetch(
             feed_urls=request.feed_urls,
-            max_articles=request.max_articles
+            max_articles=request.max_articles,
+            pending=pending
         )
         
         if not raw_documents:
+            # Nothing new to ingest: keep the feeds' validators for the next conditional GET
+            await rss_connector.commit([], pending)
             return RSSIngestResponse(
                 success=True,
                 fetched_count=0,
@@ -91,22 +95,25 @@ async def ingest_rss_feeds(request: RSSIngestRequest):
         
         logger.info(f"Fetched {len(raw_documents)} raw documents")
         
-        # Step 2: Preprocess documents
+        # Step 2: Preprocess documents (one batched scan; per document if the batch fails)
         processed_documents = []
         all_tickers = set()
         
-        for doc in raw_documents:
-            try:
-                processed_doc = preprocessor.process(doc)
-                processed_documents.append(processed_doc)
-                
-                # Collect tickers
-                if processed_doc.get("ticker"):
-                    all_tickers.add(processed_doc["ticker"])
-                    
-            except Exception as e:
-                logger.error(f"Failed to preprocess document: {e}")
-                continue
+        try:
+            processed_documents = preprocessor.process_batch(raw_documents)
+        except Exception as e:
+            logger.warning(f"Batch preprocessing failed, retrying per document: {e}")
+            for doc in raw_documents:
+                try:
+                    processed_documents.append(preprocessor.process(doc))
+                except Exception as e:
+                    logger.error(f"Failed to preprocess document: {e}")
+                    continue
+        
+        # Collect tickers
+        for processed_doc in processed_documents:
+            if processed_doc.get("ticker"):
+                all_tickers.add(processed_doc["ticker"])
         
         logger.info(f"Preprocessed {len(processed_documents)} documents, extracted {len(all_tickers)} tickers")
         
@@ -126,6 +133,13 @@ async def ingest_rss_feeds(request: RSSIngestRequest):
             upsert=True
         )
         
+        # Only now mark the articles as seen (and keep feed validators): a failed ingest
+        # must fetch them again on retry
+        if result["failed"] == 0:
+            await rss_connector.commit(processed_documents, pending)
+        else:
+            logger.warning(f"{result['failed']} documents failed to ingest; feeds will be re-read on the next poll")
+        
         return RSSIngestResponse(
             success=True,
             fetched_count=len(raw_documents),
@@ -8,6 +8,7 @@ Provides:
 - Price lookups
 """
 
+import asyncio
 from typing import List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, status, Query
@@ -95,27 +96,41 @@ async def sync_binance_data(request: BinanceSyncRequest):
             try:
                 logger.info(f"Syncing {symbol} - {request.days} days of {request.interval} data")
                 
-                # Fetch from Binance
-                data = await binance.fetch_ohlcv(
+                # Stream pages from Binance into TimescaleDB: each page is written
+                # while the next one is being fetched
+                fetched = 0
+                inserted = 0
+                pending = None
+                stream = binance.fetch_ohlcv_stream(
                     symbol=symbol,
                     interval=request.interval,
                     start_date=datetime.utcnow() - timedelta(days=request.days),
                     end_date=datetime.utcnow()
                 )
+                try:
+                    async for batch in stream:
+                        fetched += len(batch)
+                        if pending is not None:
+                            inserted += await pending
+                        pending = asyncio.create_task(
+                            timeseries.insert_ohlcv(symbol=symbol, data=batch, source="binance")
+                        )
+                    if pending is not None:
+                        inserted += await pending
+                        pending = None
+                finally:
+                    # A fetch or insert failed: let the in-flight insert settle instead of
+                    # orphaning it, and close the stream so no further pages are requested
+                    if pending is not None:
+                        await asyncio.gather(pending, return_exceptions=True)
+                    await stream.aclose()
                 
-                if not data:
+                if not fetched:
                     logger.warning(f"No data fetched for {symbol}")
                     failed_symbols.append(symbol)
                     errors.append(f"{symbol}: No data returned from Binance")
                     continue
                 
-                # Store in TimescaleDB
-                inserted = await timeseries.insert_ohlcv(
-                    symbol=symbol,
-                    data=data,
-                    source="binance"
-                )
-                
                 total_records += inserted
                 synced_symbols += 1
                 
@@ -6,7 +6,7 @@ from fastapi import APIRouter
 from backend.db.session import get_engine
 from backend.utils.cache import RedisClient
 from backend.utils.minio_client import MinioClient
-from backend.engine.memory.vector_store import QuantForgeVectorStore
+from backend.engine.memory.vector_store import get_vector_store
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,9 +26,8 @@ async def health_dependencies():
 	
 	async def check_postgres():
 		try:
-			engine = get_engine()
-			with engine.connect() as conn:
-				conn.execute(sqlalchemy.text("SELECT 1"))
+			async with get_engine().connect() as conn:
+				await conn.execute(sqlalchemy.text("SELECT 1"))
 			results["postgres"] = {"status": "✅ healthy"}
 		except Exception as e:
 			results["postgres"] = {"status": "❌ down", "error": str(e)}
@@ -52,12 +51,11 @@ async def health_dependencies():
 			
 	async def check_weaviate():
 		try:
-			weaviate_client = QuantForgeVectorStore()
-			if weaviate_client.client and weaviate_client.client.is_ready():
+			# Probe the shared connection instead of opening (and closing) a new one
+			if await asyncio.to_thread(get_vector_store().check_health):
 				results["weaviate"] = {"status": "✅ healthy"}
 			else:
 				results["weaviate"] = {"status": "❌ down"}
-			weaviate_client.client.close()
 		except Exception as e:
 			results["weaviate"] = {"status": "❌ down", "error": str(e)}
 			
@@ -6,16 +6,16 @@ from backend.db.schemas import (
     VectorIngestRequest, VectorIngestResponse,
     VectorSearchRequest, VectorSearchResponse, VectorSearchResult
 )
-from backend.engine.memory.vector_store import QuantForgeVectorStore
+from backend.engine.memory.vector_store import get_vector_store
 from backend.core.logging import get_logger
-from backend.engine.embeddings import HybridEmbedder
+from backend.engine.embeddings import get_embedder
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/v1/vector", tags=["Vector Store"])
 
 # Singleton instances
-vector_store = QuantForgeVectorStore()
-embedder = HybridEmbedder()
+vector_store = get_vector_store()
+embedder = get_embedder()
 
 @router.post("/ingest", response_model=VectorIngestResponse, status_code=status.HTTP_201_CREATED)
 async def ingest_vectors(request: VectorIngestRequest):
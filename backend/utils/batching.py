@@ -0,0 +1,219 @@
+# backend/utils/batching.py
+"""
+Micro-batching utilities.
+
+Coalesces concurrent single-item requests into one batched call so
+batch-friendly backends (local models, list-accepting APIs, Redis
+pipelines) run at their batched throughput instead of one row at a time.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MicroBatcher:
+    """
+    Dynamic batching queue.
+
+    Callers `await submit(item)`; a single background consumer collects up to
+    `max_batch` items (or whatever arrived within `max_wait_ms` of the first
+    one), calls `batch_fn(items)` once and resolves each caller's future with
+    its slice of the result. Having one consumer also serializes access to
+    backends that are not safe to call concurrently.
+
+    Example:
+        ```python
+        batcher = MicroBatcher(embed_many, max_batch=16, max_wait_ms=20)
+        vector = await batcher.submit("AAPL news")
+        ```
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 16,
+        max_wait_ms: float = 20.0,
+        name: str = "batcher"
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background consumer."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+
+            try:
+                results = await self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                logger.warning(f"{self.name}: batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def _mark_retrieved(future: asyncio.Future):
+    # Fire-and-forget writes may never be awaited; don't warn about their errors
+    if not future.cancelled():
+        future.exception()
+
+
+class BatchedWriter:
+    """
+    Coalesces Redis write commands into non-transactional pipelines.
+
+    Commands are buffered and flushed every `flush_ms` or as soon as
+    `max_ops` are queued, turning N round trips into one. A flush holding
+    a single command skips the pipeline and issues it directly.
+
+    Works with both `redis.Redis` (executed in a worker thread) and
+    `redis.asyncio.Redis` clients.
+
+    Example:
+        ```python
+        writer = BatchedWriter(client)
+        writer.enqueue("hset", key, mapping={"response": payload})
+        writer.enqueue("expire", key, 3600)
+        await writer.write("publish", channel, message)
+        ```
+    """
+
+    def __init__(
+        self,
+        client,
+        flush_ms: float = 5.0,
+        max_ops: int = 128,
+        name: str = "redis-writer"
+    ):
+        self.client = client
+        self.flush_interval = flush_ms / 1000
+        self.max_ops = max_ops
+        self.name = name
+
+        self._is_async = isinstance(client, aioredis.Redis)
+        self._buffer: List[Tuple[str, tuple, dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    def enqueue(self, cmd: str, *args, **kwargs) -> asyncio.Future:
+        """Buffer one command; returns a future for its reply."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_mark_retrieved)
+        self._buffer.append((cmd, args, kwargs, future))
+
+        if len(self._buffer) >= self.max_ops:
+            self._start_flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush, loop)
+
+        return future
+
+    async def write(self, cmd: str, *args, **kwargs) -> Any:
+        """Buffer one command and wait for its reply."""
+        return await self.enqueue(cmd, *args, **kwargs)
+
+    async def flush(self):
+        """Send everything buffered now and wait for in-flight pipelines."""
+        self._start_flush(asyncio.get_running_loop())
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _start_flush(self, loop: asyncio.AbstractEventLoop):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        ops, self._buffer = self._buffer, []
+        if not ops:
+            return
+
+        task = loop.create_task(self._execute(ops))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _execute(self, ops: List[Tuple[str, tuple, dict, asyncio.Future]]):
+        try:
+            if len(ops) == 1:
+                cmd, args, kwargs, _ = ops[0]
+                results = [await self._call(getattr(self.client, cmd), *args, **kwargs)]
+            else:
+                pipe = self.client.pipeline(transaction=False)
+                for cmd, args, kwargs, _ in ops:
+                    getattr(pipe, cmd)(*args, **kwargs)
+                results = await self._call(pipe.execute)
+        except Exception as e:
+            logger.warning(f"{self.name}: flush of {len(ops)} commands failed: {e}")
+            for *_, future in ops:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), result in zip(ops, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _call(self, fn, *args, **kwargs):
+        if self._is_async:
+            return await fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
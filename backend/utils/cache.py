@@ -36,7 +36,7 @@ class RedisClient:
 
         try:
             self.client.set(name=key, value=value, ex=ex)
-            logger.debug(f"🧩 Redis SET: {key} -> {value}")
+            logger.debug("🧩 Redis SET: %s -> %s", key, value)
         except Exception as e:
             logger.error(f"Redis SET failed for {key}: {e}")
 
@@ -50,7 +50,7 @@ class RedisClient:
 
         try:
             value = self.client.get(name=key)
-            logger.debug(f"📥 Redis GET: {key} -> {value}")
+            logger.debug("📥 Redis GET: %s -> %s", key, value)
             return value
         except Exception as e:
             logger.error(f"Redis GET failed for {key}: {e}")
@@ -66,6 +66,6 @@ class RedisClient:
 
         try:
             self.client.publish(channel, message)
-            logger.info(f"📢 Published to channel '{channel}': {message}")
+            logger.debug("📢 Published to channel '%s': %s", channel, message)
         except Exception as e:
             logger.error(f"Redis publish failed: {e}")
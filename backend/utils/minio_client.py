@@ -2,12 +2,9 @@ import os
 import io
 from minio import Minio
 from minio.error import S3Error
-from dotenv import load_dotenv
 from backend.core.logging import get_logger
 from backend.core.config import settings
 
-# Load environment variables
-load_dotenv()
 logger = get_logger(__name__)
 
 
@@ -116,7 +113,7 @@ class MinioClient:
             data = response.read()
             response.close()
             response.release_conn()
-            logger.debug(f"📦 Retrieved object bytes: {bucket}/{object_name}")
+            logger.debug("📦 Retrieved object bytes: %s/%s", bucket, object_name)
             return data
         except Exception as e:
             logger.error(f"❌ Failed to retrieve object {object_name}: {e}")
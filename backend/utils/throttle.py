@@ -0,0 +1,55 @@
+# backend/utils/throttle.py
+"""
+Client-side request throttling.
+
+Keeps outbound calls within an upstream rate limit without serializing
+them: concurrent tasks draw from a shared token bucket and only wait
+when the bucket is empty.
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per `period` seconds.
+
+    Bursts of up to `rate` requests go out immediately; beyond that,
+    callers wait (in arrival order) for the bucket to refill.
+
+    Example:
+        ```python
+        limiter = AsyncTokenBucket(1200, 60)  # 1200 requests/minute
+        async with limiter:
+            response = await client.get(url)
+        ```
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.capacity = rate
+        self._refill_per_sec = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available, then take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self._refill_per_sec
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._refill_per_sec)
+
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
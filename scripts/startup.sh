@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+# Start the QuantForge API with uvloop + httptools (see backend/main.py __main__).
+# Override HOST / PORT / WEB_CONCURRENCY via the environment or .env.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+exec python -m backend.main
@@ -0,0 +1,129 @@
+# tests/unit/test_batching.py
+"""
+Unit tests for MicroBatcher and BatchedWriter
+"""
+
+import asyncio
+import pytest
+
+from backend.utils.batching import BatchedWriter, MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test suite for MicroBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_are_coalesced(self):
+        calls = []
+
+        async def double(items):
+            calls.append(list(items))
+            return [i * 2 for i in items]
+
+        batcher = MicroBatcher(double, max_batch=16, max_wait_ms=20)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+        assert results == [0, 2, 4, 6, 8]
+        assert len(calls) == 1
+        assert calls[0] == [0, 1, 2, 3, 4]
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_max_batch_splits_calls(self):
+        calls = []
+
+        async def identity(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(identity, max_batch=2, max_wait_ms=20)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+        assert results == [0, 1, 2, 3, 4]
+        assert calls == [2, 2, 1]
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_batch_error_propagates_to_all_callers(self):
+        async def fail(items):
+            raise ValueError("backend down")
+
+        batcher = MicroBatcher(fail, max_wait_ms=5)
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+        # Consumer keeps running after a failed batch
+        batcher.batch_fn = lambda items: asyncio.sleep(0, result=items)
+        assert await batcher.submit("c") == "c"
+        await batcher.stop()
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, cmd):
+        return lambda *args, **kwargs: self.ops.append(cmd)
+
+    def execute(self):
+        self.client.pipelines.append(list(self.ops))
+        return [f"{cmd}-ok" for cmd in self.ops]
+
+
+class FakeRedis:
+    """Sync client stand-in recording direct calls and pipelines."""
+
+    def __init__(self):
+        self.direct = []
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self)
+
+    def publish(self, channel, message):
+        self.direct.append(("publish", channel))
+        return 1
+
+
+class TestBatchedWriter:
+    """Test suite for BatchedWriter"""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_pipelined(self):
+        client = FakeRedis()
+        writer = BatchedWriter(client, flush_ms=5)
+
+        results = await asyncio.gather(
+            writer.write("hset", "k", mapping={"a": 1}),
+            writer.write("expire", "k", 60),
+            writer.write("publish", "ch", "msg"),
+        )
+
+        assert results == ["hset-ok", "expire-ok", "publish-ok"]
+        assert client.pipelines == [["hset", "expire", "publish"]]
+        assert client.direct == []
+
+    @pytest.mark.asyncio
+    async def test_single_write_skips_pipeline(self):
+        client = FakeRedis()
+        writer = BatchedWriter(client, flush_ms=1)
+
+        assert await writer.write("publish", "ch", "msg") == 1
+        assert client.direct == [("publish", "ch")]
+        assert client.pipelines == []
+
+    @pytest.mark.asyncio
+    async def test_max_ops_flushes_early(self):
+        client = FakeRedis()
+        writer = BatchedWriter(client, flush_ms=10_000, max_ops=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(writer.write("set", "a", 1), writer.write("set", "b", 2)),
+            timeout=1
+        )
+        assert client.pipelines == [["set", "set"]]
@@ -0,0 +1,112 @@
+# tests/unit/test_binance_connector.py
+"""
+Unit tests for BinanceConnector kline parsing
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from backend.engine.feeds.binance_connector import BinanceConnector, OHLCVColumns
+
+KLINES = [
+    [1499040000000, "0.0163", "0.8000", "0.0157", "0.0158", "148976.11", 1499043599999, "2434.19", 308, "1756.87", "28.46", "0"],
+    [1499043600000, "0.0158", "0.0170", "0.0150", "0.0165", "1000.5", 1499047199999, "16.50", 12, "1.0", "0.1", "0"],
+]
+
+
+class TestKlineParsing:
+    """Test suite for columnar kline parsing"""
+
+    @pytest.fixture
+    def connector(self):
+        return BinanceConnector()
+
+    def test_parse_klines_to_columns(self, connector):
+        data = connector._parse_klines(KLINES)
+
+        assert len(data) == 2
+        assert data["close"].dtype == np.float64
+        np.testing.assert_array_equal(data["high"], [0.8, 0.017])
+        assert data["num_trades"].tolist() == [308, 12]
+        assert data[0]["timestamp"] == datetime(2017, 7, 3, 0, 0)
+
+    def test_concat_and_empty(self, connector):
+        page = connector._parse_klines(KLINES)
+        merged = OHLCVColumns.concat([page, connector._parse_klines(KLINES[:1])])
+
+        assert len(merged) == 3
+        assert len(connector._parse_klines([])) == 0
+        assert not OHLCVColumns.concat([])
+
+
+class TestOHLCVStream:
+    """Test suite for paginated streaming"""
+
+    @pytest.fixture
+    def connector(self):
+        return BinanceConnector()
+
+    @pytest.mark.asyncio
+    async def test_serial_pagination_follows_last_candle(self, connector):
+        connector.INTERVAL_MS = {}  # unknown candle length -> serial paging
+        pages = [connector._parse_klines(KLINES[:1]), connector._parse_klines(KLINES[1:]), OHLCVColumns.empty()]
+        connector._fetch_single_batch = AsyncMock(side_effect=pages)
+
+        batches = [
+            batch async for batch in connector.fetch_ohlcv_stream(
+                "BTCUSDT", "1h", datetime(2017, 7, 1), datetime(2017, 8, 1)
+            )
+        ]
+
+        assert [len(b) for b in batches] == [1, 1]
+        second_start = connector._fetch_single_batch.call_args_list[1].kwargs["start_ms"]
+        assert second_start == KLINES[0][0] + 1
+
+    @pytest.mark.asyncio
+    async def test_windows_fetched_concurrently_in_order(self, connector):
+        async def fetch(symbol, interval, start_ms, end_ms, limit):
+            assert end_ms - start_ms < limit * connector.INTERVAL_MS[interval]
+            return connector._parse_klines([[start_ms] + KLINES[0][1:]])
+
+        connector._fetch_single_batch = AsyncMock(side_effect=fetch)
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 11)
+
+        batches = [
+            batch async for batch in connector.fetch_ohlcv_stream("BTCUSDT", "1m", start, end, limit=1000)
+        ]
+
+        # 10 days of 1m candles = 14400 candles -> 15 pages of <= 1000
+        starts = [int(b.timestamps_ms[0]) for b in batches]
+        assert len(batches) == 15
+        assert starts == sorted(starts)
+        assert starts[1] - starts[0] == 1000 * 60_000
+
+
+class TestCurrentPrice:
+    """Test suite for cached ticker prices"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_request(self):
+        connector = BinanceConnector()
+        response = Mock(content=b'{"symbol":"BTCUSDT","price":"42000.5"}', raise_for_status=Mock())
+        get = AsyncMock(return_value=response)
+        connector._get_client = Mock(return_value=Mock(get=get))
+
+        prices = await asyncio.gather(*[connector.fetch_current_price("BTCUSDT") for _ in range(5)])
+        assert prices == [42000.5] * 5
+        assert await connector.fetch_current_price("BTCUSDT") == 42000.5
+        assert get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_price_skips_rest(self):
+        connector = BinanceConnector()
+        get = AsyncMock()
+        connector._get_client = Mock(return_value=Mock(get=get))
+
+        connector._apply_ticker_frame(b'[{"e":"24hrMiniTicker","s":"ETHUSDT","c":"2500.25"}]')
+
+        assert await connector.fetch_current_price("ETHUSDT") == 2500.25
+        get.assert_not_awaited()
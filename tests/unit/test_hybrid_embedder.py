@@ -0,0 +1,52 @@
+# tests/unit/test_hybrid_embedder.py
+"""
+Unit tests for HybridEmbedder caching
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+from backend.engine.embeddings.hybrid_embedder import HybridEmbedder
+
+
+@pytest.fixture
+def embedder():
+    embedder = HybridEmbedder()
+    embedder.backend = "ollama"
+    embedder._embed_ollama_batch = AsyncMock(
+        side_effect=lambda texts: np.array([[len(t), 0.5] for t in texts], dtype=np.float32)
+    )
+    embedder._embed_ollama = AsyncMock(return_value=np.array([1.0, 0.25], dtype=np.float32))
+    return embedder
+
+
+class TestEmbeddingCache:
+    """Test suite for the in-process embedding LRU"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_is_served_from_cache(self, embedder):
+        """A repeated query skips the backend"""
+        first = await embedder.embed_text("AAPL news stock market")
+        second = await embedder.embed_text("AAPL news stock market")
+
+        assert first.dtype == np.float32
+        np.testing.assert_array_equal(first, second)
+        assert embedder._embed_ollama.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_embeds_only_misses_in_order(self, embedder):
+        """Hits are stitched back in input order; only misses are embedded"""
+        await embedder.embed_texts(["a", "bb"])
+        result = await embedder.embed_texts(["ccc", "a", "ccc", "bb"])
+
+        assert result.shape == (4, 2)
+        np.testing.assert_array_equal(result[:, 0], [3.0, 1.0, 3.0, 2.0])
+        embedder._embed_ollama_batch.assert_awaited_with(["ccc"])
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest(self, embedder):
+        embedder._cache_size = 2
+        await embedder.embed_texts(["a", "bb", "ccc"])
+
+        assert len(embedder._cache) == 2
+        assert embedder._cache_get(embedder._cache_key("a")) is None
@@ -0,0 +1,153 @@
+# tests/unit/test_llm_cache.py
+"""
+Unit tests for LLMCache (exact + semantic response cache)
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from backend.engine.llm.cache import LLMCache, SemanticIndex
+
+
+class FakeEmbedder:
+    """Maps known prompts to fixed vectors."""
+
+    VECTORS = {
+        "What is AAPL sentiment?": [1.0, 0.0, 0.0],
+        "What's AAPL sentiment?": [0.99, 0.1, 0.0],
+        "Explain BTC volatility": [0.0, 1.0, 0.0],
+    }
+
+    async def embed_text(self, text):
+        return self.VECTORS.get(text, [0.0, 0.0, 1.0])
+
+
+@pytest.fixture
+def cache():
+    return LLMCache(
+        threshold=0.87,
+        ttl=60,
+        max_entries=2,
+        max_temperature=0.5,
+        embedder=FakeEmbedder(),
+        redis_client=Mock(client=None)
+    )
+
+
+class TestLLMCache:
+    """Test suite for LLMCache"""
+
+    @pytest.mark.asyncio
+    async def test_exact_hit(self, cache):
+        hit, probe = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.0)
+        assert hit is None
+        await cache.store(probe, {"text": "bullish", "provider": "ollama"})
+
+        hit, _ = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.0)
+        assert hit["text"] == "bullish"
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit(self, cache):
+        _, probe = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.0)
+        await cache.store(probe, {"text": "bullish", "provider": "ollama"})
+
+        hit, _ = await cache.lookup("What's AAPL sentiment?", "sys", 100, 0.0)
+        assert hit is not None
+        assert hit["text"] == "bullish"
+
+        miss, _ = await cache.lookup("Explain BTC volatility", "sys", 100, 0.0)
+        assert miss is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit_requires_zero_temperature(self, cache):
+        _, probe = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.3)
+        assert probe.vector is None
+        await cache.store(probe, {"text": "bullish"})
+
+        hit, _ = await cache.lookup("What's AAPL sentiment?", "sys", 100, 0.3)
+        assert hit is None
+        hit, _ = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.3)
+        assert hit["text"] == "bullish"
+
+    @pytest.mark.asyncio
+    async def test_namespace_isolation(self, cache):
+        """Different system message or params must not share entries."""
+        _, probe = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.0)
+        await cache.store(probe, {"text": "bullish"})
+
+        hit, _ = await cache.lookup("What is AAPL sentiment?", "other", 100, 0.0)
+        assert hit is None
+        hit, _ = await cache.lookup("What is AAPL sentiment?", "sys", 200, 0.0)
+        assert hit is None
+
+    @pytest.mark.asyncio
+    async def test_high_temperature_not_cached(self, cache):
+        hit, probe = await cache.lookup("What is AAPL sentiment?", "sys", 100, 0.9)
+        assert hit is None
+        assert probe is None
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        cache.threshold = 1.01  # exact matches only
+        for prompt in ["a", "b", "c"]:
+            _, probe = await cache.lookup(prompt, None, 10, 0.0)
+            await cache.store(probe, {"text": prompt})
+
+        hit, _ = await cache.lookup("a", None, 10, 0.0)
+        assert hit is None
+        hit, _ = await cache.lookup("c", None, 10, 0.0)
+        assert hit["text"] == "c"
+
+    @pytest.mark.asyncio
+    async def test_returned_copy_is_isolated(self, cache):
+        _, probe = await cache.lookup("What is AAPL sentiment?", None, 10, 0.0)
+        await cache.store(probe, {"text": "bullish"})
+
+        hit, _ = await cache.lookup("What is AAPL sentiment?", None, 10, 0.0)
+        hit["text"] = "mutated"
+
+        hit, _ = await cache.lookup("What is AAPL sentiment?", None, 10, 0.0)
+        assert hit["text"] == "bullish"
+
+
+class TestSemanticIndex:
+    """Test suite for SemanticIndex"""
+
+    @staticmethod
+    def _unit_rows(n, dim, seed=0):
+        rows = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+        return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+    def test_flat_search_and_compact(self):
+        index = SemanticIndex(ann_min_entries=10**9)
+        rows = self._unit_rows(100, 16)
+        for i, row in enumerate(rows):
+            index.add(f"k{i}", row)
+
+        key, score = index.search(rows[42])
+        assert key == "k42"
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+        index.compact({"k1", "k42"})
+        assert len(index) == 2
+        assert index.search(rows[1])[0] == "k1"
+
+    def test_ivfpq_search_rescores_exactly(self):
+        pytest.importorskip("faiss")
+        index = SemanticIndex(ann_min_entries=1000, nprobe=8)
+        rows = self._unit_rows(1200, 16)
+        for i, row in enumerate(rows[:1000]):
+            index.add(f"k{i}", row)
+
+        # Training runs in the background; rows added meanwhile are picked up on adopt
+        for i, row in enumerate(rows[1000:], start=1000):
+            index.add(f"k{i}", row)
+        index.wait_for_training(timeout=60)
+
+        assert index._ann is not None
+        assert index._ann.ntotal == 1200
+        for i in (3, 1150):
+            key, score = index.search(rows[i])
+            assert key == f"k{i}"
+            assert score == pytest.approx(1.0, abs=1e-5)
@@ -3,8 +3,11 @@
 Unit tests for LLM Client
 """
 
+import asyncio
+import orjson
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
+from backend.core.config import settings
 from backend.engine.llm.client import LLMClient, LLMProvider
 
 
@@ -41,6 +44,131 @@ class TestLLMClient:
         print(f"✅ Provider: {result['provider']}")
         print(f"✅ Model: {result['model']}")
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("payload,expected", [
+        ([{"generated_text": " bullish "}], "bullish"),
+        ({"generated_text": "bearish"}, "bearish"),
+    ])
+    async def test_huggingface_response_shapes(self, payload, expected):
+        """Both list and dict HF payloads are parsed"""
+        client = LLMClient()
+        response = Mock(content=orjson.dumps(payload), raise_for_status=Mock())
+        client._get_client = Mock(return_value=Mock(post=AsyncMock(return_value=response)))
+
+        result = await client._generate_huggingface("prompt", 10, 0.1, None)
+        assert result["text"] == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("payload", [{"error": "Model is loading"}, []])
+    async def test_huggingface_error_payload_raises(self, payload):
+        """Error/empty payloads raise so the fallback chain moves on"""
+        client = LLMClient()
+        response = Mock(content=orjson.dumps(payload), raise_for_status=Mock())
+        client._get_client = Mock(return_value=Mock(post=AsyncMock(return_value=response)))
+
+        with pytest.raises(ValueError):
+            await client._generate_huggingface("prompt", 10, 0.1, None)
+
+    @pytest.mark.asyncio
+    async def test_huggingface_concurrent_prompts_share_one_call(self):
+        """Same-parameter prompts are sent as one batched `inputs` list"""
+        client = LLMClient()
+        payload = [[{"generated_text": "up"}], [{"generated_text": "down"}]]
+        response = Mock(content=orjson.dumps(payload), raise_for_status=Mock())
+        post = AsyncMock(return_value=response)
+        client._get_client = Mock(return_value=Mock(post=post))
+
+        results = await asyncio.gather(
+            client._generate_huggingface("a", 10, 0.1, None),
+            client._generate_huggingface("b", 10, 0.1, None),
+        )
+
+        assert [r["text"] for r in results] == ["up", "down"]
+        assert post.await_count == 1
+        assert orjson.loads(post.call_args.kwargs["content"])["inputs"] == ["a", "b"]
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_keeps_order_and_errors(self):
+        """Batch results line up with prompts; failures don't sink the batch"""
+        client = LLMClient()
+
+        async def generate(prompt, *args):
+            if prompt == "bad":
+                raise RuntimeError("boom")
+            return {"text": prompt.upper()}
+
+        client.generate = generate
+        results = await client.generate_batch(["a", "bad", "c"])
+
+        assert results[0]["text"] == "A"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2]["text"] == "C"
+
+    @pytest.mark.asyncio
+    async def test_failing_provider_skipped_after_breaker_trips(self):
+        """A provider that keeps failing stops costing each request a call"""
+        client = LLMClient()
+        client.cache.enabled = False
+        client.providers = [LLMProvider.OPENAI, LLMProvider.OLLAMA]
+        failing = AsyncMock(side_effect=RuntimeError("down"))
+        client._generators[LLMProvider.OPENAI] = failing
+        client._generators[LLMProvider.OLLAMA] = AsyncMock(return_value={"text": "ok"})
+
+        for _ in range(settings.LLM_BREAKER_FAILURES + 2):
+            result = await client.generate("prompt", max_tokens=5)
+
+        assert result["provider"] == "ollama"
+        assert failing.await_count == settings.LLM_BREAKER_FAILURES
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_before_first_chunk(self):
+        """A provider that fails before emitting anything is skipped"""
+        client = LLMClient()
+        client.cache.enabled = False
+        client.providers = [LLMProvider.OPENAI, LLMProvider.OLLAMA]
+
+        async def broken(*args):
+            raise RuntimeError("unavailable")
+            yield  # pragma: no cover
+
+        async def tokens(*args):
+            for chunk in ["Bull", "ish"]:
+                yield chunk
+
+        client._streamers[LLMProvider.OPENAI] = broken
+        client._streamers[LLMProvider.OLLAMA] = tokens
+
+        chunks = [chunk async for chunk in client.stream("prompt", max_tokens=5)]
+        assert chunks == ["Bull", "ish"]
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_after_complete_answer_is_cached(self):
+        """Closing early caches what was streamed only once the caller marks it complete"""
+        client = LLMClient()
+        client.providers = [LLMProvider.OLLAMA]
+        client.cache.lookup = AsyncMock(return_value=(None, "probe"))
+        client.cache.store = AsyncMock()
+
+        async def tokens(*args):
+            for chunk in ['{"a": 1}', " trailing", " text"]:
+                yield chunk
+
+        client._streamers[LLMProvider.OLLAMA] = tokens
+
+        for complete in (False, True):
+            info = {}
+            stream = client.stream("prompt", max_tokens=5, info=info)
+            await stream.__anext__()
+            if complete:
+                info["complete"] = True
+            await stream.aclose()
+
+        client.cache.store.assert_awaited_once()
+        probe, response = client.cache.store.call_args.args
+        assert probe == "probe"
+        assert response["text"] == '{"a": 1}'
+
 
 if __name__ == "__main__":
     import asyncio
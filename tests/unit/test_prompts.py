@@ -0,0 +1,67 @@
+# tests/unit/test_prompts.py
+"""
+Unit tests for PromptManager
+"""
+
+import pytest
+
+from backend.engine.llm.prompts import PromptManager, PromptType
+
+
+@pytest.fixture
+def pm():
+    return PromptManager()
+
+
+class TestPromptManager:
+    """Test suite for PromptManager"""
+
+    def test_get_prompt_formats_template(self, pm):
+        prompt = pm.get_prompt(PromptType.SENTIMENT_ANALYSIS, ticker="AAPL", news_text="Apple beats")
+
+        assert "AAPL" in prompt["user"]
+        assert "Apple beats" in prompt["user"]
+        assert '"sentiment": "bullish/bearish/neutral"' in prompt["user"]
+        assert prompt["version"] == PromptManager.VERSION
+
+    def test_repeated_prompt_is_cached(self, pm):
+        first = pm.get_prompt(PromptType.SENTIMENT_ANALYSIS, ticker="AAPL", news_text="x")
+        first["user"] = "mutated"
+        second = pm.get_prompt(PromptType.SENTIMENT_ANALYSIS, news_text="x", ticker="AAPL")
+
+        assert pm._format_cached.cache_info().hits == 1
+        assert second["user"] != "mutated"
+
+    def test_unhashable_values_bypass_cache(self, pm):
+        prompt = pm.get_prompt(
+            PromptType.MARKET_SUMMARY, ticker="BTC", event_text="ETF approved", price_impact=["+5%"]
+        )
+
+        assert "['+5%']" in prompt["user"]
+        assert pm._format_cached.cache_info().currsize == 0
+
+    def test_missing_variable_raises(self, pm):
+        with pytest.raises(ValueError, match="Missing required template variable"):
+            pm.get_prompt(PromptType.SENTIMENT_ANALYSIS, ticker="AAPL")
+
+    def test_unknown_type_raises(self, pm):
+        with pytest.raises(ValueError, match="Unknown prompt type"):
+            pm.get_prompt("not_a_prompt", ticker="AAPL")
+
+    def test_compiled_parts_match_str_format(self, pm):
+        kwargs = dict(
+            ticker="ETH", start_date="2024-01-01", end_date="2024-01-31", open_price=1.5,
+            close_price=2, high_price=3, low_price=1, price_change=-4.2, news_summary="{braces}",
+        )
+
+        prompt = pm.get_prompt(PromptType.PRICE_EXPLANATION, **kwargs)
+
+        expected = pm.templates[PromptType.PRICE_EXPLANATION]["template"].format(**kwargs)
+        assert prompt["user"] == expected
+
+    def test_templates_built_on_first_use(self, pm):
+        assert pm.templates == {}
+
+        pm.get_prompt(PromptType.SENTIMENT_ANALYSIS, ticker="AAPL", news_text="x")
+
+        assert list(pm.templates) == [PromptType.SENTIMENT_ANALYSIS]
@@ -9,9 +9,12 @@ Tests:
 - Error handling
 """
 
+import httpx
 import pytest
 from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock
+from feedparser import FeedParserDict
+from backend.engine.feeds import rss_connector as rss_module
 from backend.engine.feeds.rss_connector import RSSFeedConnector
 
 
@@ -21,7 +24,7 @@ class TestRSSFeedConnector:
     @pytest.fixture
     def connector(self):
         """Create RSSFeedConnector instance for tests"""
-        return RSSFeedConnector()
+        return RSSFeedConnector(redis_client=Mock(client=None))
     
     # === Initialization Tests ===
     
@@ -81,8 +84,7 @@ class TestRSSFeedConnector:
     
     def test_parse_timestamp_published(self, connector):
         """Test parsing published_parsed field"""
-        entry = Mock()
-        entry.published_parsed = (2024, 11, 30, 12, 30, 0, 4, 335, 0)
+        entry = FeedParserDict(published_parsed=(2024, 11, 30, 12, 30, 0, 4, 335, 0))
         
         timestamp = connector._parse_timestamp(entry)
         assert isinstance(timestamp, datetime)
@@ -92,20 +94,14 @@ class TestRSSFeedConnector:
     
     def test_parse_timestamp_updated(self, connector):
         """Test parsing updated_parsed field"""
-        entry = Mock()
-        delattr(entry, 'published_parsed')  # Remove published
-        entry.updated_parsed = (2024, 11, 30, 14, 0, 0, 4, 335, 0)
+        entry = FeedParserDict(updated_parsed=(2024, 11, 30, 14, 0, 0, 4, 335, 0))  # No published
         
         timestamp = connector._parse_timestamp(entry)
         assert timestamp.year == 2024
     
     def test_parse_timestamp_fallback(self, connector):
         """Test fallback to current time"""
-        entry = Mock()
-        # Remove all date fields
-        for attr in ['published_parsed', 'updated_parsed', 'created_parsed']:
-            if hasattr(entry, attr):
-                delattr(entry, attr)
+        entry = FeedParserDict(title="No date fields")
         
         timestamp = connector._parse_timestamp(entry)
         assert isinstance(timestamp, datetime)
@@ -175,6 +171,148 @@ class TestRSSFeedConnector:
                 
                 # Should only return 5 articles
                 assert len(documents) <= 5
+    
+    @pytest.mark.asyncio
+    async def test_max_articles_split_across_feeds(self, connector):
+        """Each feed is asked for its share of max_articles"""
+        fetch_one = AsyncMock(return_value=[{"test": "doc"}] * 2)
+        with patch.object(connector, "_fetch_single_feed", fetch_one):
+            documents = await connector.fetch(feed_urls=["https://a/feed", "https://b/feed"], max_articles=3)
+
+        assert [c.kwargs["limit"] for c in fetch_one.call_args_list] == [2, 2]
+        assert len(documents) == 3
+
+
+class TestFeedParsing:
+    """Test suite for feed parsing off the event loop"""
+
+    def test_parse_feed_result_is_picklable(self):
+        """Malformed feeds still come back across the process boundary"""
+        import pickle
+
+        feed = rss_module._parse_feed("<rss><channel><item><title>a</title></item><bad")
+
+        restored = pickle.loads(pickle.dumps(feed))
+        assert restored.bozo
+        assert isinstance(restored.bozo_exception, str)
+        assert restored.entries[0].title == "a"
+
+    @pytest.mark.asyncio
+    async def test_large_feed_parsed_in_pool(self):
+        """Feeds above the size threshold go to the parse pool"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        connector = RSSFeedConnector(redis_client=Mock(client=None))
+        item = "<item><title>t</title><description>{}</description></item>".format("x" * 1024)
+        body = "<rss><channel>" + item * 80 + "</channel></rss>"
+        response = Mock(text=body, status_code=200, headers={}, raise_for_status=Mock())
+        connector._get_client = Mock(return_value=Mock(get=AsyncMock(return_value=response)))
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with patch.object(rss_module, "_get_parse_pool", return_value=pool) as get_pool:
+                documents = await connector._fetch_single_feed("https://example.com/feed")
+
+        assert get_pool.called
+        assert len(documents) == 80
+
+
+
+class TestConditionalGet:
+    """Test suite for ETag / Last-Modified handling and seen-entry tracking"""
+
+    @staticmethod
+    def _connector(handler):
+        connector = RSSFeedConnector(redis_client=Mock(client=None))
+        connector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return connector
+
+    @pytest.mark.asyncio
+    async def test_validators_sent_and_304_skips_parsing(self):
+        body = "<rss><channel><item><title>a</title></item></channel></rss>"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200, text=body,
+                headers={"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+            )
+
+        connector = self._connector(handler)
+        pending = {}
+        documents = await connector.fetch(["https://example.com/feed"], pending=pending)
+        assert len(documents) == 1
+        await connector.commit(documents, pending)
+
+        with patch("feedparser.parse") as parse:
+            assert await connector.fetch(["https://example.com/feed"]) == []
+        parse.assert_not_called()
+        assert requests[-1].headers["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_validators_not_saved_until_commit(self):
+        body = "<rss><channel><item><title>a</title></item></channel></rss>"
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text=body, headers={"etag": '"v1"'})
+
+        connector = self._connector(handler)
+        await connector.fetch(["https://example.com/feed"])
+
+        # Ingest failed (no commit): the retry is a full fetch that returns the entry again
+        assert len(await connector.fetch(["https://example.com/feed"])) == 1
+        assert "if-none-match" not in requests[-1].headers
+
+    @pytest.mark.asyncio
+    async def test_overlapping_fetches_commit_only_their_own_state(self):
+        item = "<item><title>{0}</title><link>https://example.com/{0}</link></item>"
+        responses = iter([
+            httpx.Response(200, text="<rss><channel>" + item.format("a") + "</channel></rss>",
+                           headers={"etag": '"v1"'}),
+            httpx.Response(200, text="<rss><channel>" + item.format("b") + item.format("a") + "</channel></rss>",
+                           headers={"etag": '"v2"'}),
+        ])
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return next(responses, None) or httpx.Response(304)
+
+        connector = self._connector(handler)
+        url = "https://example.com/feed"
+        first_pending, second_pending = {}, {}
+        first = await connector.fetch([url], pending=first_pending)
+        second = await connector.fetch([url], pending=second_pending)
+        assert [d["title"] for d in second] == ["b", "a"]
+
+        # Only the first request ingested: "b" and the second fetch's ETag stay uncommitted
+        await connector.commit(first, first_pending)
+
+        assert [d["title"] for d in await connector.fetch([url])] == []
+        assert requests[-1].headers["if-none-match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_seen_entries_skipped_after_commit(self):
+        item = "<item><title>{0}</title><link>https://example.com/{0}</link></item>"
+        bodies = iter([
+            "<rss><channel>" + item.format("a") + "</channel></rss>",
+            "<rss><channel>" + item.format("b") + item.format("a") + "</channel></rss>",
+            "<rss><channel>" + item.format("b") + item.format("a") + "</channel></rss>",
+        ])
+        connector = self._connector(lambda request: httpx.Response(200, text=next(bodies)))
+        url = "https://example.com/feed"
+
+        first = await connector.fetch([url])
+        assert [d["title"] for d in first] == ["a"]
+        await connector.commit(first)
+
+        assert [d["title"] for d in await connector.fetch([url])] == ["b"]
+        # "b" was never committed, so it comes back
+        assert [d["title"] for d in await connector.fetch([url])] == ["b"]
 
 
 if __name__ == "__main__":
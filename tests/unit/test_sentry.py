@@ -0,0 +1,51 @@
+# tests/unit/test_sentry.py
+"""
+Unit tests for Sentry transaction sampling
+"""
+
+import asyncio
+import threading
+
+import pytest
+from backend.core.config import settings
+from backend.core.sentry import _capture_tasks, _submit, _traces_sampler
+
+
+class TestTracesSampler:
+    """Test suite for the Sentry traces sampler"""
+
+    @pytest.mark.parametrize("path", ["/v1/health", "/docs", "/openapi.json"])
+    def test_probe_paths_are_dropped(self, path):
+        """Health/docs probes never become transactions"""
+        assert _traces_sampler({"asgi_scope": {"path": path}, "parent_sampled": True}) == 0.0
+
+    def test_parent_decision_is_inherited(self):
+        """Continued traces keep the upstream sampling decision"""
+        ctx = {"asgi_scope": {"path": "/v1/ai/analyze"}}
+        assert _traces_sampler({**ctx, "parent_sampled": True}) == 1.0
+        assert _traces_sampler({**ctx, "parent_sampled": False}) == 0.0
+
+    def test_default_rate(self):
+        """Other requests use the configured base rate"""
+        ctx = {"asgi_scope": {"path": "/v1/ai/analyze"}}
+        assert _traces_sampler(ctx) == settings.SENTRY_TRACES_SAMPLE_RATE
+
+
+class TestCaptureOffload:
+    """Test suite for running Sentry captures off the request path"""
+
+    @pytest.mark.asyncio
+    async def test_capture_runs_in_worker_thread(self):
+        """Captures are scheduled, not run on the event loop thread"""
+        ran_on = []
+        _submit(lambda: ran_on.append(threading.current_thread()))
+
+        assert ran_on == []  # returned before the capture ran
+        await asyncio.gather(*_capture_tasks)
+        assert ran_on and ran_on[0] is not threading.main_thread()
+
+    def test_capture_runs_inline_without_loop(self):
+        """Sync callers (scripts) still capture"""
+        ran = []
+        _submit(lambda: ran.append(True))
+        assert ran == [True]
@@ -104,6 +104,22 @@ class TestTextPreprocessor:
         category = preprocessor.classify_category(text)
         assert category == "general"
     
+    def test_keyword_automaton_matches_substring_scan(self, preprocessor, monkeypatch):
+        """Aho-Corasick keyword matching agrees with the plain substring loops"""
+        if preprocessor._company_automaton is None:
+            pytest.skip("pyahocorasick not installed")
+        texts = [
+            "Apple and Microsoft beat quarterly revenue; SEC opens Bitcoin probe",
+            "ETH ethereum blockchain defi fine",
+            "Tesla stock trading on wall street after takeover talk",
+        ]
+        expected = [(sorted(preprocessor.extract_tickers(t)), preprocessor.classify_category(t)) for t in texts]
+        
+        monkeypatch.setattr(preprocessor, "_company_automaton", None)
+        monkeypatch.setattr(preprocessor, "_category_automaton", None)
+        
+        assert [(sorted(preprocessor.extract_tickers(t)), preprocessor.classify_category(t)) for t in texts] == expected
+    
     # === Text Cleaning Tests ===
     
     def test_clean_extra_whitespace(self, preprocessor):
@@ -157,6 +173,34 @@ class TestTextPreprocessor:
     
     # === Full Process Test ===
     
+    def test_process_reuses_cached_result(self, preprocessor, monkeypatch):
+        """Re-processing the same title/content skips extraction"""
+        first = preprocessor.process({"title": "Tesla rallies", "content": "TSLA up  on earnings"})
+        monkeypatch.setattr(preprocessor, "extract_tickers", lambda *a, **kw: pytest.fail("not cached"))
+        
+        second = preprocessor.process({"title": "Tesla rallies", "content": "TSLA up  on earnings"})
+        
+        assert second == first
+        assert second["metadata"]["tickers"] is not first["metadata"]["tickers"]
+    
+    def test_process_batch_matches_process(self, preprocessor):
+        """Batch scan assigns every hit to the right document"""
+        docs = [
+            {"title": "Tesla rallies", "content": "TSLA and $NVDA up on quarterly earnings"},
+            {"title": "Crypto", "content": "BTC-USD and ethereum blockchain news"},
+            {"title": "", "content": "Microsoft acquisition deal; SEC fine"},
+            {"title": "Tesla rallies", "content": "TSLA and $NVDA up on quarterly earnings"},
+            {"title": "Quiet day", "content": "Nothing here"},
+        ]
+        expected = [TextPreprocessor().process(dict(doc)) for doc in docs]
+        
+        results = preprocessor.process_batch([dict(doc) for doc in docs])
+        
+        for got, want in zip(results, expected):
+            assert sorted(got["metadata"]["tickers"]) == sorted(want["metadata"]["tickers"])
+            assert (got["category"], got["content"]) == (want["category"], want["content"])
+            assert got["metadata"]["content_hash"] == want["metadata"]["content_hash"]
+    
     def test_process_full_document(self, preprocessor):
         """Test full document processing pipeline"""
         document = {
@@ -180,7 +224,7 @@ class TestTextPreprocessor:
         
         # Check hash generation
         assert "content_hash" in processed["metadata"]
-        assert len(processed["metadata"]["content_hash"]) == 32  # MD5 hash length
+        assert len(processed["metadata"]["content_hash"]) == 32  # 128-bit hex digest
 
 
 # === Parametrized Tests ===
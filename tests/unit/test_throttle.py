@@ -0,0 +1,35 @@
+# tests/unit/test_throttle.py
+"""
+Unit tests for AsyncTokenBucket
+"""
+
+import asyncio
+import time
+
+import pytest
+from backend.utils.throttle import AsyncTokenBucket
+
+
+class TestAsyncTokenBucket:
+    """Test suite for the token bucket limiter"""
+
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity_does_not_wait(self):
+        limiter = AsyncTokenBucket(5, 60)
+        start = time.monotonic()
+
+        await asyncio.gather(*[limiter.acquire() for _ in range(5)])
+
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill_when_empty(self):
+        limiter = AsyncTokenBucket(10, 0.5)  # one token every 50ms
+        for _ in range(10):
+            await limiter.acquire()
+
+        start = time.monotonic()
+        async with limiter:
+            pass
+
+        assert time.monotonic() - start >= 0.04
@@ -0,0 +1,167 @@
+# tests/unit/test_timeseries_store.py
+"""
+Unit tests for TimeseriesStore bulk ingest (no database required)
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from backend.engine.feeds.binance_connector import BinanceConnector
+from backend.engine.memory import timeseries_store
+from backend.engine.memory.timeseries_store import OHLCV_COLUMNS, TimeseriesStore
+
+KLINES = [
+    [1499040000000 + i * 3_600_000, "1.0", "2.0", "0.5", "1.5", "10.0", 0, "0", 7, "0", "0", "0"]
+    for i in range(3)
+]
+
+
+def _fake_conn(status: str = "INSERT 0 3"):
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=lambda query: (
+        "CREATE TABLE" if "CREATE TEMP" in query else "CALL" if "CALL" in query else status
+    ))
+    conn.copy_records_to_table = AsyncMock()
+    conn.transaction = MagicMock(return_value=MagicMock(
+        __aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False)
+    ))
+    return conn
+
+
+def _fake_pool(conn):
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    return MagicMock(acquire=acquire)
+
+
+class TestInsertOHLCV:
+    """Test suite for COPY-based OHLCV ingest"""
+
+    @pytest.mark.asyncio
+    async def test_copies_rows_through_staging_table(self):
+        conn = _fake_conn()
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+        data = BinanceConnector()._parse_klines(KLINES)
+
+        inserted = await store.insert_ohlcv("BTCUSDT", data)
+
+        assert inserted == 3
+        kwargs = conn.copy_records_to_table.call_args.kwargs
+        assert kwargs["columns"] == OHLCV_COLUMNS
+        first = kwargs["records"][0]
+        assert first[0].tzinfo == timezone.utc
+        assert first[1:] == ("BTCUSDT", 1.0, 2.0, 0.5, 1.5, 10.0, 7, "binance")
+        assert "ON CONFLICT (symbol, time) DO NOTHING" in conn.execute.call_args_list[1].args[0]
+
+    @pytest.mark.asyncio
+    async def test_inserted_range_refreshes_continuous_aggregates(self):
+        conn = _fake_conn()
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+        data = BinanceConnector()._parse_klines(KLINES)
+
+        await store.insert_ohlcv("BTCUSDT", data)
+
+        calls = [c.args[0] for c in conn.execute.call_args_list if "CALL" in c.args[0]]
+        assert len(calls) == len(timeseries_store._CONTINUOUS_AGGREGATES)
+        assert "'market_data_1h'" in calls[1]
+        assert "TIMESTAMPTZ '2017-07-03T00:00:00+00:00'" in calls[1]
+        assert "TIMESTAMPTZ '2017-07-03T02:00:00+00:00'" in calls[1]
+
+    @pytest.mark.asyncio
+    async def test_no_refresh_when_nothing_inserted(self):
+        conn = _fake_conn("INSERT 0 0")
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+
+        await store.insert_ohlcv("BTCUSDT", BinanceConnector()._parse_klines(KLINES))
+
+        assert not any("CALL" in c.args[0] for c in conn.execute.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self):
+        store = TimeseriesStore()
+        store.pool = MagicMock()
+
+        assert await store.insert_ohlcv("BTCUSDT", BinanceConnector()._parse_klines([])) == 0
+        store.pool.acquire.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_timestamps_dropped_before_copy(self):
+        conn = _fake_conn("INSERT 0 2")
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+        data = BinanceConnector()._parse_klines([KLINES[1], KLINES[0], KLINES[1]])
+
+        await store.insert_ohlcv("BTCUSDT", data)
+
+        records = conn.copy_records_to_table.call_args.kwargs["records"]
+        assert [r[0] for r in records] == sorted({r[0] for r in records})
+        assert len(records) == 2
+
+    @pytest.mark.asyncio
+    async def test_large_batch_split_across_connections(self, monkeypatch):
+        monkeypatch.setattr(timeseries_store, "COPY_SHARD_ROWS", 2)
+        conns = []
+
+        @asynccontextmanager
+        async def acquire():
+            conn = _fake_conn("INSERT 0 1")
+            conns.append(conn)
+            yield conn
+
+        store = TimeseriesStore()
+        store.pool = MagicMock(acquire=acquire)
+        data = BinanceConnector()._parse_klines(KLINES)
+
+        # 3 rows at 2 rows/shard -> 2 shards: [0, 1] and [2]
+        assert await store.insert_ohlcv("BTCUSDT", data) == 2
+        sizes = [
+            len(c.copy_records_to_table.call_args.kwargs["records"])
+            for c in conns if c.copy_records_to_table.called
+        ]
+        assert sizes == [2, 1]
+
+
+class TestColumnarRead:
+    """Test suite for columnar OHLCV reads"""
+
+    @pytest.mark.asyncio
+    async def test_rows_become_column_arrays(self):
+        t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            (t0, "BTCUSDT", Decimal("1.5"), 2.0, 1.0, 1.75, 10),
+            (t0.replace(hour=1), "BTCUSDT", 1.75, 3.0, 1.5, 2.5, 20),
+        ]
+        conn = MagicMock(fetch=AsyncMock(return_value=rows))
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+
+        columns = await store.get_ohlcv_columnar("BTCUSDT", t0, t0.replace(hour=2))
+
+        assert columns["open"].tolist() == [1.5, 1.75]
+        assert columns["volume"].dtype == np.float64
+        assert str(columns["timestamp"][1]) == "2024-01-01T01:00:00.000000"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("interval,source", [
+        ("1 hour", "FROM market_data_1h"),
+        ("1D", "FROM market_data_1d"),
+        ("15 minutes", "time_bucket($1, time)"),
+    ])
+    async def test_interval_routed_to_continuous_aggregate(self, interval, source):
+        conn = MagicMock(fetch=AsyncMock(return_value=[]))
+        store = TimeseriesStore()
+        store.pool = _fake_pool(conn)
+        t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        await store.get_ohlcv("BTCUSDT", t0, t0.replace(day=2), interval=interval)
+
+        assert source in conn.fetch.call_args.args[0]